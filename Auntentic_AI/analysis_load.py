@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+asyncio load generator for the authenticate-sneaker analysis flow.
+Replays what the edge function does for each request - fetch the photo
+URLs in parallel, base64-encode them into data URIs, post the chat
+completion, parse the model's JSON - against analysis_mock.py (or any
+server with the same routes) at a target concurrency. Reports p50/p95/p99
+per stage: fetch, encode, model, parse and the request as a whole. Like
+the edge function, every photo is fetched on a new connection and encoding
+runs on the event loop, so it stalls the other requests in flight.
+"""
+
+from functools import lru_cache
+from urllib.parse import urlsplit
+import argparse
+import asyncio
+import base64
+import json
+import os
+import re
+import shlex
+import ssl
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from analysis_mock import COMPLETIONS_PATH, DEFAULT_PORT, STORAGE_PREFIX
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STAGES = ("fetch", "encode", "model", "parse", "total")
+PERCENTILES = (50, 95, 99)
+
+DEFAULT_IMAGES = 6
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# The edge function sends the same model, max_tokens and prompt shape
+MODEL = "anthropic/claude-sonnet-4"
+MAX_TOKENS = 4096
+USER_PROMPT = "Analyze these footwear images and return ONLY a JSON object. No other text."
+
+
+class HTTPError(Exception):
+    def __init__(self, status, body=b""):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.body = body
+
+
+async def read_head(reader):
+    """(status, lower-cased headers) of a response."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed before the response")
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, headers
+
+
+async def read_body(reader, headers):
+    """Whole response body: Content-Length, chunked, or up to EOF."""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        parts = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                return b"".join(parts)
+            parts.append(await reader.readexactly(size))
+            await reader.readline()
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"]))
+    return await reader.read()
+
+
+def request_head(method, url, headers, length=None):
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    lines = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    if length is not None:
+        lines.append(f"Content-Length: {length}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def connection_key(url):
+    """(scheme, host, port) of url; ValueError for anything but http:// and https://."""
+    parts = urlsplit(url)
+    if parts.scheme not in DEFAULT_PORTS:
+        raise ValueError(f"Only http:// and https:// URLs are supported: {url}")
+    return parts.scheme, parts.hostname, parts.port or DEFAULT_PORTS[parts.scheme]
+
+
+@lru_cache(maxsize=None)
+def tls_context():
+    # Loading the CA bundle takes milliseconds; one context serves every connection
+    return ssl.create_default_context()
+
+
+def open_connection(key):
+    """asyncio (reader, writer) for a connection_key(), over TLS for https."""
+    scheme, host, port = key
+    if scheme == "https":
+        return asyncio.open_connection(host, port, ssl=tls_context(), server_hostname=host)
+    return asyncio.open_connection(host, port)
+
+
+async def http_request(url, method="GET", body=None, headers=None):
+    """One request on a new connection, closed afterwards. Returns (status, headers, body)."""
+    reader, writer = await open_connection(connection_key(url))
+    try:
+        headers = dict(headers or {}, Connection="close")
+        writer.write(request_head(method, url, headers, None if body is None else len(body)))
+        if body is not None:
+            writer.write(body)
+        await writer.drain()
+        status, response_headers = await read_head(reader)
+        return status, response_headers, await read_body(reader, response_headers)
+    finally:
+        writer.close()
+
+
+async def fetch_photo(url):
+    """(bytes, media type) of a photo URL, like imageUrlToBase64 before the encoding."""
+    status, headers, body = await http_request(url)
+    if status != 200:
+        raise HTTPError(status, body)
+    return body, headers.get("content-type", "image/jpeg").split(";")[0]
+
+
+def build_payload(photos):
+    """The chat completion body for fetched photos: data URIs, then the prompt."""
+    content = []
+    for data, media_type in photos:
+        encoded = base64.b64encode(data).decode("ascii")
+        content.append({"type": "image_url",
+                        "image_url": {"url": f"data:{media_type};base64,{encoded}"}})
+    content.append({"type": "text", "text": USER_PROMPT})
+    return json.dumps({
+        "model": MODEL,
+        "max_tokens": MAX_TOKENS,
+        "messages": [{"role": "system", "content": "SYSTEM_PROMPT"},
+                     {"role": "user", "content": content}],
+    }).encode()
+
+
+def parse_completion(body):
+    """
+    The analysis result of a chat completion response, with the edge
+    function's fallbacks: the whole message, a ```json fence, then the
+    outermost {...}.
+    """
+    data = json.loads(body)
+    text = data["choices"][0]["message"]["content"]
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    fenced = re.search(r"```(?:json)?\s*([\s\S]*?)```", text)
+    if fenced:
+        try:
+            return json.loads(fenced.group(1).strip())
+        except ValueError:
+            pass
+    braces = re.search(r"\{[\s\S]*\}", text)
+    if braces:
+        return json.loads(braces.group(0))
+    raise ValueError("Model did not return JSON")
+
+
+async def analyze(base_url, images=DEFAULT_IMAGES):
+    """One analysis request; returns the seconds spent in each stage."""
+    timings = {}
+    start = time.perf_counter()
+    urls = [f"{base_url}{STORAGE_PREFIX}{index}.jpg" for index in range(images)]
+    photos = await asyncio.gather(*(fetch_photo(url) for url in urls))
+    mark = time.perf_counter()
+    timings["fetch"] = mark - start
+
+    payload = build_payload(photos)
+    del photos
+    timings["encode"] = time.perf_counter() - mark
+    mark = time.perf_counter()
+
+    status, _, body = await http_request(
+        base_url + COMPLETIONS_PATH, "POST", payload,
+        {"Content-Type": "application/json", "Authorization": "Bearer local-mock"})
+    del payload
+    if status != 200:
+        raise HTTPError(status, body)
+    timings["model"] = time.perf_counter() - mark
+    mark = time.perf_counter()
+
+    result = parse_completion(body)
+    if len(result.get("perImageValidations", [])) != images:
+        raise ValueError("perImageValidations does not cover every photo")
+    timings["parse"] = time.perf_counter() - mark
+    timings["total"] = time.perf_counter() - start
+    return timings
+
+
+async def run_load(base_url, requests, concurrency, images=DEFAULT_IMAGES, progress=True):
+    """
+    requests analyses with at most concurrency in flight. Returns
+    (per-request timings, errors by type, wall seconds).
+    """
+    results, errors = [], {}
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            try:
+                results.append(await analyze(base_url, images))
+            except Exception as exc:
+                name = f"HTTP {exc.status}" if isinstance(exc, HTTPError) else type(exc).__name__
+                errors[name] = errors.get(name, 0) + 1
+            done = len(results) + sum(errors.values())
+            if progress and done % max(1, requests // 10) == 0:
+                print(f"  {done}/{requests} requests", flush=True)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    return results, errors, time.perf_counter() - start
+
+
+def summarize(results):
+    """{stage: {"p50": ms, "p95": ms, "p99": ms, "max": ms}} over the successful requests."""
+    summary = {}
+    for stage in STAGES:
+        values = np.array([timings[stage] for timings in results]) * 1000
+        if not len(values):
+            continue
+        summary[stage] = {f"p{p}": float(np.percentile(values, p)) for p in PERCENTILES}
+        summary[stage]["max"] = float(values.max())
+    return summary
+
+
+def start_mock(port, mock_args=""):
+    """Run analysis_mock.py in a child process and wait until it listens."""
+    command = [sys.executable, os.path.join(SCRIPT_DIR, "analysis_mock.py"),
+               "--port", str(port)] + shlex.split(mock_args)
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Serving"):
+        process.kill()
+        raise SystemExit(f"Mock server did not start: {line.strip()}")
+    print(line.strip())
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default=f"http://127.0.0.1:{DEFAULT_PORT}",
+                        help="Server with the storage and chat completion routes")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--images", type=int, default=DEFAULT_IMAGES, help="Photos per request")
+    parser.add_argument("--serve", action="store_true",
+                        help="Start analysis_mock.py on the --base-url port for the run")
+    parser.add_argument("--mock-args", default="",
+                        help="Extra analysis_mock.py arguments with --serve, "
+                             "e.g. \"--model-latency fixed:500\"")
+    parser.add_argument("--output", help="Write the summary and raw timings as JSON")
+    args = parser.parse_args()
+
+    mock = start_mock(urlsplit(args.base_url).port or 80, args.mock_args) if args.serve else None
+    try:
+        results, errors, elapsed = asyncio.run(
+            run_load(args.base_url, args.requests, args.concurrency, args.images))
+    finally:
+        if mock:
+            mock.terminate()
+            mock.wait()
+
+    summary = summarize(results)
+    print(f"  {'stage':8} " + " ".join(f"{'p' + str(p):>10}" for p in PERCENTILES) + f" {'max':>10}")
+    for stage, values in summary.items():
+        print(f"  {stage:8} " + " ".join(f"{values['p' + str(p)]:8.1f}ms" for p in PERCENTILES)
+              + f" {values['max']:8.1f}ms")
+    failed = sum(errors.values())
+    print(f"Done! {len(results)}/{args.requests} requests OK at concurrency {args.concurrency} "
+          f"in {elapsed:.1f}s ({len(results) / elapsed:.1f} req/s)"
+          + (f", errors: {errors}" if errors else ""))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"requests": args.requests, "concurrency": args.concurrency,
+                       "images": args.images, "seconds": elapsed, "errors": errors,
+                       "summary": summary, "timings": results}, f, indent=2)
+        print(f"Saved: {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
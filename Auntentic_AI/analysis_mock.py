@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the services authenticate-sneaker calls.
+Serves photos under Supabase Storage's public object path and answers
+OpenRouter's /api/v1/chat/completions with canned responses in the shape
+the system prompt asks for (isValidSubmission, perImageValidations, ...),
+one perImageValidations entry per image in the request. Latencies are drawn
+from configurable distributions: time to first byte and bandwidth for the
+photos, total time for the model. Keep-alive is supported, so pooled and
+unpooled clients can be compared against it.
+"""
+
+from PIL import Image, ImageFilter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import io
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from photo_quality import PHOTO_TYPES
+
+DEFAULT_PORT = 8787
+
+STORAGE_PREFIX = "/storage/v1/object/public/photos/"
+COMPLETIONS_PATH = "/api/v1/chat/completions"
+
+# Latency specs, in milliseconds: kind:arguments
+DEFAULT_MODEL_LATENCY = "lognormal:9000,0.35"
+DEFAULT_IMAGE_LATENCY = "lognormal:40,0.5"
+
+# Per-connection download speed of a photo, megabytes per second (0: unlimited)
+DEFAULT_IMAGE_MBPS = 50.0
+
+# Synthetic photo when no files are given: phone resolution and JPEG quality
+PHOTO_SIZE = (4032, 3024)
+PHOTO_QUALITY = 90
+
+CHUNK_BYTES = 64 * 1024
+
+IMAGE_PART = re.compile(rb'"type"\s*:\s*"image_url"')
+MODEL_FIELD = re.compile(rb'"model"\s*:\s*"([^"]*)"')
+
+
+def parse_latency(spec, rng=None):
+    """
+    A function returning delays in seconds, from a spec in milliseconds:
+    'fixed:MS', 'uniform:LOW,HIGH', 'normal:MEAN,STD' or
+    'lognormal:MEDIAN,SIGMA'. Negative draws are clipped to 0.
+    """
+    rng = rng or random.Random()
+    kind, _, args = spec.partition(":")
+    try:
+        values = [float(v) for v in args.split(",")] if args else []
+    except ValueError:
+        raise ValueError(f"Bad latency spec: {spec}") from None
+    draws = {
+        "fixed": (1, lambda ms: ms),
+        "uniform": (2, rng.uniform),
+        "normal": (2, rng.gauss),
+        "lognormal": (2, lambda median, sigma: median * rng.lognormvariate(0, sigma)),
+    }
+    if kind not in draws or len(values) != draws[kind][0]:
+        raise ValueError(f"Bad latency spec: {spec} "
+                         "(fixed:MS, uniform:LOW,HIGH, normal:MEAN,STD or lognormal:MEDIAN,SIGMA)")
+    draw = draws[kind][1]
+    return lambda: max(0.0, draw(*values)) / 1000
+
+
+def synthetic_photo(seed, size=PHOTO_SIZE, quality=PHOTO_QUALITY):
+    """A phone-sized JPEG with smooth shapes and sensor-like grain, a few MB."""
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 256, (size[1] // 64, size[0] // 64, 3), dtype=np.uint8)
+    img = Image.fromarray(base).resize(size, Image.Resampling.BICUBIC)
+    img = img.filter(ImageFilter.GaussianBlur(8))
+    grain = rng.normal(0, 6, (size[1], size[0], 1))
+    pixels = np.clip(np.asarray(img, dtype=np.float32) + grain, 0, 255).astype(np.uint8)
+    out = io.BytesIO()
+    Image.fromarray(pixels).save(out, "JPEG", quality=quality)
+    return out.getvalue()
+
+
+def canned_result(count, rng, invalid=False):
+    """A model answer for count photos, valid or an invalid-submission one."""
+    validations = []
+    for index in range(count):
+        validations.append({
+            "photoIndex": index + 1,
+            "photoType": PHOTO_TYPES[index] if index < len(PHOTO_TYPES) else "Additional angle",
+            "isValid": not invalid,
+            "invalidReason": "Not footwear" if invalid else None,
+            "qualityScore": 0 if invalid else rng.randint(70, 95),
+        })
+    if invalid:
+        return {
+            "isValidSubmission": False,
+            "invalidReason": "The images do not appear to contain footwear",
+            "perImageValidations": validations,
+            "shoeIdentification": None,
+            "condition": None,
+            "confidenceLevel": "unable_to_assess",
+            "confidenceScore": 0,
+            "breakdown": None,
+            "observations": [],
+            "concerns": [],
+            "positiveIndicators": [],
+            "recommendation": "Please provide clear photos of the footwear you want to authenticate",
+        }
+    breakdown = {"stitching": rng.randint(15, 25), "logos": rng.randint(20, 30),
+                 "materials": rng.randint(15, 25), "labels": rng.randint(5, 10),
+                 "shape": rng.randint(5, 10)}
+    score = sum(breakdown.values())
+    return {
+        "isValidSubmission": True,
+        "invalidReason": None,
+        "perImageValidations": validations,
+        "shoeIdentification": {
+            "category": "Sneakers",
+            "brand": "Nike",
+            "model": "Air Jordan 1 Retro High OG",
+            "colorway": "White/Black-Varsity Red",
+            "estimatedYear": "2022",
+            "styleCode": None,
+            "gender": "Men",
+        },
+        "condition": {"rating": rng.choice(["Excellent", "Very Good", "Good"]),
+                      "notes": "Light creasing on the toe box, minimal sole wear"},
+        "confidenceLevel": "high" if score >= 80 else "moderate",
+        "confidenceScore": score,
+        "breakdown": breakdown,
+        "observations": [f"Observation {i + 1} about manufacturing quality" for i in range(5)],
+        "concerns": [],
+        "positiveIndicators": ["Stitching density consistent with factory production"],
+        "conditionNotes": ["Light creasing on the toe box"],
+        "recommendation": None,
+    }
+
+
+class MockConfig:
+    """What the handler serves and how slowly; shared by all handler threads."""
+
+    def __init__(self, photos, model_latency=DEFAULT_MODEL_LATENCY,
+                 image_latency=DEFAULT_IMAGE_LATENCY, image_mbps=DEFAULT_IMAGE_MBPS,
+                 error_rate=0.0, invalid_share=0.0, fenced_share=0.0, seed=None):
+        self.photos = photos
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.model_latency = parse_latency(model_latency, self.rng)
+        self.image_latency = parse_latency(image_latency, self.rng)
+        self.image_mbps = image_mbps
+        self.error_rate = error_rate
+        self.invalid_share = invalid_share
+        self.fenced_share = fenced_share
+        self.stats = {"images": 0, "image_bytes": 0, "completions": 0, "request_bytes": 0,
+                      "errors": 0, "connections": 0}
+
+    def draw(self, func, *args):
+        # random.Random is not safe to share between threads without a lock
+        with self.lock:
+            return func(*args)
+
+    def count(self, **increments):
+        with self.lock:
+            for name, value in increments.items():
+                self.stats[name] += value
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "AnalysisMock/1.0"
+
+    def setup(self):
+        super().setup()
+        self.server.config.count(connections=1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        config = self.server.config
+        name = self.path.split("?")[0]
+        if not name.startswith(STORAGE_PREFIX):
+            self.send_json(404, {"error": "Not found"})
+            return
+        try:
+            index = int(os.path.splitext(name[len(STORAGE_PREFIX):].rsplit("/", 1)[-1])[0])
+        except ValueError:
+            index = abs(hash(name))
+        data = config.photos[index % len(config.photos)]
+
+        time.sleep(config.draw(config.image_latency))
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        start = time.perf_counter()
+        view = memoryview(data)
+        for offset in range(0, len(data), CHUNK_BYTES):
+            self.wfile.write(view[offset:offset + CHUNK_BYTES])
+            if config.image_mbps > 0:
+                due = (offset + CHUNK_BYTES) / (config.image_mbps * 1e6)
+                delay = start + due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        config.count(images=1, image_bytes=len(data))
+
+    def do_POST(self):
+        config = self.server.config
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        config.count(request_bytes=length)
+        if self.path.split("?")[0] != COMPLETIONS_PATH:
+            self.send_json(404, {"error": "Not found"})
+            return
+        # A request carries six data URIs of several MB each: count the image
+        # parts with a scan instead of decoding the JSON, so the stand-in adds
+        # little CPU of its own to a load test on the same machine
+        images = len(IMAGE_PART.findall(body))
+        model = MODEL_FIELD.search(body)
+        if not images or not body.lstrip().startswith(b"{"):
+            self.send_json(400, {"error": {"message": "Malformed chat completion request"}})
+            return
+
+        time.sleep(config.draw(config.model_latency))
+        if config.draw(config.rng.random) < config.error_rate:
+            config.count(errors=1)
+            self.send_json(502, {"error": {"message": "Upstream provider error", "code": 502}})
+            return
+
+        invalid = config.draw(config.rng.random) < config.invalid_share
+        result = config.draw(canned_result, images, config.rng, invalid)
+        text = json.dumps(result, indent=2)
+        if config.draw(config.rng.random) < config.fenced_share:
+            text = f"```json\n{text}\n```"
+        config.count(completions=1)
+        self.send_json(200, {
+            "id": f"gen-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model.group(1).decode() if model else "anthropic/claude-sonnet-4",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": text}}],
+            "usage": {"prompt_tokens": len(body) // 4, "completion_tokens": len(text) // 4,
+                      "total_tokens": (len(body) + len(text)) // 4},
+        })
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Fifty analyses open three hundred photo connections at once; the
+    # default backlog of 5 would turn most of them into SYN retries
+    request_queue_size = 1024
+
+
+def make_server(config, host="127.0.0.1", port=DEFAULT_PORT):
+    server = MockServer((host, port), MockHandler)
+    server.config = config
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--photos", nargs="+", help="Photo files served as slots 0, 1, ... "
+                                                    "(default: six synthetic phone photos)")
+    parser.add_argument("--model-latency", default=DEFAULT_MODEL_LATENCY,
+                        help="Model response time in ms: fixed:MS, uniform:LOW,HIGH, "
+                             "normal:MEAN,STD or lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--image-latency", default=DEFAULT_IMAGE_LATENCY,
+                        help="Photo time to first byte in ms, same forms")
+    parser.add_argument("--image-mbps", type=float, default=DEFAULT_IMAGE_MBPS,
+                        help="Photo download speed per connection, MB/s (0: unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Share of completions answered with a 502")
+    parser.add_argument("--invalid-share", type=float, default=0.0,
+                        help="Share of completions that reject the submission")
+    parser.add_argument("--fenced-share", type=float, default=0.0,
+                        help="Share of completions wrapped in a ```json fence")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    if args.photos:
+        photos = []
+        for path in args.photos:
+            with open(path, "rb") as f:
+                photos.append(f.read())
+    else:
+        photos = [synthetic_photo(seed) for seed in range(6)]
+    config = MockConfig(photos, args.model_latency, args.image_latency, args.image_mbps,
+                        args.error_rate, args.invalid_share, args.fenced_share, args.seed)
+
+    server = make_server(config, args.host, args.port)
+    sizes = ", ".join(f"{len(data):,}" for data in photos)
+    print(f"Serving {len(photos)} photos ({sizes} bytes) and chat completions "
+          f"on http://{args.host}:{args.port}", flush=True)
+    print(f"  photos:  http://{args.host}:{args.port}{STORAGE_PREFIX}<n>.jpg", flush=True)
+    print(f"  model:   http://{args.host}:{args.port}{COMPLETIONS_PATH}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Done! {config.stats}")
+
+
+if __name__ == "__main__":
+    main()
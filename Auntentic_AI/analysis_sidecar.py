@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+Fetch-and-encode sidecar for the authenticate-sneaker request builder.
+Takes the edge function's { imageUrls } body and returns the image part of
+its content array ([{type: "image_url", image_url: {url: "data:...;base64,..."}}]).
+Photos are fetched over http:// or https:// on a keep-alive connection
+pool with a bound on the connections in use. Each body is base64-encoded
+chunk by chunk as it arrives, so no photo is ever held raw. The photo
+being written passes straight into the chunked response; the photos after
+it in the array are buffered as encoded chunks until their turn, so a
+request holds up to 4/3 the size of its later photos. imageUrlToBase64
+instead holds every body, a binary string of it and its base64 at once.
+Only URLs under the configured Supabase Storage origin are fetched, and
+with IMAGE_SIDECAR_SECRET set every request must carry it as a bearer
+token; serving beyond loopback requires the secret, since the sidecar
+would otherwise fetch for anyone who can reach it.
+The bench command drives the sidecar against analysis_mock.py and reports
+throughput and peak memory; --buffered runs the sidecar the edge
+function's way for comparison.
+"""
+
+from urllib.parse import urlsplit
+import argparse
+import asyncio
+import base64
+import hmac
+import json
+import os
+import re
+import resource
+import secrets
+import subprocess
+import sys
+import time
+
+from analysis_load import (HTTPError, connection_key, http_request, open_connection, read_head,
+                           request_head, start_mock)
+from analysis_mock import DEFAULT_PORT as MOCK_PORT, STORAGE_PREFIX
+
+DEFAULT_PORT = 8788
+
+# Photo connections in use at once, over all requests
+DEFAULT_CONNECTIONS = 24
+
+# Idle pooled connections older than this are closed instead of reused
+IDLE_SECONDS = 30.0
+
+# Raw bytes read per step; a multiple of 3 so most chunks encode without a carry
+READ_BYTES = 48 * 1024
+
+# Request bodies are a handful of URLs
+MAX_REQUEST_BYTES = 64 * 1024
+
+# Shared with authenticate-sneaker, which sends it as a bearer token
+SECRET_ENV = "IMAGE_SIDECAR_SECRET"
+
+# Photo URLs must be Storage objects of the configured project
+STORAGE_PATH = "/storage/v1/object/"
+
+# type/subtype token characters (RFC 6838); anything else is not written into the JSON
+MEDIA_TYPE = re.compile(r"[A-Za-z0-9][A-Za-z0-9!#$&^_.+-]*/[A-Za-z0-9][A-Za-z0-9!#$&^_.+-]*")
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes (same as bench_icons.peak_rss)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # macOS reports bytes
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def media_type(headers):
+    """The response's media type, or image/jpeg when missing or malformed."""
+    value = headers.get("content-type", "").split(";")[0].strip()
+    return value if MEDIA_TYPE.fullmatch(value) else "image/jpeg"
+
+
+def storage_url_allowed(url, storage_origin):
+    """Whether url is a Storage object URL on storage_origin (scheme, host and port)."""
+    try:
+        key = connection_key(url)
+    except ValueError:
+        return False
+    parts = urlsplit(url)
+    return (key == connection_key(storage_origin) and parts.username is None
+            and parts.path.startswith(STORAGE_PATH) and ".." not in parts.path.split("/"))
+
+
+class Base64Stream:
+    """Incremental base64: every feed() returns the encoding of the complete 3-byte groups so far."""
+
+    def __init__(self):
+        self.carry = b""
+
+    def feed(self, data):
+        if self.carry:
+            data = self.carry + data
+        cut = len(data) - len(data) % 3
+        self.carry = bytes(data[cut:])
+        return base64.b64encode(memoryview(data)[:cut])
+
+    def flush(self):
+        encoded, self.carry = base64.b64encode(self.carry), b""
+        return encoded
+
+
+class PooledResponse:
+    """Status and headers of a pooled GET; read() the body, then release()."""
+
+    def __init__(self, pool, key, reader, writer, status, headers):
+        self.pool = pool
+        self.key = key
+        self.reader = reader
+        self.writer = writer
+        self.status = status
+        self.headers = headers
+        self.complete = False
+        self.chunked = headers.get("transfer-encoding", "").lower() == "chunked"
+        self.remaining = int(headers.get("content-length", -1))
+
+    async def read(self, size=READ_BYTES):
+        """Up to size body bytes; b"" at the end of the body."""
+        if self.complete:
+            return b""
+        if self.chunked:
+            if self.remaining <= 0:
+                self.remaining = int((await self.reader.readline()).split(b";")[0], 16)
+                if self.remaining == 0:
+                    await self.reader.readline()
+                    self.complete = True
+                    return b""
+            data = await self.reader.read(min(size, self.remaining))
+            self.remaining -= len(data)
+            if self.remaining == 0:
+                await self.reader.readline()
+        elif self.remaining >= 0:
+            data = await self.reader.read(min(size, self.remaining)) if self.remaining else b""
+            self.remaining -= len(data)
+            if self.remaining == 0:
+                self.complete = True
+        else:
+            data = await self.reader.read(size)
+            if not data:
+                self.complete = True
+        if not data and not self.complete:
+            raise ConnectionError("Connection closed mid-body")
+        return data
+
+    def release(self):
+        """Back to the pool when the body was read through and keep-alive allowed, else closed."""
+        reusable = (self.complete and (self.chunked or "content-length" in self.headers)
+                    and self.headers.get("connection", "").lower() != "close")
+        self.pool.release(self.key, self.reader, self.writer, reusable)
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP/1.1 connections per scheme, host and port. At most limit
+    connections are checked out at once; get() waits for a free one.
+    """
+
+    def __init__(self, limit=DEFAULT_CONNECTIONS, idle_seconds=IDLE_SECONDS):
+        self.slots = asyncio.Semaphore(limit)
+        self.idle_seconds = idle_seconds
+        self.idle = {}
+        self.stats = {"opened": 0, "reused": 0}
+
+    def _idle_connection(self, key):
+        idle = self.idle.get(key, [])
+        while idle:
+            reader, writer, since = idle.pop()
+            if time.monotonic() - since < self.idle_seconds and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        return None
+
+    async def get(self, url):
+        """GET url on a pooled connection; returns a PooledResponse once the head is in."""
+        key = connection_key(url)
+        head = request_head("GET", url, {"Connection": "keep-alive"})
+        await self.slots.acquire()
+        try:
+            connection = self._idle_connection(key)
+            if connection is not None:
+                # The server may have closed an idle connection; retry once fresh
+                try:
+                    reader, writer = connection
+                    writer.write(head)
+                    await writer.drain()
+                    status, headers = await read_head(reader)
+                    self.stats["reused"] += 1
+                    return PooledResponse(self, key, reader, writer, status, headers)
+                except (ConnectionError, OSError, ValueError, IndexError):
+                    writer.close()
+            reader, writer = await open_connection(key)
+            self.stats["opened"] += 1
+            writer.write(head)
+            await writer.drain()
+            status, headers = await read_head(reader)
+            return PooledResponse(self, key, reader, writer, status, headers)
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self, key, reader, writer, reusable):
+        if reusable:
+            self.idle.setdefault(key, []).append((reader, writer, time.monotonic()))
+        else:
+            writer.close()
+        self.slots.release()
+
+
+class EncodedPhoto:
+    """
+    One photo's fetch: head (status, media type) as soon as it arrives,
+    then its base64 chunks through a queue, None at the end. The response
+    writer drains the queue of the photo it is writing, so only the photos
+    after it are held, and only in encoded chunks.
+    """
+
+    def __init__(self, pool, url):
+        self.head = asyncio.get_running_loop().create_future()
+        self.chunks = asyncio.Queue()
+        self.task = asyncio.create_task(self._fetch(pool, url))
+
+    async def _fetch(self, pool, url):
+        try:
+            response = await pool.get(url)
+        except Exception as exc:
+            self.head.set_exception(exc)
+            return
+        try:
+            if response.status != 200:
+                self.head.set_exception(HTTPError(response.status))
+                return
+            self.head.set_result(media_type(response.headers))
+            encoder = Base64Stream()
+            while True:
+                data = await response.read()
+                if not data:
+                    break
+                encoded = encoder.feed(data)
+                if encoded:
+                    self.chunks.put_nowait(encoded)
+            self.chunks.put_nowait(encoder.flush())
+            self.chunks.put_nowait(None)
+        except Exception as exc:
+            self.chunks.put_nowait(exc)
+            if not self.head.done():
+                self.head.set_exception(exc)
+        finally:
+            response.release()
+
+
+def write_chunk(writer, data):
+    """One HTTP/1.1 chunk of a chunked response body."""
+    if data:
+        writer.write(b"%x\r\n" % len(data))
+        writer.write(data)
+        writer.write(b"\r\n")
+
+
+def send_json(writer, status, payload, reason="OK"):
+    body = json.dumps(payload).encode()
+    writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode())
+    writer.write(body)
+
+
+async def stream_content(writer, pool, urls):
+    """
+    Fetch urls over the pool and write the content array as a chunked
+    response. Heads are awaited first so a failed photo still gets a 502
+    like the edge function's error; a photo failing mid-body aborts the
+    response instead of ending it.
+    """
+    photos = [EncodedPhoto(pool, url) for url in urls]
+    try:
+        heads = await asyncio.gather(*(photo.head for photo in photos), return_exceptions=True)
+        failed = [head for head in heads if isinstance(head, Exception)]
+        if failed:
+            exc = failed[0]
+            reason = f"Failed to fetch image: {exc.status}" if isinstance(exc, HTTPError) else str(exc)
+            send_json(writer, 502, {"error": "Analysis failed", "hint": reason}, "Bad Gateway")
+            return True
+
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                     b"Transfer-Encoding: chunked\r\n\r\n")
+        for index, (photo, photo_type) in enumerate(zip(photos, heads)):
+            write_chunk(writer, (b"[" if index == 0 else b", ")
+                        + b'{"type": "image_url", "image_url": {"url": "data:'
+                        + photo_type.encode() + b';base64,')
+            while True:
+                chunk = await photo.chunks.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, Exception):
+                    return False
+                write_chunk(writer, chunk)
+                await writer.drain()
+            write_chunk(writer, b'"}}')
+        write_chunk(writer, b"]")
+        writer.write(b"0\r\n\r\n")
+        return True
+    finally:
+        # Failed, aborted or the client went away: stop the fetches still running
+        for photo in photos:
+            photo.task.cancel()
+
+
+async def buffered_content(writer, urls):
+    """The edge function's way: whole bodies on fresh connections, then one JSON string."""
+    photos = []
+    try:
+        for status, headers, body in await asyncio.gather(*(http_request(url) for url in urls)):
+            if status != 200:
+                raise HTTPError(status)
+            photos.append((media_type(headers), body))
+    except Exception as exc:
+        reason = f"Failed to fetch image: {exc.status}" if isinstance(exc, HTTPError) else str(exc)
+        send_json(writer, 502, {"error": "Analysis failed", "hint": reason}, "Bad Gateway")
+        return True
+    content = [{"type": "image_url",
+                "image_url": {"url": f"data:{photo_type};base64,{base64.b64encode(body).decode()}"}}
+               for photo_type, body in photos]
+    send_json(writer, 200, content)
+    return True
+
+
+class Sidecar:
+    """The HTTP server: POST / with { imageUrls }, GET /stats."""
+
+    def __init__(self, storage_origin, secret=None, connections=DEFAULT_CONNECTIONS,
+                 buffered=False):
+        self.storage_origin = storage_origin
+        self.secret = secret
+        self.buffered = buffered
+        self.pool = ConnectionPool(connections)
+        self.started_rss = peak_rss()
+        self.stats = {"requests": 0, "photos": 0, "aborted": 0}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                method, path, _ = line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_REQUEST_BYTES:
+                    send_json(writer, 413, {"error": "Request body too large"}, "Payload Too Large")
+                    break
+                body = await reader.readexactly(length)
+
+                keep = await self.respond(writer, method, path.split("?")[0], headers, body)
+                await writer.drain()
+                if not keep or headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def authorized(self, headers):
+        if not self.secret:
+            return True
+        return hmac.compare_digest(headers.get("authorization", "").encode(),
+                                   f"Bearer {self.secret}".encode())
+
+    async def respond(self, writer, method, path, headers, body):
+        if not self.authorized(headers):
+            send_json(writer, 401, {"error": "Unauthorized"}, "Unauthorized")
+            return True
+        if method == "GET" and path == "/stats":
+            send_json(writer, 200, dict(self.stats, **self.pool.stats,
+                                        started_rss_bytes=self.started_rss,
+                                        peak_rss_bytes=peak_rss(), buffered=self.buffered))
+            return True
+        if method != "POST" or path != "/":
+            send_json(writer, 404, {"error": "Not found"}, "Not Found")
+            return True
+        try:
+            urls = json.loads(body)["imageUrls"]
+            if not isinstance(urls, list) or not urls or not all(isinstance(u, str) for u in urls):
+                raise TypeError
+        except (ValueError, KeyError, TypeError):
+            send_json(writer, 400, {"error": "Missing or invalid imageUrls"}, "Bad Request")
+            return True
+        if not all(storage_url_allowed(url, self.storage_origin) for url in urls):
+            send_json(writer, 400, {"error": "imageUrls must be Storage object URLs of "
+                                             + self.storage_origin}, "Bad Request")
+            return True
+
+        self.stats["requests"] += 1
+        self.stats["photos"] += len(urls)
+        if self.buffered:
+            complete = await buffered_content(writer, urls)
+        else:
+            complete = await stream_content(writer, self.pool, urls)
+        if not complete:
+            self.stats["aborted"] += 1
+        return complete
+
+
+async def serve(host, port, storage_origin, connections, buffered):
+    secret = os.environ.get(SECRET_ENV)
+    if not secret and host not in ("127.0.0.1", "localhost", "::1"):
+        raise SystemExit(f"Set {SECRET_ENV} to serve beyond loopback")
+    sidecar = Sidecar(storage_origin, secret, connections, buffered)
+    server = await asyncio.start_server(sidecar.handle, host, port, backlog=1024)
+    mode = "buffered" if buffered else f"streaming, {connections} pooled connections"
+    print(f"Serving on http://{host}:{port} ({mode})", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def start_sidecar(port, storage_origin, secret, connections, buffered):
+    """Run the sidecar in a child process and wait until it listens."""
+    command = [sys.executable, os.path.abspath(__file__), "serve", "--port", str(port),
+               "--storage-origin", storage_origin, "--connections", str(connections)]
+    command += ["--buffered"] if buffered else []
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True,
+                               env=dict(os.environ, **{SECRET_ENV: secret}))
+    line = process.stdout.readline()
+    if not line.startswith("Serving"):
+        process.kill()
+        raise SystemExit(f"Sidecar did not start: {line.strip()}")
+    print(line.strip())
+    return process
+
+
+async def drain_response(sidecar_url, urls, auth):
+    """POST urls to the sidecar and read the response through; returns (status, body bytes)."""
+    parts = urlsplit(sidecar_url)
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+    try:
+        body = json.dumps({"imageUrls": urls}).encode()
+        headers = dict(auth, **{"Content-Type": "application/json", "Connection": "close"})
+        writer.write(request_head("POST", sidecar_url, headers, len(body)))
+        writer.write(body)
+        await writer.drain()
+        status, headers = await read_head(reader)
+        total, tail = 0, b""
+        while True:
+            data = await reader.read(READ_BYTES)
+            if not data:
+                break
+            total += len(data)
+            tail = (tail + data)[-5:]
+        # Counted with chunk framing; an aborted response lacks the final 0 chunk
+        if headers.get("transfer-encoding", "").lower() == "chunked" and tail != b"0\r\n\r\n":
+            raise ConnectionError("Incomplete chunked response")
+        return status, total
+    finally:
+        writer.close()
+
+
+async def check_content(sidecar_url, urls, auth):
+    """Fetch urls through the sidecar and directly; the decoded data URIs must equal the bodies."""
+    status, _, body = await http_request(sidecar_url, "POST", json.dumps({"imageUrls": urls}).encode(),
+                                         dict(auth, **{"Content-Type": "application/json"}))
+    if status != 200:
+        raise SystemExit(f"Sidecar answered {status}: {body[:200]}")
+    content = json.loads(body)
+    for url, part in zip(urls, content):
+        _, _, expected = await http_request(url)
+        data = base64.b64decode(part["image_url"]["url"].split(",", 1)[1])
+        if data != expected:
+            raise SystemExit(f"Encoded photo differs from {url}")
+    print(f"  check: {len(content)} data URIs decode to the fetched photos")
+
+
+async def bench_load(sidecar_url, urls, auth, requests, concurrency):
+    latencies, failures, output = [], 0, 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal failures, output
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                status, total = await drain_response(sidecar_url, urls, auth)
+            except (ConnectionError, OSError):
+                failures += 1
+                continue
+            if status != 200:
+                failures += 1
+                continue
+            output += total
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    return latencies, failures, output, time.perf_counter() - start
+
+
+def cmd_bench(args):
+    mock_url = args.mock_url
+    mock = start_mock(urlsplit(mock_url).port or 80, args.mock_args) if args.serve else None
+    secret = secrets.token_urlsafe()
+    auth = {"Authorization": f"Bearer {secret}"}
+    sidecar = start_sidecar(args.port, mock_url, secret, args.connections, args.buffered)
+    sidecar_url = f"http://127.0.0.1:{args.port}/"
+    urls = [f"{mock_url}{STORAGE_PREFIX}{index}.jpg" for index in range(args.images)]
+    try:
+        if args.check:
+            asyncio.run(check_content(sidecar_url, urls, auth))
+        latencies, failures, output, elapsed = asyncio.run(
+            bench_load(sidecar_url, urls, auth, args.requests, args.concurrency))
+        _, _, body = asyncio.run(http_request(sidecar_url + "stats", headers=auth))
+        stats = json.loads(body)
+    finally:
+        sidecar.terminate()
+        sidecar.wait()
+        if mock:
+            mock.terminate()
+            mock.wait()
+
+    latencies.sort()
+    mb = 1024 * 1024
+    if latencies:
+        p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+        print(f"  latency   p50 {1000 * p50:.0f} ms  p99 {1000 * p99:.0f} ms")
+    print(f"  output    {output / mb:.1f} MB in {elapsed:.1f}s ({output / mb / elapsed:.1f} MB/s, "
+          f"{len(latencies) / elapsed:.2f} req/s)")
+    print(f"  memory    {stats['started_rss_bytes'] / mb:.1f} MB at start, "
+          f"peak {stats['peak_rss_bytes'] / mb:.1f} MB")
+    if not args.buffered:
+        print(f"  pool      {stats['opened']} connections opened, {stats['reused']} reused")
+    print(f"Done! {len(latencies)}/{args.requests} requests OK at concurrency {args.concurrency} "
+          f"({'buffered' if args.buffered else 'streaming'})"
+          + (f", {failures} failed" if failures else ""))
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sub = subparsers.add_parser("serve", help="Run the sidecar")
+    sub.add_argument("--host", default="127.0.0.1")
+    sub.add_argument("--port", type=int, default=DEFAULT_PORT)
+    sub.add_argument("--storage-origin", default=os.environ.get("SUPABASE_URL"),
+                     help="The only origin photos are fetched from (default: $SUPABASE_URL)")
+    sub.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS,
+                     help="Photo connections in use at once")
+    sub.add_argument("--buffered", action="store_true",
+                     help="Fetch and encode like imageUrlToBase64 (for comparison)")
+
+    sub = subparsers.add_parser("bench", help="Measure the sidecar against the local stand-in")
+    sub.add_argument("--port", type=int, default=DEFAULT_PORT, help="Sidecar port")
+    sub.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS)
+    sub.add_argument("--buffered", action="store_true")
+    sub.add_argument("--mock-url", default=f"http://127.0.0.1:{MOCK_PORT}")
+    sub.add_argument("--serve", action="store_true", help="Start analysis_mock.py for the run")
+    sub.add_argument("--mock-args", default="", help="Extra analysis_mock.py arguments with --serve")
+    sub.add_argument("--requests", type=int, default=100)
+    sub.add_argument("--concurrency", type=int, default=20)
+    sub.add_argument("--images", type=int, default=6, help="Photos per request")
+    sub.add_argument("--check", action="store_true",
+                     help="First verify the data URIs decode to the served photos")
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        if not args.storage_origin:
+            parser.error("serve needs --storage-origin or SUPABASE_URL")
+        try:
+            asyncio.run(serve(args.host, args.port, args.storage_origin, args.connections,
+                              args.buffered))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    return cmd_bench(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
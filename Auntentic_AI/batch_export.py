@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Batch export of icon variants x sizes across a process pool.
+Each (variant, size) job renders or resamples and PNG-encodes in its own
+worker process; the fix_* transforms run once per variant beforehand and
+every size is resampled from that result. Output file names and contents
+do not depend on the worker count, and results are reported in job order.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import argparse
+import os
+import tempfile
+import time
+
+import icon_trace
+from export_appiconset import DEFAULT_APPICONSET, get_renderer, load_contents, pixel_size
+from icon_encode import save_png, set_workers
+from icon_params import RENDER_PARAMS
+from icon_supersample import render_supersampled
+from icon_trace import stage
+from render_cache import DEFAULT_CACHE_DIR, RenderCache, render_key
+
+# Variants rendered from code at the requested size
+RENDER_VARIANTS = ("checkkicks", "fullbleed")
+
+# Variants produced from a source image by the fix_icon_* transforms,
+# then resampled to the requested size: name -> (module, function)
+TRANSFORM_VARIANTS = {
+    "fix_borders": ("fix_icon_borders", "remove_inner_border"),
+    "fix_v2": ("fix_icon_v2", "fix_icon_fullbleed"),
+    "fix_v3": ("fix_icon_v3", "fix_icon_paint_over_border"),
+    "fix_final": ("fix_icon_final", "fix_icon_aggressive"),
+    "fix_auto": ("fix_icon_auto", "fix_icon_auto"),
+}
+
+
+def get_transform(name):
+    """Import a fix_icon_* transform by variant name."""
+    module_name, func_name = TRANSFORM_VARIANTS[name]
+    module = __import__(module_name)
+    return getattr(module, func_name)
+
+
+def transform_master(job):
+    """
+    Run a transform once on the source and save its result as the master
+    every size of the variant is resampled from. Returns (variant, seconds).
+    """
+    variant, input_path, master_path = job
+    start = time.perf_counter()
+    with stage("transform", variant=variant):
+        get_transform(variant)(input_path, None).save(master_path, "PNG", compress_level=1)
+    icon_trace.flush()
+    return variant, time.perf_counter() - start
+
+
+def render_variant(variant, size, input_path=None, supersample=1):
+    """
+    Produce one variant at one size as a PIL image. For the transform
+    variants input_path is the variant's master from transform_master().
+    """
+    if variant in RENDER_VARIANTS:
+        if supersample > 1:
+            # Tiles render serially here, the pool already runs one job per core
+            return render_supersampled(variant, size, supersample)
+        return get_renderer(variant)(size)
+
+    from PIL import Image
+    img = Image.open(input_path)
+    if img.size != (size, size):
+        img = img.convert("RGB").resize((size, size), Image.Resampling.LANCZOS)
+    return img
+
+
+def job_output_path(job):
+    variant, size, output_dir = job[:3]
+    return os.path.join(output_dir, f"{variant}-{size}.png")
+
+
+def run_job(job):
+    """
+    Worker entry point. Only a small result record travels back to the parent;
+    the image itself never leaves the worker, so memory stays per-worker.
+    """
+    variant, size, _, input_path, supersample, cache_dir, key = job
+    output_path = job_output_path(job)
+    start = time.perf_counter()
+
+    cache = RenderCache(cache_dir) if cache_dir else None
+    with stage("job", variant=variant, size=size):
+        with stage("cache_restore"):
+            restored = cache and cache.restore(key, output_path)
+        if restored:
+            rendered = done = time.perf_counter()
+            saved = 0
+            status = "from cache"
+        else:
+            with stage("render"):
+                img = render_variant(variant, size, input_path, supersample)
+            rendered = time.perf_counter()
+            with stage("encode"):
+                saved = save_png(img, output_path, size)["saved_bytes"]
+            done = time.perf_counter()
+            if cache:
+                with stage("cache_put"):
+                    cache.put(key, output_path)
+            status = "rendered"
+    icon_trace.flush()
+
+    return {
+        "variant": variant,
+        "size": size,
+        "path": output_path,
+        "key": key,
+        "status": status,
+        "bytes": os.path.getsize(output_path),
+        "saved_bytes": saved,
+        "render_seconds": rendered - start,
+        "encode_seconds": done - rendered,
+        "seconds": done - start,
+    }
+
+
+def fresh_result(job):
+    """Result record for a job whose output is already up to date."""
+    variant, size = job[:2]
+    key = job[-1]
+    output_path = job_output_path(job)
+    return {
+        "variant": variant,
+        "size": size,
+        "path": output_path,
+        "key": key,
+        "status": "up to date",
+        "bytes": os.path.getsize(output_path),
+        "saved_bytes": 0,
+        "render_seconds": 0.0,
+        "encode_seconds": 0.0,
+        "seconds": 0.0,
+    }
+
+
+def iter_results(jobs, workers, cache=None):
+    """
+    Yield job results in job order. At most 2 * workers jobs are in flight,
+    so a long job list never queues more work (or results) than needed.
+    Jobs whose output is fresh in the cache manifest are never submitted.
+    """
+    if workers <= 1:
+        for job in jobs:
+            if cache and cache.is_fresh(job_output_path(job), job[-1]):
+                yield fresh_result(job)
+            else:
+                yield run_job(job)
+        return
+
+    # Every worker already has a core: one encode thread each
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_workers,
+                             initargs=(1,)) as executor:
+        # Futures and already-finished results, in job order
+        pending = deque()
+        in_flight = 0
+        for job in jobs:
+            if cache and cache.is_fresh(job_output_path(job), job[-1]):
+                pending.append(fresh_result(job))
+            else:
+                pending.append(executor.submit(run_job, job))
+                in_flight += 1
+            while in_flight >= workers * 2 or (pending and isinstance(pending[0], dict)):
+                item = pending.popleft()
+                if not isinstance(item, dict):
+                    item = item.result()
+                    in_flight -= 1
+                yield item
+        while pending:
+            item = pending.popleft()
+            yield item if isinstance(item, dict) else item.result()
+
+
+
+def build_jobs(variants, sizes, output_dir, input_path=None, cache_dir=None,
+               supersample=1):
+    """Cartesian product of variants and sizes, variant-major, sizes descending."""
+    jobs = []
+    for variant in variants:
+        for size in sorted(set(sizes), reverse=True):
+            source = input_path if variant in TRANSFORM_VARIANTS else None
+            factor = supersample if variant in RENDER_VARIANTS else 1
+            key = render_key(variant, RENDER_PARAMS.get(variant), source, size=size,
+                             supersample=factor)
+            jobs.append((variant, size, output_dir, source, factor, cache_dir, key))
+    return jobs
+
+
+def batch_export(variants, sizes, output_dir, workers=None, input_path=None,
+                 cache_dir=None, supersample=1):
+    """Run every job and print a per-job and overall timing report."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    cache = RenderCache(cache_dir) if cache_dir else None
+    jobs = build_jobs(variants, sizes, output_dir, input_path, cache_dir, supersample)
+
+    print(f"Exporting {len(jobs)} jobs with {workers} worker(s)...")
+    start = time.perf_counter()
+    results = []
+    with tempfile.TemporaryDirectory() as master_dir:
+        # Transform variants: one transform per variant, not one per size,
+        # and only for variants with a size the cache does not have
+        stale = [job for job in jobs if job[0] in TRANSFORM_VARIANTS
+                 and not (cache and cache.is_fresh(job_output_path(job), job[-1]))]
+        masters = {job[0]: os.path.join(master_dir, f"{job[0]}.png") for job in stale}
+        transform_jobs = [(variant, input_path, path) for variant, path in masters.items()]
+        if workers > 1 and len(transform_jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(transform_jobs))) as executor:
+                transformed = list(executor.map(transform_master, transform_jobs))
+        else:
+            transformed = [transform_master(job) for job in transform_jobs]
+        for variant, seconds in transformed:
+            print(f"  {variant:<12} master   transform {seconds:6.3f}s")
+        jobs = [job[:3] + (masters[job[0]],) + job[4:] if job[0] in masters else job
+                for job in jobs]
+
+        for result in iter_results(jobs, workers, cache):
+            results.append(result)
+            if cache and result["status"] != "up to date":
+                cache.record(result["path"], result["key"])
+            print(f"  {result['variant']:<12} {result['size']:>5}px  "
+                  f"render {result['render_seconds']:6.3f}s  "
+                  f"encode {result['encode_seconds']:6.3f}s  "
+                  f"{result['bytes']:>9,} bytes (-{result['saved_bytes']:,})  {result['status']}")
+    if cache:
+        cache.save_manifest()
+    wall = time.perf_counter() - start
+
+    # Serial cost is the per-job times measured inside the workers plus the transforms
+    serial = sum(result["seconds"] for result in results) + sum(s for _, s in transformed)
+    encode = sum(result["encode_seconds"] for result in results)
+    saved = sum(result["saved_bytes"] for result in results)
+    print(f"Wall time: {wall:.3f}s, serial job time: {serial:.3f}s, "
+          f"speedup: {serial / wall if wall else 0:.2f}x")
+    print(f"Encoding: {encode:.3f}s, {saved:,} bytes saved against default PNG settings")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--variants", default=",".join(RENDER_VARIANTS),
+                        help="Comma-separated: " + ", ".join(
+                            RENDER_VARIANTS + tuple(TRANSFORM_VARIANTS)))
+    parser.add_argument("--sizes", help="Comma-separated pixel sizes "
+                                        "(default: every size in Contents.json)")
+    parser.add_argument("--input", help="Source image for the fix_* variants")
+    parser.add_argument("--output-dir", default=os.path.join(os.getcwd(), "icon-export"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Process pool size, 1 runs serially in-process")
+    parser.add_argument("--supersample", type=int, default=1,
+                        help="Tile-based supersampling factor for rendered variants")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="Render cache location")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-render and re-encode every job")
+    parser.add_argument("--compare-serial", action="store_true",
+                        help="Also run the whole batch serially and report the real speedup")
+    parser.add_argument("--trace", help="Write a Chrome trace of every job's stages here")
+    parser.add_argument("--trace-allocations", action="store_true",
+                        help="Record tracemalloc allocations per stage in the trace")
+    args = parser.parse_args()
+
+    variants = [v.strip() for v in args.variants.split(",") if v.strip()]
+    for variant in variants:
+        if variant not in RENDER_VARIANTS and variant not in TRANSFORM_VARIANTS:
+            parser.error(f"unknown variant: {variant}")
+        if variant in TRANSFORM_VARIANTS and not args.input:
+            parser.error(f"--input is required for {variant}")
+
+    if args.sizes:
+        sizes = [int(s) for s in args.sizes.split(",")]
+    else:
+        contents = load_contents(DEFAULT_APPICONSET)
+        sizes = [pixel_size(entry) for entry in contents["images"]]
+
+    cache_dir = None if args.no_cache else args.cache_dir
+
+    if args.trace:
+        # Before the pool starts, so the workers inherit the session
+        icon_trace.start_session(args.trace_allocations)
+    start = time.perf_counter()
+    batch_export(variants, sizes, args.output_dir, args.workers, args.input, cache_dir,
+                 args.supersample)
+    parallel_wall = time.perf_counter() - start
+    if args.trace:
+        print()
+        icon_trace.print_summary(icon_trace.finish_session(args.trace))
+        print(f"Trace: {args.trace}")
+
+    if args.compare_serial and args.workers > 1:
+        print("\nSerial reference run:")
+        start = time.perf_counter()
+        # Uncached, otherwise the serial run would just replay the cache
+        batch_export(variants, sizes, args.output_dir, 1, args.input,
+                     supersample=args.supersample)
+        serial_wall = time.perf_counter() - start
+        print(f"Measured speedup: {serial_wall / parallel_wall:.2f}x "
+              f"({serial_wall:.3f}s serial vs {parallel_wall:.3f}s with {args.workers} workers)")
+
+
+if __name__ == "__main__":
+    main()
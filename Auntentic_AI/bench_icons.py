@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the icon renderers and fix_icon_* transforms.
+Runs every case at every size in Contents.json plus the 2048/4096
+marketing sizes, each in a fresh process, and records wall time, CPU time
+and peak RSS as JSON. Compared with a stored baseline it exits non-zero
+when a case got slower or bigger than the regression threshold allows.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+from batch_export import RENDER_VARIANTS, TRANSFORM_VARIANTS, get_transform
+from export_appiconset import DEFAULT_APPICONSET, get_renderer, load_contents, pixel_size
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(SCRIPT_DIR, "bench-baseline.json")
+
+# Marketing and print sizes on top of the asset catalog sizes
+EXTRA_SIZES = (2048, 4096)
+
+# Allowed slowdown / memory growth over the baseline before a case fails
+DEFAULT_THRESHOLD = 0.25
+
+# Cases faster than this are timer noise, only memory is compared for them
+MIN_SECONDS = 0.01
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes."""
+    # On Linux ru_maxrss survives exec, so a spawned worker would report its
+    # parent's peak; the kernel's per-address-space high water mark does not
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # macOS reports bytes
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def case_sizes(appiconset_dir, extra=EXTRA_SIZES):
+    """Distinct pixel sizes from Contents.json plus the extra sizes, largest first."""
+    contents = load_contents(appiconset_dir)
+    sizes = {pixel_size(entry) for entry in contents["images"]}
+    return sorted(sizes | set(extra), reverse=True)
+
+
+def prepare_source(input_path, size, work_dir):
+    """The transform source resampled to size, so transforms run at every size."""
+    from PIL import Image
+    path = os.path.join(work_dir, f"source-{size}.png")
+    with Image.open(input_path) as img:
+        img.convert("RGB").resize((size, size), Image.Resampling.LANCZOS).save(path)
+    return path
+
+
+def run_case(job):
+    """
+    Worker entry point, one fresh process per case. Imports and source
+    preparation happen before the RSS reading the case is measured against.
+    """
+    name, size, input_path, repeat, work_dir = job
+    if name in RENDER_VARIANTS:
+        renderer = get_renderer(name)
+
+        def func():
+            renderer(size)
+    else:
+        transform = get_transform(name)
+        source = prepare_source(input_path, size, work_dir)
+
+        def func():
+            transform(source, None)
+
+    rss_before = peak_rss()
+    walls, cpus = [], []
+    try:
+        # The transforms report progress with print()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for _ in range(repeat):
+                wall, cpu = time.perf_counter(), time.process_time()
+                func()
+                walls.append(time.perf_counter() - wall)
+                cpus.append(time.process_time() - cpu)
+    except Exception as exc:
+        return {"case": name, "size": size, "error": f"{type(exc).__name__}: {exc}"}
+
+    return {
+        "case": name,
+        "size": size,
+        "wall_seconds": min(walls),
+        "cpu_seconds": min(cpus),
+        "peak_rss_bytes": peak_rss(),
+        "rss_growth_bytes": peak_rss() - rss_before,
+        "repeat": repeat,
+    }
+
+
+def run_benchmarks(cases, sizes, input_path=None, repeat=3):
+    """
+    Run every case x size serially, each in its own spawned process so peak
+    RSS belongs to that case alone. Yields result records.
+    """
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as work_dir:
+        if input_path is None and any(case in TRANSFORM_VARIANTS for case in cases):
+            # Default transform source: the full-bleed render at 1024
+            input_path = os.path.join(work_dir, "source.png")
+            get_renderer("fullbleed")(1024).save(input_path)
+
+        for case in cases:
+            for size in sizes:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    job = (case, size, input_path, repeat, work_dir)
+                    yield executor.submit(run_case, job).result()
+
+
+def environment():
+    """Where the numbers came from, stored next to them."""
+    import numpy
+    import PIL
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "pillow": PIL.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def result_key(result):
+    return f"{result['case']}@{result['size']}"
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, min_seconds=MIN_SECONDS):
+    """
+    Regressions against a baseline results document: a list of
+    (key, metric, baseline value, new value) for every metric that grew by
+    more than threshold. Errors in a case that used to work count too.
+    """
+    previous = baseline.get("results", {})
+    regressions = []
+    for key, result in results.items():
+        old = previous.get(key)
+        if old is None:
+            continue
+        if "error" in result:
+            if "error" not in old:
+                regressions.append((key, "error", None, result["error"]))
+            continue
+        if "error" in old:
+            continue
+        metrics = ["peak_rss_bytes"]
+        if old["wall_seconds"] >= min_seconds:
+            metrics += ["wall_seconds", "cpu_seconds"]
+        for metric in metrics:
+            if result[metric] > old[metric] * (1 + threshold):
+                regressions.append((key, metric, old[metric], result[metric]))
+    return regressions
+
+
+def format_value(metric, value):
+    if metric.endswith("_bytes"):
+        return f"{value / (1024 * 1024):.1f} MB"
+    if metric.endswith("_seconds"):
+        return f"{value * 1000:.1f} ms"
+    return str(value)
+
+
+def main():
+    all_cases = RENDER_VARIANTS + tuple(TRANSFORM_VARIANTS)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", default=",".join(all_cases),
+                        help="Comma-separated: " + ", ".join(all_cases))
+    parser.add_argument("--sizes", help="Comma-separated pixel sizes "
+                                        "(default: Contents.json sizes plus 2048, 4096)")
+    parser.add_argument("--appiconset", default=DEFAULT_APPICONSET,
+                        help="Path to AppIcon.appiconset")
+    parser.add_argument("--input", help="Source image for the fix_* transforms "
+                                        "(default: the full-bleed render)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per case, the fastest is kept")
+    parser.add_argument("--output", default="bench-results.json", help="Results JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed fractional regression, e.g. 0.25 = 25%% slower")
+    parser.add_argument("--min-seconds", type=float, default=MIN_SECONDS,
+                        help="Only compare times of cases at least this slow in the baseline")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as the new baseline")
+    args = parser.parse_args()
+
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    for case in cases:
+        if case not in all_cases:
+            parser.error(f"unknown case: {case}")
+    if args.sizes:
+        sizes = [int(s) for s in args.sizes.split(",")]
+    else:
+        sizes = case_sizes(args.appiconset)
+
+    print(f"Benchmarking {len(cases)} case(s) x {len(sizes)} size(s), "
+          f"best of {args.repeat}...")
+    results = {}
+    for result in run_benchmarks(cases, sizes, args.input, args.repeat):
+        results[result_key(result)] = result
+        if "error" in result:
+            print(f"  {result['case']:<12} {result['size']:>5}px  {result['error']}")
+            continue
+        print(f"  {result['case']:<12} {result['size']:>5}px  "
+              f"wall {result['wall_seconds'] * 1000:9.1f} ms  "
+              f"cpu {result['cpu_seconds'] * 1000:9.1f} ms  "
+              f"peak {result['peak_rss_bytes'] / (1024 * 1024):7.1f} MB  "
+              f"(+{result['rss_growth_bytes'] / (1024 * 1024):.1f} MB)")
+
+    document = {"environment": environment(), "results": results}
+    with open(args.output, "w") as f:
+        json.dump(document, f, indent=2)
+        f.write("\n")
+    print(f"Results: {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+        print(f"Baseline saved: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, nothing to compare (use --save-baseline)")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold, args.min_seconds)
+    if not regressions:
+        print(f"No regressions over {args.threshold:.0%} against {args.baseline}")
+        return
+    print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+    for key, metric, old, new in regressions:
+        if metric == "error":
+            print(f"  {key}: now fails with {new}")
+        else:
+            print(f"  {key}: {metric} {format_value(metric, old)} -> "
+                  f"{format_value(metric, new)} (+{new / old - 1:.0%})")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
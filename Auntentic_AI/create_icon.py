@@ -4,192 +4,192 @@ Create a full-bleed app icon with gold shield and checkmark.
 No borders, no rounded corners - iOS adds those automatically.
 """
 
-from PIL import Image, ImageDraw, ImageFilter
-import math
-
-def create_fullbleed_icon(size=1024):
-    """Create a full-bleed app icon."""
+from PIL import Image, ImageDraw
+import os
+
+import numpy as np
+
+from icon_glow import add_glow, glow_bounds, shield_glow
+from icon_gradients import diagonal_gradient
+from icon_params import FULLBLEED
+from icon_shield import border_colors, paint_shield, shield_field
+from icon_stroke import draw_stroke, stroke_bounds
+from icon_trace import stage, traced
+
+def fullbleed_geometry(size, layout, pixel_scale=1):
+    """
+    Canvas positions of the icon's parts at size: the shield (cx, cy, width,
+    height), its border width, the checkmark points and stroke width, the
+    sparkles (x, y, radius) and the reflection (x, y, half width).
+    """
+    ps = pixel_scale
+    center_x = size // 2
+    center_y = int(size * layout["center_y"])
+    radius = int(size * layout["stroke_width"]) // 2
+    return {
+        "shield": (center_x, center_y, int(size * layout["shield_width"]),
+                   int(size * layout["shield_height"])),
+        "border_width": int(size * layout["border_width"]),
+        "check": [(center_x + int(size * dx), center_y + int(size * dy))
+                  for dx, dy in (layout["check_start"], layout["check_mid"], layout["check_end"])],
+        # The full-width stroke plus a 3px outline (the old offset-line pass)
+        "check_width": radius * 2 + 3 * ps,
+        "sparkles": [(center_x + int(size * dx), center_y + int(size * dy), sr * ps)
+                     for dx, dy, sr in layout["sparkles"]],
+        "reflection": (center_x, int(size * layout["reflection_y"]),
+                       int(size * layout["reflection_width"])),
+    }
+
+
+def fullbleed_layers(size, params=None, pixel_scale=1):
+    """
+    (canvas rect, key) per layer of create_fullbleed_icon, bottom to top,
+    one per sparkle. The key holds everything the layer is drawn from (see
+    icon_incremental).
+    """
+    params = params or FULLBLEED
+    colors = params["colors"]
+    geometry = fullbleed_geometry(size, params["layout"], pixel_scale)
+    shield = geometry["shield"]
+    cx, cy, width, height = shield
+    ps = pixel_scale
+    canvas = (0, 0, size, size)
+    layers = [
+        (canvas, ("background", colors["bg_dark"], colors["bg_light"])),
+        (glow_bounds(*shield, 30 * 4 * ps / 2, 20 * ps),
+         ("glow", shield, colors["gold_mid"], colors["bg_dark"])),
+        # The painted border reaches 1.5px past the outline
+        ((cx - width // 2 - 3, cy - height // 2 - 3, cx + width // 2 + 4, cy + height // 2 + 4),
+         ("shield", shield, geometry["border_width"], colors["gold_bright"],
+          colors["gold_dark"], colors["shield_inner"])),
+        (stroke_bounds(geometry["check"], geometry["check_width"], canvas),
+         ("checkmark", tuple(geometry["check"]), geometry["check_width"], colors["gold_bright"])),
+    ]
+    for sx, sy, sr in geometry["sparkles"]:
+        layers.append(((sx - sr - 1, sy - sr - 1, sx + sr + 2, sy + sr + 2),
+                       ("sparkle", sx, sy, sr, colors["sparkle_core"], colors["sparkle_edge"])))
+    rx, ry, rw = geometry["reflection"]
+    layers.append(((rx - rw - 1, ry - 3 * ps - 1, rx + rw + 2, ry + 23 * ps + 1),
+                   ("reflection", rx, ry, rw, colors["gold_mid"])))
+    return layers
+
+
+def sparkle_color(core, edge, alpha):
+    """
+    Sparkle ring color at alpha 0-255: from core towards edge one level per
+    alpha step, so the channel that changes most reaches edge first.
+    """
+    span = max(abs(e - c) for c, e in zip(core, edge))
+    t = 1.0 if span == 0 else min(1.0, alpha / span)
+    return tuple(c + round((e - c) * t) for c, e in zip(core, edge))
+
+
+@traced()
+def create_fullbleed_icon(size=1024, box=None, pixel_scale=1, params=None):
+    """
+    Create a full-bleed app icon.
+    box=(left, top, right, bottom) renders just that region of the size x size
+    canvas. pixel_scale multiplies the fixed pixel sizes (glow spacing, blur,
+    sparkles, reflection) when rendering at a supersampled size. params
+    defaults to FULLBLEED; icon_params.themed_params() gives the themes.
+    """
 
     # Colors
-    bg_dark = (10, 14, 26)  # #0a0e1a - Dark navy
-    gold_bright = (255, 215, 0)  # #ffd700
-    gold_dark = (184, 134, 11)  # #b8860b
-    gold_mid = (218, 165, 32)  # #daa520
-    shield_inner = (13, 17, 23)  # Dark interior
+    params = params or FULLBLEED
+    colors = params["colors"]
+    layout = params["layout"]
+    bg_dark = colors["bg_dark"]
+    gold_bright = colors["gold_bright"]
+    gold_dark = colors["gold_dark"]
+    gold_mid = colors["gold_mid"]
+    shield_inner = colors["shield_inner"]
 
     # Create main image with dark background - FULL BLEED, no borders
-    img = Image.new('RGB', (size, size), bg_dark)
-    draw = ImageDraw.Draw(img)
-
-    # Add subtle gradient effect to background
-    for y in range(size):
-        for x in range(size):
-            # Diagonal gradient
-            factor = (x + y) / (2 * size)
-            r = int(bg_dark[0] + (18 - bg_dark[0]) * factor * 0.3)
-            g = int(bg_dark[1] + (24 - bg_dark[1]) * factor * 0.3)
-            b = int(bg_dark[2] + (41 - bg_dark[2]) * factor * 0.3)
-            img.putpixel((x, y), (r, g, b))
-
-    draw = ImageDraw.Draw(img)
+    # Subtle diagonal gradient, 30% of the way towards bg_light. The glow
+    # layer is blended over it at 50%, and away from the glow that layer is
+    # plain bg_dark: the blend halves the gradient to 15% everywhere, and
+    # only the glow itself is left to add inside its bounding box
+    with stage("background"):
+        img = diagonal_gradient(size, [(0.0, bg_dark), (1.0, colors["bg_light"])],
+                                strength=0.3 * 0.5, box=box)
+
+    # Everything below is positioned relative to the region's top-left corner
+    left, top = (box[0], box[1]) if box else (0, 0)
+    ps = pixel_scale
 
     # Shield dimensions - LARGER to fill more space
-    center_x = size // 2
-    center_y = int(size * 0.47)  # Slightly above center
-    shield_width = int(size * 0.62)  # Larger shield
-    shield_height = int(size * 0.72)
-    border_width = int(size * 0.04)  # Gold border thickness
-
-    def draw_shield(cx, cy, width, height, color, draw_obj):
-        """Draw a shield shape."""
-        # Shield path points
-        top_y = cy - height // 2
-        bottom_y = cy + height // 2
-        left_x = cx - width // 2
-        right_x = cx + width // 2
-
-        # Control points for curves
-        shoulder_y = top_y + height * 0.15
-        waist_y = cy + height * 0.1
-
-        points = []
-        steps = 100
-
-        # Top curve (left to right)
-        for i in range(steps + 1):
-            t = i / steps
-            x = left_x + (right_x - left_x) * t
-            # Gentle curve at top
-            curve = math.sin(t * math.pi) * (height * 0.02)
-            y = top_y + curve
-            points.append((x, y))
-
-        # Right side curve down
-        for i in range(1, steps + 1):
-            t = i / steps
-            # Curve inward as we go down
-            x = right_x - (right_x - cx) * (t ** 1.5)
-            y = top_y + (bottom_y - top_y) * t
-            points.append((x, y))
-
-        # Bottom point
-        points.append((cx, bottom_y))
-
-        # Left side curve up
-        for i in range(1, steps):
-            t = 1 - (i / steps)
-            x = left_x + (cx - left_x) * ((1-t) ** 1.5)
-            y = top_y + (bottom_y - top_y) * (1-t)
-            points.append((x, y))
-
-        draw_obj.polygon(points, fill=color)
-        return points
-
-    # Create glow layer
-    glow_img = Image.new('RGB', (size, size), bg_dark)
-    glow_draw = ImageDraw.Draw(glow_img)
-
-    # Draw gold glow behind shield
-    for i in range(30, 0, -1):
-        alpha = int(255 * (i / 30) * 0.15)
-        glow_color = (
-            int(gold_mid[0] * 0.3),
-            int(gold_mid[1] * 0.3),
-            int(gold_mid[2] * 0.3)
-        )
-        draw_shield(center_x, center_y,
-                   shield_width + i*4, shield_height + i*4,
-                   glow_color, glow_draw)
-
-    # Blur the glow
-    glow_img = glow_img.filter(ImageFilter.GaussianBlur(radius=20))
-
-    # Composite glow onto main image
-    img = Image.blend(img, glow_img, 0.5)
+    geometry = fullbleed_geometry(size, layout, ps)
+    shield = geometry["shield"]
+    center_x = shield[0] - left
+    center_y = shield[1] - top
+    shield_width, shield_height = shield[2], shield[3]
+    border_width = geometry["border_width"]
+
+    # Draw gold glow behind shield: the 30 stacked glow shields, 4px larger
+    # each, share one color, so together they are just the largest one
+    glow_color = (
+        int(gold_mid[0] * 0.3),
+        int(gold_mid[1] * 0.3),
+        int(gold_mid[2] * 0.3)
+    )
+    region = tuple(box) if box else (0, 0, size, size)
+    with stage("glow"):
+        glow = shield_glow(*shield, 30 * 4 * ps / 2, 20 * ps, region, size)
+
+    # Composite glow onto main image: 50% of (glow_color - bg_dark) x coverage
+    with stage("blend"):
+        pixels = np.array(img)
+        add_glow(pixels, glow, np.subtract(glow_color, bg_dark), 0.5, region[:2])
+
+    # Shield outline as one signed offset field over the region: the gold
+    # border rings (bright gold outside to darker gold inside) and the inner
+    # fill, 1.25 borders in, are both lookups on it
+    inner_offset = border_width * 2.5 / 2
+    with stage("shield_field"):
+        field = shield_field(*shield, region, lo=-inner_offset - 1, hi=1.5)
+    with stage("shield_paint"):
+        paint_shield(pixels, field, border_colors(border_width, gold_bright, gold_dark),
+                     shield_inner, inner_offset)
+        img = Image.fromarray(pixels)
     draw = ImageDraw.Draw(img)
 
-    # Draw outer shield (gold border)
-    # Create gradient effect by drawing multiple layers
-    for i in range(border_width, 0, -1):
-        # Gradient from bright gold to darker gold
-        t = i / border_width
-        color = (
-            int(gold_bright[0] * t + gold_dark[0] * (1-t)),
-            int(gold_bright[1] * t + gold_dark[1] * (1-t)),
-            int(gold_bright[2] * t + gold_dark[2] * (1-t))
-        )
-        draw_shield(center_x, center_y,
-                   shield_width - (border_width - i) * 2,
-                   shield_height - (border_width - i) * 2,
-                   color, draw)
-
-    # Draw inner shield (dark fill)
-    inner_width = shield_width - border_width * 2.5
-    inner_height = shield_height - border_width * 2.5
-    draw_shield(center_x, center_y, inner_width, inner_height, shield_inner, draw)
-
     # Draw checkmark
     check_color = gold_bright
-    stroke_width = int(size * 0.055)  # Thicker checkmark
-
-    # Checkmark points (relative to center)
-    check_start = (center_x - int(size * 0.12), center_y + int(size * 0.02))
-    check_mid = (center_x - int(size * 0.02), center_y + int(size * 0.12))
-    check_end = (center_x + int(size * 0.17), center_y - int(size * 0.10))
-
-    # Draw thick checkmark with rounded ends
-    for offset in range(-stroke_width//2, stroke_width//2 + 1):
-        for offset2 in range(-stroke_width//2, stroke_width//2 + 1):
-            if offset*offset + offset2*offset2 <= (stroke_width//2)**2:
-                draw.line([
-                    (check_start[0] + offset, check_start[1] + offset2),
-                    (check_mid[0] + offset, check_mid[1] + offset2)
-                ], fill=check_color, width=3)
-                draw.line([
-                    (check_mid[0] + offset, check_mid[1] + offset2),
-                    (check_end[0] + offset, check_end[1] + offset2)
-                ], fill=check_color, width=3)
-
-    # Draw proper thick lines
-    draw.line([check_start, check_mid], fill=gold_bright, width=stroke_width)
-    draw.line([check_mid, check_end], fill=gold_bright, width=stroke_width)
-
-    # Add rounded caps
-    radius = stroke_width // 2
-    draw.ellipse([check_start[0]-radius, check_start[1]-radius,
-                  check_start[0]+radius, check_start[1]+radius], fill=gold_bright)
-    draw.ellipse([check_mid[0]-radius, check_mid[1]-radius,
-                  check_mid[0]+radius, check_mid[1]+radius], fill=gold_bright)
-    draw.ellipse([check_end[0]-radius, check_end[1]-radius,
-                  check_end[0]+radius, check_end[1]+radius], fill=gold_bright)
+
+    # Checkmark points (relative to the region)
+    check_points = [(x - left, y - top) for x, y in geometry["check"]]
+
+    # Draw thick checkmark with rounded ends and join: the full-width stroke
+    # plus a 3px outline, in one analytic stroke
+    with stage("checkmark"):
+        draw_stroke(img, check_points, geometry["check_width"], check_color)
 
     # Add subtle sparkle highlights
-    sparkles = [
-        (center_x - int(size * 0.22), center_y - int(size * 0.20), 4),
-        (center_x + int(size * 0.20), center_y - int(size * 0.08), 3),
-        (center_x + int(size * 0.14), center_y + int(size * 0.16), 2),
-    ]
+    sparkles = [(sx - left, sy - top, sr) for sx, sy, sr in geometry["sparkles"]]
 
-    for sx, sy, sr in sparkles:
-        for i in range(sr, 0, -1):
-            alpha = int(255 * (i / sr))
-            sparkle_color = (255, 255, min(255, 102 + alpha))
-            draw.ellipse([sx-i, sy-i, sx+i, sy+i], fill=sparkle_color)
+    with stage("sparkles"):
+        for sx, sy, sr in sparkles:
+            for i in range(sr, 0, -1):
+                alpha = int(255 * (i / sr))
+                color = sparkle_color(colors["sparkle_core"], colors["sparkle_edge"], alpha)
+                draw.ellipse([sx-i, sy-i, sx+i, sy+i], fill=color)
 
     # Add subtle reflection at bottom
-    reflection_y = int(size * 0.88)
-    for i in range(20):
-        alpha = 0.03 * (1 - i/20)
-        rx = center_x
-        ry = reflection_y + i
-        rw = int(size * 0.2) - i * 3
-        if rw > 0:
-            reflection_color = (
-                int(gold_mid[0] * alpha),
-                int(gold_mid[1] * alpha),
-                int(gold_mid[2] * alpha)
-            )
-            draw.ellipse([rx-rw, ry-3, rx+rw, ry+3], fill=reflection_color)
+    reflection_x, reflection_y, reflection_width = geometry["reflection"]
+    reflection_y -= top
+    with stage("reflection"):
+        for i in range(20 * ps):
+            alpha = 0.03 * (1 - i/(20 * ps))
+            rx = reflection_x - left
+            ry = reflection_y + i
+            rw = reflection_width - i * 3
+            if rw > 0:
+                reflection_color = (
+                    int(gold_mid[0] * alpha),
+                    int(gold_mid[1] * alpha),
+                    int(gold_mid[2] * alpha)
+                )
+                draw.ellipse([rx-rw, ry-3*ps, rx+rw, ry+3*ps], fill=reflection_color)
 
     return img
 
@@ -197,7 +197,7 @@ if __name__ == "__main__":
     print("Creating full-bleed app icon (1024x1024)...")
     icon = create_fullbleed_icon(1024)
 
-    output_path = "/Users/bayuhidayat/Document/Developer_Bayu/Auntentic_check_v2/Auntentic_AI/app-icon-1024.png"
+    output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app-icon-1024.png")
     icon.save(output_path, "PNG", optimize=True)
     print(f"Saved to: {output_path}")
 
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Export the CheckKicks AppIcon asset catalog from a single master render.
+Renders (or loads) the 1024x1024 master once, builds a 2x downsampling
+pyramid from it and derives every size listed in Contents.json from the
+nearest pyramid level. Contents.json is rewritten in the same pass.
+"""
+
+from PIL import Image
+import argparse
+import os
+
+from icon_catalog import (DEFAULT_APPICONSET, export_key, load_contents, pixel_size,
+                          write_contents)
+from icon_encode import format_report, save_png
+from icon_svg import open_image
+from icon_trace import stage
+from render_cache import DEFAULT_CACHE_DIR, RenderCache, output_key
+
+
+def get_renderer(name):
+    """Look up an icon renderer by name. Imported lazily, they pull in PIL drawing code."""
+    if name == "checkkicks":
+        from generate_icon import create_checkkicks_icon_v2
+        return create_checkkicks_icon_v2
+    if name == "fullbleed":
+        from create_icon import create_fullbleed_icon
+        return create_fullbleed_icon
+    from icon_svg import SVG_RENDERERS, svg_renderer
+    if name in SVG_RENDERERS:
+        return svg_renderer(name)
+    raise ValueError(f"Unknown renderer: {name}")
+
+
+def build_pyramid(master, min_size):
+    """Halve the master repeatedly until the next level would be smaller than min_size."""
+    levels = [master]
+    while levels[-1].width // 2 >= min_size:
+        levels.append(levels[-1].reduce(2))
+    return levels
+
+
+def derive(levels, size):
+    """Resample the smallest pyramid level that is still >= size down to size."""
+    source = levels[0]
+    for level in levels:
+        if level.width >= size:
+            source = level
+    if source.width == size:
+        return source.copy()
+    return source.resize((size, size), Image.Resampling.LANCZOS)
+
+
+def export_appiconset(master, appiconset_dir, contents=None, cache=None, key=None):
+    """
+    Write every image listed in Contents.json, derived from one master image.
+    master may be a callable returning the image; with a RenderCache and a
+    renderer key it is only called when some output is missing or stale.
+    Returns a list of (filename, pixel_size, status) in Contents.json order.
+    """
+    if contents is None:
+        contents = load_contents(appiconset_dir)
+
+    sizes = [pixel_size(entry) for entry in contents["images"]]
+    levels = None
+
+    # Several slots share a pixel size (e.g. 120 for @2x 60pt and @3x 40pt)
+    derived = {}
+    written = []
+    for entry, size in zip(contents["images"], sizes):
+        filename = entry.get("filename") or f"icon-{size}.png"
+        entry["filename"] = filename
+        output_path = os.path.join(appiconset_dir, filename)
+
+        size_key = output_key(key, size=size) if cache else None
+        if cache and cache.is_fresh(output_path, size_key):
+            status = "up to date"
+        elif cache and cache.restore(size_key, output_path):
+            cache.record(output_path, size_key)
+            status = "from cache"
+        else:
+            if levels is None:
+                with stage("master"):
+                    image = master() if callable(master) else master
+                with stage("pyramid"):
+                    levels = build_pyramid(image.convert("RGB"), min(sizes))
+            if size not in derived:
+                with stage("derive", size=size):
+                    derived[size] = derive(levels, size)
+            with stage("encode", size=size):
+                report = save_png(derived[size], output_path, size)
+            if cache:
+                cache.put(size_key, output_path)
+                cache.record(output_path, size_key)
+            status = "rendered, " + format_report(report)
+
+        written.append((filename, size, status))
+        print(f"  {filename} ({size}x{size}) - {status}")
+
+    if cache:
+        cache.save_manifest()
+    write_contents(appiconset_dir, contents)
+    return written
+
+
+def render_master(renderer, size, supersample=1, workers=1):
+    """Render the master icon once with the named renderer."""
+    if supersample > 1:
+        from icon_supersample import render_supersampled
+        return render_supersampled(renderer, size, supersample, workers)
+    return get_renderer(renderer)(size)
+
+
+def master_loader(contents, renderer="fullbleed", source=None, supersample=1, workers=1):
+    """Callable producing the master at the catalog's largest size, from source or rendered."""
+    master_size = max(pixel_size(entry) for entry in contents["images"])
+
+    def master():
+        if not source:
+            print(f"Rendering {renderer} master ({master_size}x{master_size})...")
+            return render_master(renderer, master_size, supersample, workers)
+        print(f"Loading master: {source}")
+        image = open_image(source, master_size)
+        if image.size != (master_size, master_size):
+            image = image.convert("RGB").resize((master_size, master_size),
+                                                Image.Resampling.LANCZOS)
+        return image
+    return master
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--renderer", default="fullbleed",
+                        help="checkkicks, fullbleed or an svg-* renderer (ignored with --source)")
+    parser.add_argument("--source", help="Use an existing master image (PNG or SVG) instead of rendering")
+    parser.add_argument("--appiconset", default=DEFAULT_APPICONSET,
+                        help="Path to AppIcon.appiconset")
+    parser.add_argument("--supersample", type=int, default=1,
+                        help="Render the master with tile-based NxN supersampling")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes for supersampled tiles")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="Render cache location")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-render and re-encode every size")
+    parser.add_argument("--trace", help="Write a Chrome trace of the export stages here")
+    args = parser.parse_args()
+
+    contents = load_contents(args.appiconset)
+    key = export_key(contents, args.renderer, args.source, args.supersample)
+    master = master_loader(contents, args.renderer, args.source, args.supersample, args.workers)
+    cache = None if args.no_cache else RenderCache(args.cache_dir)
+
+    if args.trace:
+        import icon_trace
+        icon_trace.start_session()
+
+    print(f"Exporting to: {args.appiconset}")
+    written = export_appiconset(master, args.appiconset, contents, cache, key)
+    rendered = sum(1 for _, _, status in written if status.startswith("rendered"))
+    print(f"Done! {len(written)} icons ({rendered} rendered), Contents.json up to date.")
+
+    if args.trace:
+        icon_trace.print_summary(icon_trace.finish_session(args.trace))
+        print(f"Trace: {args.trace}")
+
+
+if __name__ == "__main__":
+    main()
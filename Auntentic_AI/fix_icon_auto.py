@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Full-bleed icon converter with automatic inner-frame detection.
+Finds the inner rounded-rectangle frame from row and column edge profiles
+instead of a guessed margin, crops just inside it, paints the frame's
+rounded corners with the icon background and scales the result back to
+full size. Converts a single image or streams over a whole directory.
+"""
+
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import argparse
+import math
+import os
+import time
+
+import numpy as np
+
+from icon_encode import save_png
+from icon_mask import apply_mask, rounded_rect_mask
+from icon_trace import stage, traced
+import icon_trace
+
+# A frame line is a luma step of at least this much (0-255) along the whole edge
+FRAME_THRESHOLD = 12.0
+
+# Frames are only searched for in the outer 20% of each side
+MAX_MARGIN = 0.2
+
+# Pixels cropped past the frame's inner edge, to drop its antialiasing
+FRAME_PAD = 2
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+
+def luma(pixels):
+    """RGB uint8 array -> float32 luma (Rec. 601)."""
+    return pixels[..., :3].astype(np.float32) @ np.array([0.299, 0.587, 0.114], np.float32)
+
+
+def edge_profiles(lum):
+    """
+    Median absolute luma step between neighbouring columns and rows, over the
+    middle half of the other axis. A straight frame line steps on every row,
+    artwork edges only on some, so the median keeps the frame and drops the art.
+    """
+    height, width = lum.shape
+    rows = lum[height // 4:height - height // 4, :]
+    cols = lum[:, width // 4:width - width // 4]
+    column_steps = np.median(np.abs(np.diff(rows, axis=1)), axis=0)
+    row_steps = np.median(np.abs(np.diff(cols, axis=0)), axis=1)
+    return column_steps, row_steps
+
+
+def _inner_step(steps, limit, gap):
+    """
+    Number of pixels before the inside of the outermost frame line, given the
+    steps between pixel i and i + 1 counted from the edge. A line has a step
+    into it and one out of it: the inside starts after the last step of the
+    first cluster. 0 when there is no frame.
+    """
+    strong = np.nonzero(steps[:limit] >= FRAME_THRESHOLD)[0]
+    if not len(strong):
+        return 0
+    end = strong[0]
+    for index in strong[1:]:
+        if index - end > gap:
+            break
+        end = index
+    return int(end) + 1
+
+
+def detect_frame(pixels):
+    """
+    Find the inner frame of an RGB array. Returns (left, top, right, bottom)
+    of the area inside the frame line and the radius of its rounded corners,
+    or None when the image has no frame.
+    """
+    lum = luma(pixels)
+    height, width = lum.shape
+    gap = max(3, min(width, height) // 128)
+    column_steps, row_steps = edge_profiles(lum)
+
+    left = _inner_step(column_steps, int(width * MAX_MARGIN), gap)
+    right = width - _inner_step(column_steps[::-1], int(width * MAX_MARGIN), gap)
+    top = _inner_step(row_steps, int(height * MAX_MARGIN), gap)
+    bottom = height - _inner_step(row_steps[::-1], int(height * MAX_MARGIN), gap)
+    if (left, top, right, bottom) == (0, 0, width, height):
+        return None
+
+    # Corner radius from where the diagonal out of each inner corner crosses
+    # the frame's arc: a corner of radius r is r * (sqrt(2) - 1) in
+    # along the diagonal, i.e. r * (1 - 1 / sqrt(2)) pixels per axis
+    reach = min(right - left, bottom - top) // 2
+    k = np.arange(reach)
+    diagonals = [
+        lum[top + k, left + k],
+        lum[top + k, right - 1 - k],
+        lum[bottom - 1 - k, left + k],
+        lum[bottom - 1 - k, right - 1 - k],
+    ]
+    diagonal_steps = np.median([np.abs(np.diff(d)) for d in diagonals], axis=0)
+    steps_in = _inner_step(diagonal_steps, reach // 2, gap)
+    radius = steps_in / (1 - 1 / math.sqrt(2)) if steps_in else 0.0
+    return (left, top, right, bottom), radius
+
+
+def background_color(pixels, box, band=8):
+    """Median color of thin bands just inside the middle third of each frame edge."""
+    left, top, right, bottom = box
+    third_w, third_h = (right - left) // 3, (bottom - top) // 3
+    samples = [
+        pixels[top:top + band, left + third_w:right - third_w],
+        pixels[bottom - band:bottom, left + third_w:right - third_w],
+        pixels[top + third_h:bottom - third_h, left:left + band],
+        pixels[top + third_h:bottom - third_h, right - band:right],
+    ]
+    samples = np.concatenate([s.reshape(-1, pixels.shape[-1]) for s in samples])
+    return tuple(int(c) for c in np.median(samples, axis=0)[:3])
+
+
+def convert_image(img, size=None):
+    """
+    Full-bleed version of a decoded image. The same decode is used for frame
+    detection and for the output. Returns (image, frame box, radius), with
+    the image unchanged apart from resizing when no frame is found.
+    """
+    with stage("decode"):
+        img = img.convert("RGB")
+    size = size or img.width
+    pixels = np.asarray(img)
+    with stage("detect"):
+        frame = detect_frame(pixels)
+    if frame is None:
+        if img.size != (size, size):
+            img = img.resize((size, size), Image.Resampling.LANCZOS)
+        return img, None, 0.0
+
+    box, radius = frame
+    crop = (box[0] + FRAME_PAD, box[1] + FRAME_PAD, box[2] - FRAME_PAD, box[3] - FRAME_PAD)
+    content = img.crop(crop)
+    # The frame's rounded corners stay inside the crop: paint them over
+    if radius > FRAME_PAD:
+        with stage("cleanup"):
+            mask = rounded_rect_mask(content.size, radius - FRAME_PAD)
+            content = apply_mask(content, mask, background_color(pixels, box))
+    with stage("crop_scale"):
+        content = content.resize((size, size), Image.Resampling.LANCZOS)
+    return content, box, radius
+
+
+@traced()
+def fix_icon_auto(input_path, output_path, size=None):
+    """Convert one framed icon to full-bleed; the same interface as the fix_icon_* scripts."""
+    print(f"Loading: {input_path}")
+    with Image.open(input_path) as img:
+        result, box, radius = convert_image(img, size)
+    if box:
+        print(f"Inner frame: {box}, corner radius {radius:.0f}px")
+    else:
+        print("No inner frame found, resized only")
+
+    # output_path=None returns the result without encoding it (batch export)
+    if output_path:
+        print(f"Saving to: {output_path}")
+        with stage("encode"):
+            result.save(output_path, 'PNG', optimize=True)
+    return result
+
+
+def convert_file(job):
+    """Worker entry point: decode, detect, convert and encode one file."""
+    input_path, output_path, size = job
+    start = time.perf_counter()
+    with Image.open(input_path) as img:
+        result, box, radius = convert_image(img, size)
+    with stage("encode"):
+        save_png(result, output_path)
+    icon_trace.flush()
+    return {
+        "input": input_path,
+        "output": output_path,
+        "frame": box,
+        "radius": radius,
+        "bytes": os.path.getsize(output_path),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def iter_jobs(input_dir, output_dir, size=None):
+    """Conversion jobs for the images in input_dir, generated as the directory is read."""
+    for entry in sorted(os.scandir(input_dir), key=lambda e: e.name):
+        if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+            name = os.path.splitext(entry.name)[0] + ".png"
+            yield entry.path, os.path.join(output_dir, name), size
+
+
+def convert_directory(input_dir, output_dir, size=None, workers=1):
+    """
+    Convert every image in input_dir, yielding results in file order. At most
+    2 * workers files are in flight, so memory does not grow with the
+    directory size.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = iter_jobs(input_dir, output_dir, size)
+    if workers <= 1:
+        for job in jobs:
+            yield convert_file(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for job in jobs:
+            pending.append(executor.submit(convert_file, job))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", help="Source image, or a directory of source images")
+    parser.add_argument("output", nargs="?",
+                        help="Output PNG, or output directory (default: <input>/fullbleed)")
+    parser.add_argument("--size", type=int, help="Output edge in pixels (default: source width)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes for directory conversion")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input):
+        if not os.path.exists(args.input):
+            print(f"Error: Input file not found: {args.input}")
+            return
+        output = args.output or os.path.splitext(args.input)[0] + "-fullbleed.png"
+        result = fix_icon_auto(args.input, output, args.size)
+        print(f"\nOutput: {result.width}x{result.height}")
+        print("Done!")
+        return
+
+    output_dir = args.output or os.path.join(args.input, "fullbleed")
+    print(f"Converting {args.input} -> {output_dir} with {args.workers} worker(s)...")
+    start = time.perf_counter()
+    count = 0
+    for result in convert_directory(args.input, output_dir, args.size, args.workers):
+        count += 1
+        frame = (f"frame {result['frame']}, radius {result['radius']:.0f}px"
+                 if result["frame"] else "no frame")
+        print(f"  {os.path.basename(result['input'])}: {frame}, "
+              f"{result['bytes']:,} bytes, {result['seconds']:.3f}s")
+    print(f"Done! {count} icons in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
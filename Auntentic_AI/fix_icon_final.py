@@ -6,13 +6,22 @@ iOS masks corners at ~22% radius, so push the border outside that zone.
 
 from PIL import Image
 import os
+import sys
 
+from icon_trace import stage, traced
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SCRIPT_DIR)
+
+
+@traced()
 def fix_icon_aggressive(input_path, output_path):
     """
     Very aggressive crop and scale to eliminate inner border completely.
     """
     print(f"Loading: {input_path}")
-    img = Image.open(input_path).convert('RGB')
+    with stage("decode"):
+        img = Image.open(input_path).convert('RGB')
     original_size = img.size[0]
 
     # The inner border is approximately 50px from each edge
@@ -25,26 +34,32 @@ def fix_icon_aggressive(input_path, output_path):
 
     crop_amount = 95  # Crop 95px from each edge
 
-    crop_box = (crop_amount, crop_amount,
-                original_size - crop_amount, original_size - crop_amount)
+    with stage("crop_scale"):
+        crop_box = (crop_amount, crop_amount,
+                    original_size - crop_amount, original_size - crop_amount)
 
-    cropped = img.crop(crop_box)
-    cropped_size = original_size - 2 * crop_amount  # 834x834
+        cropped = img.crop(crop_box)
+        cropped_size = original_size - 2 * crop_amount  # 834x834
 
-    print(f"Cropped from {original_size} to {cropped_size}")
+        print(f"Cropped from {original_size} to {cropped_size}")
 
-    # Scale back up to 1024x1024
-    scaled = cropped.resize((1024, 1024), Image.Resampling.LANCZOS)
+        # Scale back up to 1024x1024
+        scaled = cropped.resize((1024, 1024), Image.Resampling.LANCZOS)
 
     print(f"Scaled back to 1024x1024")
-    print(f"Saving to: {output_path}")
-
-    scaled.save(output_path, 'PNG', optimize=True)
+    # output_path=None returns the result without encoding it (batch export)
+    if output_path:
+        print(f"Saving to: {output_path}")
+        with stage("encode"):
+            scaled.save(output_path, 'PNG', optimize=True)
     return scaled
 
 def main():
-    input_path = "/Users/bayuhidayat/Document/Developer_Bayu/Auntentic_check_v2/ChatGPT Image Jan 2, 2026, 10_23_58 AM.png"
-    output_path = "/Users/bayuhidayat/Document/Developer_Bayu/Auntentic_check_v2/Auntentic_AI/app-icon-fullbleed.png"
+    # Usage: script.py [input] [output]; defaults are relative to the repository
+    input_path = (sys.argv[1] if len(sys.argv) > 1 else
+                  os.path.join(REPO_DIR, "ChatGPT Image Jan 2, 2026, 10_23_58 AM.png"))
+    output_path = (sys.argv[2] if len(sys.argv) > 2 else
+                   os.path.join(SCRIPT_DIR, "app-icon-fullbleed.png"))
 
     if not os.path.exists(input_path):
         print(f"Error: Input not found: {input_path}")
@@ -6,14 +6,23 @@ Scale up the center content so the inner frame is outside iOS's corner mask.
 
 from PIL import Image, ImageDraw, ImageFilter
 import os
+import sys
 
+from icon_trace import stage, traced
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SCRIPT_DIR)
+
+
+@traced()
 def fix_icon_fullbleed(input_path, output_path):
     """
     Aggressively crop and scale to remove inner borders.
     The inner frame should be outside iOS's rounded corner mask (radius ~22%).
     """
     print(f"Loading: {input_path}")
-    img = Image.open(input_path).convert('RGB')
+    with stage("decode"):
+        img = Image.open(input_path).convert('RGB')
     width, height = img.size
     print(f"Original size: {width}x{height}")
 
@@ -28,47 +37,55 @@ def fix_icon_fullbleed(input_path, output_path):
     # The frame appears to be about 50-70px from edges
     crop_margin = 70
 
-    crop_box = (crop_margin, crop_margin, width - crop_margin, height - crop_margin)
-    cropped = img.crop(crop_box)
-    cropped_size = width - 2 * crop_margin  # Should be ~884
+    with stage("crop_scale"):
+        crop_box = (crop_margin, crop_margin, width - crop_margin, height - crop_margin)
+        cropped = img.crop(crop_box)
+        cropped_size = width - 2 * crop_margin  # Should be ~884
 
-    # Scale up significantly so the shield fills more of the icon
-    # iOS icon corner radius is about 22% of width, so anything in outer 22% gets masked
-    # We want the shield larger but inner frame outside the mask
-    scale_factor = 1.18  # Scale up by 18%
-    new_size = int(cropped_size * scale_factor)
+        # Scale up significantly so the shield fills more of the icon
+        # iOS icon corner radius is about 22% of width, so anything in outer 22% gets masked
+        # We want the shield larger but inner frame outside the mask
+        scale_factor = 1.18  # Scale up by 18%
+        new_size = int(cropped_size * scale_factor)
 
-    # Resize with high quality
-    scaled = cropped.resize((new_size, new_size), Image.Resampling.LANCZOS)
+        # Resize with high quality
+        scaled = cropped.resize((new_size, new_size), Image.Resampling.LANCZOS)
 
-    # Center the scaled content
-    paste_x = (output_size - new_size) // 2
-    paste_y = (output_size - new_size) // 2
+        # Center the scaled content
+        paste_x = (output_size - new_size) // 2
+        paste_y = (output_size - new_size) // 2
 
-    new_img.paste(scaled, (paste_x, paste_y))
+        new_img.paste(scaled, (paste_x, paste_y))
 
     # Fill any remaining edge artifacts with background color
     draw = ImageDraw.Draw(new_img)
 
     # Make sure all 4 edges are solid background
     # The paste should have left small strips, fill them
-    if paste_x > 0:
-        draw.rectangle([0, 0, paste_x, output_size], fill=bg_color)  # Left strip
-        draw.rectangle([output_size - paste_x, 0, output_size, output_size], fill=bg_color)  # Right strip
-    if paste_y > 0:
-        draw.rectangle([0, 0, output_size, paste_y], fill=bg_color)  # Top strip
-        draw.rectangle([0, output_size - paste_y, output_size, output_size], fill=bg_color)  # Bottom strip
+    with stage("cleanup"):
+        if paste_x > 0:
+            draw.rectangle([0, 0, paste_x, output_size], fill=bg_color)  # Left strip
+            draw.rectangle([output_size - paste_x, 0, output_size, output_size], fill=bg_color)  # Right strip
+        if paste_y > 0:
+            draw.rectangle([0, 0, output_size, paste_y], fill=bg_color)  # Top strip
+            draw.rectangle([0, output_size - paste_y, output_size, output_size], fill=bg_color)  # Bottom strip
 
     print(f"Crop margin: {crop_margin}px, Scale factor: {scale_factor}")
     print(f"Scaled size: {new_size}x{new_size}, Paste offset: ({paste_x}, {paste_y})")
-    print(f"Saving to: {output_path}")
+    # output_path=None returns the result without encoding it (batch export)
+    if output_path:
+        print(f"Saving to: {output_path}")
 
-    new_img.save(output_path, 'PNG', optimize=True)
+        with stage("encode"):
+            new_img.save(output_path, 'PNG', optimize=True)
     return new_img
 
 def main():
-    input_path = "/Users/bayuhidayat/Document/Developer_Bayu/Auntentic_check_v2/ChatGPT Image Jan 2, 2026, 10_23_58 AM.png"
-    output_path = "/Users/bayuhidayat/Document/Developer_Bayu/Auntentic_check_v2/Auntentic_AI/app-icon-fullbleed.png"
+    # Usage: script.py [input] [output]; defaults are relative to the repository
+    input_path = (sys.argv[1] if len(sys.argv) > 1 else
+                  os.path.join(REPO_DIR, "ChatGPT Image Jan 2, 2026, 10_23_58 AM.png"))
+    output_path = (sys.argv[2] if len(sys.argv) > 2 else
+                   os.path.join(SCRIPT_DIR, "app-icon-fullbleed.png"))
 
     if not os.path.exists(input_path):
         print(f"Error: Input file not found: {input_path}")
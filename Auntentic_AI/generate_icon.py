@@ -5,322 +5,299 @@ Creates a 1024x1024 icon featuring a stylized sneaker with verification checkmar
 Version 2: Enhanced sneaker design with better proportions and details.
 """
 
-from PIL import Image, ImageDraw
-import math
+from functools import lru_cache
+import argparse
+import os
 
-def create_gradient_background(size):
-    """Create a deep navy gradient background."""
-    img = Image.new('RGB', (size, size))
+from icon_gradients import diagonal_gradient
+from icon_params import CHECKKICKS_V2
+from icon_scene import Px, Scene
+from icon_trace import stage, traced
 
+def create_gradient_background(size, box=None, colors=None):
+    """Create a deep navy gradient background."""
     # Gradient from top-left (#0F172A) to bottom-right (#1E293B)
-    for y in range(size):
-        for x in range(size):
-            # Calculate position along diagonal
-            t = (x + y) / (2 * size)
-
-            # Colors
-            r1, g1, b1 = 15, 23, 42      # #0F172A - Deep Navy
-            r2, g2, b2 = 30, 41, 59      # #1E293B - Charcoal
-
-            r = int(r1 + (r2 - r1) * t)
-            g = int(g1 + (g2 - g1) * t)
-            b = int(b1 + (b2 - b1) * t)
-
-            img.putpixel((x, y), (r, g, b))
-
-    return img
-
-def draw_sneaker_v2(draw, offset_x, offset_y, scale):
-    """Draw an enhanced stylized sneaker silhouette - side profile view."""
-    # Colors
-    shoe_white = (248, 250, 252)  # #F8FAFC - Main shoe
-    shoe_light = (241, 245, 249)  # #F1F5F9 - Highlights
-    shoe_gray = (226, 232, 240)   # #E2E8F0 - Shadows
-    sole_gray = (203, 213, 225)   # #CBD5E1 - Sole
-    sole_dark = (148, 163, 184)   # #94A3B8 - Sole details
-    dark_navy = (15, 23, 42)      # #0F172A - Lace holes
+    colors = colors or CHECKKICKS_V2["background"]
+    return diagonal_gradient(size, [(0.0, colors["start"]), (1.0, colors["end"])], box=box)
 
-    s = scale
+def build_sneaker_scene():
+    """Stylized sneaker silhouette - side profile view, in sneaker design units."""
+    scene = Scene()
 
     # === SOLE ===
-    sole = [
-        (offset_x + int(40*s), offset_y + int(340*s)),
-        (offset_x + int(750*s), offset_y + int(340*s)),
-        (offset_x + int(770*s), offset_y + int(360*s)),
-        (offset_x + int(770*s), offset_y + int(390*s)),
-        (offset_x + int(750*s), offset_y + int(420*s)),
-        (offset_x + int(70*s), offset_y + int(420*s)),
-        (offset_x + int(30*s), offset_y + int(390*s)),
-        (offset_x + int(30*s), offset_y + int(360*s)),
-    ]
-    draw.polygon(sole, fill=sole_gray)
+    scene.polygon([
+        (40, 340), (750, 340), (770, 360), (770, 390),
+        (750, 420), (70, 420), (30, 390), (30, 360),
+    ], fill="sole_gray")
 
     # Sole tread line
-    draw.line([
-        (offset_x + int(80*s), offset_y + int(385*s)),
-        (offset_x + int(720*s), offset_y + int(385*s))
-    ], fill=sole_dark, width=int(4*s))
+    scene.line([(80, 385), (720, 385)], fill="sole_dark", width=4)
 
     # Midsole highlight
-    draw.line([
-        (offset_x + int(50*s), offset_y + int(355*s)),
-        (offset_x + int(760*s), offset_y + int(355*s))
-    ], fill=shoe_light, width=int(6*s))
+    scene.line([(50, 355), (760, 355)], fill="shoe_light", width=6)
 
     # === MAIN SHOE BODY ===
     # Heel section
-    heel = [
-        (offset_x + int(60*s), offset_y + int(340*s)),
-        (offset_x + int(60*s), offset_y + int(200*s)),
-        (offset_x + int(100*s), offset_y + int(160*s)),
-        (offset_x + int(200*s), offset_y + int(140*s)),
-        (offset_x + int(200*s), offset_y + int(340*s)),
-    ]
-    draw.polygon(heel, fill=shoe_gray)
+    scene.polygon([
+        (60, 340), (60, 200), (100, 160), (200, 140), (200, 340),
+    ], fill="shoe_gray")
 
     # Main upper body
-    upper = [
-        (offset_x + int(60*s), offset_y + int(200*s)),
-        (offset_x + int(100*s), offset_y + int(160*s)),
-        (offset_x + int(200*s), offset_y + int(140*s)),
-        (offset_x + int(350*s), offset_y + int(110*s)),
-        (offset_x + int(500*s), offset_y + int(100*s)),
-        (offset_x + int(620*s), offset_y + int(110*s)),
-        (offset_x + int(700*s), offset_y + int(150*s)),
-        (offset_x + int(740*s), offset_y + int(220*s)),
-        (offset_x + int(750*s), offset_y + int(300*s)),
-        (offset_x + int(750*s), offset_y + int(340*s)),
-        (offset_x + int(60*s), offset_y + int(340*s)),
-    ]
-    draw.polygon(upper, fill=shoe_white)
+    scene.polygon([
+        (60, 200), (100, 160), (200, 140), (350, 110), (500, 100), (620, 110),
+        (700, 150), (740, 220), (750, 300), (750, 340), (60, 340),
+    ], fill="shoe_white")
 
     # === TOE BOX ===
-    toe_box = [
-        (offset_x + int(620*s), offset_y + int(120*s)),
-        (offset_x + int(700*s), offset_y + int(150*s)),
-        (offset_x + int(740*s), offset_y + int(220*s)),
-        (offset_x + int(750*s), offset_y + int(300*s)),
-        (offset_x + int(750*s), offset_y + int(340*s)),
-        (offset_x + int(580*s), offset_y + int(340*s)),
-        (offset_x + int(580*s), offset_y + int(200*s)),
-    ]
-    draw.polygon(toe_box, fill=shoe_light)
+    scene.polygon([
+        (620, 120), (700, 150), (740, 220), (750, 300),
+        (750, 340), (580, 340), (580, 200),
+    ], fill="shoe_light")
 
     # Toe cap
-    toe_cap = [
-        (offset_x + int(680*s), offset_y + int(180*s)),
-        (offset_x + int(740*s), offset_y + int(220*s)),
-        (offset_x + int(750*s), offset_y + int(300*s)),
-        (offset_x + int(750*s), offset_y + int(340*s)),
-        (offset_x + int(650*s), offset_y + int(340*s)),
-        (offset_x + int(650*s), offset_y + int(260*s)),
-    ]
-    draw.polygon(toe_cap, fill=shoe_gray)
+    scene.polygon([
+        (680, 180), (740, 220), (750, 300), (750, 340), (650, 340), (650, 260),
+    ], fill="shoe_gray")
 
     # === TONGUE ===
-    tongue = [
-        (offset_x + int(350*s), offset_y + int(110*s)),
-        (offset_x + int(400*s), offset_y + int(50*s)),
-        (offset_x + int(460*s), offset_y + int(30*s)),
-        (offset_x + int(520*s), offset_y + int(35*s)),
-        (offset_x + int(560*s), offset_y + int(60*s)),
-        (offset_x + int(580*s), offset_y + int(100*s)),
-        (offset_x + int(500*s), offset_y + int(100*s)),
-    ]
-    draw.polygon(tongue, fill=shoe_white)
+    scene.polygon([
+        (350, 110), (400, 50), (460, 30), (520, 35), (560, 60), (580, 100), (500, 100),
+    ], fill="shoe_white")
 
     # Tongue padding (top edge)
-    draw.line([
-        (offset_x + int(400*s), offset_y + int(50*s)),
-        (offset_x + int(460*s), offset_y + int(30*s)),
-        (offset_x + int(520*s), offset_y + int(35*s)),
-        (offset_x + int(560*s), offset_y + int(60*s)),
-    ], fill=shoe_light, width=int(12*s))
+    scene.line([(400, 50), (460, 30), (520, 35), (560, 60)], fill="shoe_light", width=12)
 
     # === LACE AREA ===
     # Lace panel background
-    lace_panel = [
-        (offset_x + int(280*s), offset_y + int(130*s)),
-        (offset_x + int(560*s), offset_y + int(100*s)),
-        (offset_x + int(560*s), offset_y + int(180*s)),
-        (offset_x + int(280*s), offset_y + int(200*s)),
-    ]
-    draw.polygon(lace_panel, fill=shoe_light)
+    scene.polygon([(280, 130), (560, 100), (560, 180), (280, 200)], fill="shoe_light")
 
-    # Lace holes
-    lace_positions = [
-        (320, 150), (380, 140), (440, 135), (500, 140), (550, 150)
-    ]
-    for lx, ly in lace_positions:
-        cx = offset_x + int(lx * s)
-        cy = offset_y + int(ly * s)
-        r = int(12 * s)
-        draw.ellipse([cx-r, cy-r, cx+r, cy+r], fill=dark_navy)
-        # Inner highlight
-        r2 = int(8 * s)
-        draw.ellipse([cx-r2, cy-r2+1, cx+r2, cy+r2+1], fill=(30, 41, 59))
+    # Lace holes, each with an inner highlight nudged 1px down
+    for center in [(320, 150), (380, 140), (440, 135), (500, 140), (550, 150)]:
+        scene.ellipse(center, 12, fill="dark_navy")
+        scene.ellipse(center, 8, fill="lace_hole_inner", nudge=(0, 1))
 
     # Laces (cross pattern)
-    lace_color = shoe_white
-    lace_width = int(4*s)
-    draw.line([
-        (offset_x + int(330*s), offset_y + int(165*s)),
-        (offset_x + int(390*s), offset_y + int(155*s))
-    ], fill=lace_color, width=lace_width)
-    draw.line([
-        (offset_x + int(390*s), offset_y + int(165*s)),
-        (offset_x + int(450*s), offset_y + int(150*s))
-    ], fill=lace_color, width=lace_width)
-    draw.line([
-        (offset_x + int(450*s), offset_y + int(160*s)),
-        (offset_x + int(510*s), offset_y + int(155*s))
-    ], fill=lace_color, width=lace_width)
+    scene.line([(330, 165), (390, 155)], fill="shoe_white", width=4)
+    scene.line([(390, 165), (450, 150)], fill="shoe_white", width=4)
+    scene.line([(450, 160), (510, 155)], fill="shoe_white", width=4)
 
     # === HEEL COUNTER ===
-    heel_counter = [
-        (offset_x + int(60*s), offset_y + int(200*s)),
-        (offset_x + int(60*s), offset_y + int(340*s)),
-        (offset_x + int(150*s), offset_y + int(340*s)),
-        (offset_x + int(150*s), offset_y + int(180*s)),
-        (offset_x + int(100*s), offset_y + int(160*s)),
-    ]
-    draw.polygon(heel_counter, fill=shoe_gray)
+    scene.polygon([(60, 200), (60, 340), (150, 340), (150, 180), (100, 160)],
+                  fill="shoe_gray")
 
     # Heel tab
-    heel_tab = [
-        (offset_x + int(80*s), offset_y + int(150*s)),
-        (offset_x + int(140*s), offset_y + int(130*s)),
-        (offset_x + int(180*s), offset_y + int(140*s)),
-        (offset_x + int(150*s), offset_y + int(170*s)),
-        (offset_x + int(100*s), offset_y + int(160*s)),
-    ]
-    draw.polygon(heel_tab, fill=shoe_light)
+    scene.polygon([(80, 150), (140, 130), (180, 140), (150, 170), (100, 160)],
+                  fill="shoe_light")
 
     # === SWOOSH-LIKE DETAIL ===
     # A subtle curved accent line (not Nike's swoosh, just a decorative curve)
     for i in range(3):
-        offset = i * 2
-        draw.arc([
-            offset_x + int(200*s) + offset, offset_y + int(200*s) + offset,
-            offset_x + int(600*s) - offset, offset_y + int(320*s) - offset
-        ], start=180, end=280, fill=sole_dark, width=int(3*s))
+        scene.arc((200, 200, 600, 320), start=180, end=280,
+                  fill="sole_dark", width=3, inset=i * 2)
 
+    return scene
 
-def draw_checkmark_badge_v2(draw, center_x, center_y, radius):
-    """Draw an enhanced gold verification checkmark badge."""
-    # Colors
-    dark_navy = (15, 23, 42)       # #0F172A
-    gold_light = (229, 197, 71)    # #E5C547
-    gold_main = (212, 175, 55)     # #D4AF37
-    gold_dark = (184, 150, 46)     # #B8962E
 
-    # Outer glow (subtle)
+def build_badge_scene():
+    """
+    Gold verification checkmark badge in checkmark units: centered on the
+    origin with the badge radius at 110 units.
+    """
+    scene = Scene()
+    radius = 110
+
+    # Outer glow (subtle) - 2px rings just outside the badge
     for i in range(10, 0, -2):
-        glow_radius = radius + i * 2
-        alpha = 15 - i
-        # Draw slightly larger circles with decreasing opacity
-        for angle in range(0, 360, 5):
-            x = center_x + int(glow_radius * 0.02 * math.cos(math.radians(angle)))
-            y = center_y + int(glow_radius * 0.02 * math.sin(math.radians(angle)))
-        draw.ellipse([
-            center_x - glow_radius, center_y - glow_radius,
-            center_x + glow_radius, center_y + glow_radius
-        ], outline=(gold_main[0], gold_main[1], gold_main[2]), width=2)
+        scene.ellipse((0, 0), (radius, Px(i * 2)), outline="gold_main", width=Px(2))
 
     # Main circle background
-    draw.ellipse([
-        center_x - radius, center_y - radius,
-        center_x + radius, center_y + radius
-    ], fill=dark_navy)
+    scene.ellipse((0, 0), radius, fill="dark_navy")
 
     # Gold ring
-    ring_width = int(radius * 0.08)
-    draw.ellipse([
-        center_x - radius + ring_width, center_y - radius + ring_width,
-        center_x + radius - ring_width, center_y + radius - ring_width
-    ], outline=gold_main, width=ring_width)
+    ring_width = radius * 0.08
+    scene.ellipse((0, 0), radius - ring_width, outline="gold_main", width=ring_width)
 
     # Inner subtle glow
-    inner_radius = int(radius * 0.75)
-    draw.ellipse([
-        center_x - inner_radius, center_y - inner_radius,
-        center_x + inner_radius, center_y + inner_radius
-    ], outline=(gold_main[0], gold_main[1], gold_main[2], 40), width=2)
-
-    # Checkmark
-    check_scale = radius / 110
+    scene.ellipse((0, 0), radius * 0.75, outline=("gold_main", 40), width=Px(2))
 
     # Checkmark points - bolder, more confident
-    p1 = (center_x - int(50 * check_scale), center_y + int(5 * check_scale))
-    p2 = (center_x - int(10 * check_scale), center_y + int(45 * check_scale))
-    p3 = (center_x + int(55 * check_scale), center_y - int(40 * check_scale))
-
-    # Draw thick checkmark with gradient effect
-    line_width = int(24 * check_scale)
+    p1, p2, p3 = (-50, 5), (-10, 45), (55, -40)
+    line_width = 24
 
     # Shadow
-    shadow_offset = int(3 * check_scale)
-    draw.line([
-        (p1[0] + shadow_offset, p1[1] + shadow_offset),
-        (p2[0] + shadow_offset, p2[1] + shadow_offset)
-    ], fill=gold_dark, width=line_width)
-    draw.line([
-        (p2[0] + shadow_offset, p2[1] + shadow_offset),
-        (p3[0] + shadow_offset, p3[1] + shadow_offset)
-    ], fill=gold_dark, width=line_width)
-
-    # Main checkmark
-    draw.line([p1, p2], fill=gold_main, width=line_width)
-    draw.line([p2, p3], fill=gold_main, width=line_width)
+    shadow = 3
+    scene.stroke([(x + shadow, y + shadow) for x, y in (p1, p2, p3)],
+                 fill="gold_dark", width=line_width)
+
+    # Main checkmark, with round caps and join
+    scene.stroke([p1, p2, p3], fill="gold_main", width=line_width)
 
     # Highlight
-    highlight_offset = int(-2 * check_scale)
-    draw.line([
-        (p1[0] + highlight_offset, p1[1] + highlight_offset),
-        (p2[0] + highlight_offset, p2[1] + highlight_offset)
-    ], fill=gold_light, width=int(line_width * 0.4))
+    highlight = -2
+    scene.stroke([(p1[0] + highlight, p1[1] + highlight), (p2[0] + highlight, p2[1] + highlight)],
+                 fill="gold_light", width=line_width * 0.4)
 
-    # Round caps
-    cap_radius = line_width // 2
-    draw.ellipse([p1[0]-cap_radius, p1[1]-cap_radius, p1[0]+cap_radius, p1[1]+cap_radius], fill=gold_main)
-    draw.ellipse([p2[0]-cap_radius, p2[1]-cap_radius, p2[0]+cap_radius, p2[1]+cap_radius], fill=gold_main)
-    draw.ellipse([p3[0]-cap_radius, p3[1]-cap_radius, p3[0]+cap_radius, p3[1]+cap_radius], fill=gold_main)
+    return scene
 
 
-def create_checkkicks_icon_v2(size=1024):
-    """Create the complete CheckKicks app icon - Version 2."""
-    # Create gradient background
-    img = create_gradient_background(size)
-    draw = ImageDraw.Draw(img)
+@lru_cache(maxsize=None)
+def sneaker_scene():
+    return build_sneaker_scene().compile()
+
+
+@lru_cache(maxsize=None)
+def badge_scene():
+    return build_badge_scene().compile()
+
+
+def draw_sneaker_v2(img, offset_x, offset_y, scale, pixel_scale=1, palette=None):
+    """Draw an enhanced stylized sneaker silhouette - side profile view."""
+    sneaker_scene().rasterize(img, scale, (offset_x, offset_y),
+                              palette or CHECKKICKS_V2["sneaker"], pixel_scale)
+
+
+def draw_checkmark_badge_v2(img, center_x, center_y, radius, pixel_scale=1, palette=None):
+    """Draw an enhanced gold verification checkmark badge."""
+    check_scale = radius / 110
+    badge_scene().rasterize(img, check_scale, (center_x, center_y),
+                            palette or CHECKKICKS_V2["badge"], pixel_scale)
+
 
-    # Scale factor
+def checkkicks_geometry(size, layout):
+    """
+    Canvas placement of the two scenes at size: sneaker offset and scale,
+    badge center and radius, truncated to pixels as the renderer draws them.
+    """
     scale = size / 1024.0
+    return {
+        "sneaker_offset": (int(layout["sneaker_offset"][0] * scale),
+                           int(layout["sneaker_offset"][1] * scale)),
+        "sneaker_scale": layout["sneaker_scale"] * scale,
+        "badge_center": (int(layout["badge_center"][0] * scale),
+                         int(layout["badge_center"][1] * scale)),
+        "badge_radius": int(layout["badge_radius"] * scale),
+    }
+
+
+def checkkicks_layers(size, params=None, pixel_scale=1):
+    """
+    (canvas rect, key) per layer of create_checkkicks_icon_v2, bottom to top.
+    The key holds everything the layer is drawn from (see icon_incremental).
+    """
+    params = params or CHECKKICKS_V2
+    geometry = checkkicks_geometry(size, params["layout"])
+    offset, sneaker_scale = geometry["sneaker_offset"], geometry["sneaker_scale"]
+    center, radius = geometry["badge_center"], geometry["badge_radius"]
+    return [
+        ((0, 0, size, size), ("background", tuple(sorted(params["background"].items())))),
+        (sneaker_scene().bounds(sneaker_scale, offset, pixel_scale),
+         ("sneaker", offset, sneaker_scale, tuple(sorted(params["sneaker"].items())))),
+        (badge_scene().bounds(radius / 110, center, pixel_scale),
+         ("badge", center, radius, tuple(sorted(params["badge"].items())))),
+    ]
+
+
+@traced()
+def create_checkkicks_icon_v2(size=1024, box=None, pixel_scale=1, params=None):
+    """
+    Create the complete CheckKicks app icon - Version 2.
+    box=(left, top, right, bottom) renders just that region of the canvas;
+    pixel_scale multiplies fixed pixel details for supersampled renders.
+    params defaults to CHECKKICKS_V2; icon_params.themed_params() gives the themes.
+    """
+    params = params or CHECKKICKS_V2
+
+    # Create gradient background
+    with stage("background"):
+        img = create_gradient_background(size, box, params["background"])
+    left, top = (box[0], box[1]) if box else (0, 0)
+
+    # Layout scaled to the output size
+    geometry = checkkicks_geometry(size, params["layout"])
 
     # Draw sneaker (positioned in upper portion)
-    sneaker_offset_x = int(60 * scale)
-    sneaker_offset_y = int(230 * scale)
-    sneaker_scale = 0.88 * scale
-    draw_sneaker_v2(draw, sneaker_offset_x, sneaker_offset_y, sneaker_scale)
+    sneaker_offset_x, sneaker_offset_y = geometry["sneaker_offset"]
+    sneaker_scale = geometry["sneaker_scale"]
+    with stage("sneaker"):
+        draw_sneaker_v2(img, sneaker_offset_x - left, sneaker_offset_y - top, sneaker_scale,
+                        pixel_scale, params["sneaker"])
 
     # Draw checkmark badge (positioned in lower-right, overlapping sneaker)
-    badge_center_x = int(710 * scale)
-    badge_center_y = int(660 * scale)
-    badge_radius = int(150 * scale)
-    draw_checkmark_badge_v2(draw, badge_center_x, badge_center_y, badge_radius)
+    badge_center_x, badge_center_y = geometry["badge_center"]
+    badge_radius = geometry["badge_radius"]
+    with stage("badge"):
+        draw_checkmark_badge_v2(img, badge_center_x - left, badge_center_y - top, badge_radius,
+                                pixel_scale, params["badge"])
 
     return img
 
 
+def create_checkkicks_svg():
+    """
+    SVG source for the v2 icon on the 1024 design grid, generated from the
+    same scenes the PIL renderer rasterizes (AppIcon-source.svg layout).
+    """
+    layout = CHECKKICKS_V2["layout"]
+    background = CHECKKICKS_V2["background"]
+    sneaker_scale = layout["sneaker_scale"]
+    check_scale = layout["badge_radius"] / 110
+
+    def hex_color(rgb):
+        return "#{:02X}{:02X}{:02X}".format(*rgb)
+
+    lines = [
+        '<svg viewBox="0 0 1024 1024" xmlns="http://www.w3.org/2000/svg">',
+        '  <!-- CheckKicks App Icon - "The Verified Kick" -->',
+        '  <!-- Generated by generate_icon.py from the renderer scene - do not edit by hand -->',
+        '',
+        '  <defs>',
+        '    <!-- Main background gradient - Deep Navy to Charcoal -->',
+        '    <linearGradient id="bgGradient" x1="0%" y1="0%" x2="100%" y2="100%">',
+        f'      <stop offset="0%" style="stop-color:{hex_color(background["start"])}"/>',
+        f'      <stop offset="100%" style="stop-color:{hex_color(background["end"])}"/>',
+        '    </linearGradient>',
+        '  </defs>',
+        '',
+        '  <!-- Background -->',
+        '  <rect width="1024" height="1024" fill="url(#bgGradient)"/>',
+        '',
+        '  <!-- Stylized Sneaker Silhouette - Side Profile -->',
+        '  <g transform="translate({}, {}) scale({})">'.format(
+            *layout["sneaker_offset"], sneaker_scale),
+    ]
+    lines += sneaker_scene().svg_elements(CHECKKICKS_V2["sneaker"], sneaker_scale)
+    lines += [
+        '  </g>',
+        '',
+        '  <!-- Large Verification Checkmark Badge -->',
+        '  <g transform="translate({}, {}) scale({:.6f})">'.format(
+            *layout["badge_center"], check_scale),
+    ]
+    lines += badge_scene().svg_elements(CHECKKICKS_V2["badge"], check_scale)
+    lines += ['  </g>', '', '</svg>', '']
+    return "\n".join(lines)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate the CheckKicks v2 app icon.")
+    parser.add_argument("--output",
+                        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon-1024.png"))
+    parser.add_argument("--svg", help="Also write the vector source to this path")
+    args = parser.parse_args()
+
     print("Creating CheckKicks App Icon v2...")
 
     # Generate 1024x1024 icon
     icon = create_checkkicks_icon_v2(1024)
 
     # Save to project directory
-    output_path = "/Users/bayuhidayat/Document/Developer_Bayu/Auntentic_check_v2/Auntentic_AI/icon-1024.png"
-    icon.save(output_path, "PNG", optimize=True)
-    print(f"Saved: {output_path}")
+    icon.save(args.output, "PNG", optimize=True)
+    print(f"Saved: {args.output}")
+
+    if args.svg:
+        with open(args.svg, "w") as f:
+            f.write(create_checkkicks_svg())
+        print(f"Saved: {args.svg}")
 
     print("Icon generation complete!")
 
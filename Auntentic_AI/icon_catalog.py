@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+AppIcon asset catalog helpers without imaging imports.
+Reads and writes Contents.json, maps its entries to pixel sizes, computes
+the render cache keys of an export and checks whether every exported PNG
+is still fresh - all before PIL or NumPy are loaded.
+"""
+
+import json
+import os
+
+from icon_params import RENDER_PARAMS
+from render_cache import output_key, render_key
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_APPICONSET = os.path.join(
+    SCRIPT_DIR, "Auntentic_AI", "Assets.xcassets", "AppIcon.appiconset")
+
+
+def load_contents(appiconset_dir):
+    """Read Contents.json from an .appiconset directory."""
+    with open(os.path.join(appiconset_dir, "Contents.json")) as f:
+        return json.load(f)
+
+
+def pixel_size(entry):
+    """Pixel edge length for a Contents.json image entry (e.g. 83.5x83.5 @2x -> 167)."""
+    points = float(entry["size"].split("x")[0])
+    scale = int(entry.get("scale", "1x").rstrip("x"))
+    return int(round(points * scale))
+
+
+def write_contents(appiconset_dir, contents):
+    """Write Contents.json with stable formatting, leaving it untouched if unchanged."""
+    contents.setdefault("info", {"author": "xcode", "version": 1})
+    path = os.path.join(appiconset_dir, "Contents.json")
+    text = json.dumps(contents, indent=2) + "\n"
+    try:
+        with open(path) as f:
+            if f.read() == text:
+                return
+    except FileNotFoundError:
+        pass
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def export_key(contents, renderer="fullbleed", source=None, supersample=1):
+    """Render cache key of an export: from a source image, or from a renderer's master."""
+    master_size = max(pixel_size(entry) for entry in contents["images"])
+    if source:
+        # SVG sources are rasterized by icon_svg, so its code is part of the key
+        kind = "svg" if source.lower().endswith(".svg") else "source"
+        return render_key(kind, source_path=source, master_size=master_size)
+    return render_key(renderer, RENDER_PARAMS.get(renderer), master_size=master_size,
+                      supersample=supersample)
+
+
+def export_is_fresh(appiconset_dir, contents, cache, key):
+    """True when every image in Contents.json was written from key and is untouched."""
+    for entry in contents["images"]:
+        filename = entry.get("filename")
+        if not filename:
+            return False
+        path = os.path.join(appiconset_dir, filename)
+        if not cache.is_fresh(path, output_key(key, size=pixel_size(entry))):
+            return False
+    return True
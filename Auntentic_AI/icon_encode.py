@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+PNG encode stage for the icon exports.
+Each output size gets an encode policy: zlib levels and strategies to try,
+and whether a palette version may be tried for small flat icons. The
+candidates are encoded concurrently and the smallest result finished within
+the policy's time budget is kept. Every file reports its size against
+Pillow's default encoding and the time spent, so build time can be traded
+against bundle size on purpose.
+"""
+
+from PIL import Image
+from concurrent.futures import ThreadPoolExecutor, wait
+import argparse
+import io
+import os
+import time
+import zlib
+
+import numpy as np
+
+STRATEGIES = {
+    "default": zlib.Z_DEFAULT_STRATEGY,
+    "filtered": zlib.Z_FILTERED,
+    "rle": zlib.Z_RLE,
+}
+
+# (largest edge in px, policy), first match wins. palette_tolerance is the
+# largest per-channel error a quantized palette version may have; 0 only
+# allows exact palettes (images with at most 256 colors).
+ENCODE_POLICIES = [
+    (87, {"levels": (9,), "strategies": ("default", "filtered"),
+          "palette": True, "palette_tolerance": 16, "budget": 0.5}),
+    (512, {"levels": (6, 9), "strategies": ("default", "filtered"),
+           "palette": True, "palette_tolerance": 0, "budget": 1.0}),
+    (None, {"levels": (6, 9), "strategies": ("default", "filtered", "rle"),
+            "palette": False, "palette_tolerance": 0, "budget": 2.0}),
+]
+
+# Pillow's own default, the reference every report is measured against
+BASELINE = {"mode": "rgb", "level": 6, "strategy": "default"}
+
+# Candidate encodes run in threads: Pillow releases the GIL while encoding,
+# and threads share the image instead of pickling it to another process
+_workers = os.cpu_count() or 1
+
+
+def set_workers(workers):
+    """Encode threads per file; 1 inside processes that already run one job per core."""
+    global _workers
+    _workers = max(1, workers)
+
+
+def policy_for(size):
+    for max_size, policy in ENCODE_POLICIES:
+        if max_size is None or size <= max_size:
+            return policy
+    return ENCODE_POLICIES[-1][1]
+
+
+def candidates(policy):
+    """Candidate settings for a policy, the baseline first and cheaper levels before dearer."""
+    modes = ("rgb", "palette") if policy["palette"] else ("rgb",)
+    found = [dict(BASELINE)]
+    for level in sorted(policy["levels"]):
+        for mode in modes:
+            for strategy in policy["strategies"]:
+                candidate = {"mode": mode, "level": level, "strategy": strategy}
+                if candidate not in found:
+                    found.append(candidate)
+    return found
+
+
+def label(candidate):
+    return f"{candidate['mode']} z{candidate['level']} {candidate['strategy']}"
+
+
+def to_palette(img, tolerance):
+    """
+    Palette version of an RGB image: exact when it has at most 256 colors,
+    else median-cut quantized. None when that is off by more than tolerance.
+    """
+    pixels = np.asarray(img)
+    colors, index = np.unique(pixels.reshape(-1, pixels.shape[-1]), axis=0,
+                              return_inverse=True)
+    if len(colors) <= 256:
+        palette = Image.fromarray(index.reshape(pixels.shape[:2]).astype(np.uint8), "P")
+        palette.putpalette(colors.astype(np.uint8).tobytes(), rawmode=img.mode)
+        return palette
+    if tolerance <= 0:
+        return None
+    palette = img.quantize(256, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+    error = np.abs(np.asarray(palette.convert(img.mode), dtype=np.int16) - pixels).max()
+    return palette if error <= tolerance else None
+
+
+def encode_candidate(img, candidate):
+    data = io.BytesIO()
+    img.save(data, "PNG", compress_level=candidate["level"],
+             compress_type=STRATEGIES[candidate["strategy"]])
+    return data.getvalue()
+
+
+def encode_png(img, size=None, policy=None):
+    """
+    Encode img as PNG under its size's policy. Returns (bytes, report); the
+    baseline is always waited for, other candidates only until the budget
+    runs out. With a tight budget the chosen bytes depend on timing, the
+    pixels only within the policy's palette tolerance.
+    """
+    start = time.perf_counter()
+    policy = policy or policy_for(size or max(img.size))
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+    todo = candidates(policy)
+
+    palette = None
+    if any(c["mode"] == "palette" for c in todo) and img.mode == "RGB":
+        palette = to_palette(img, policy["palette_tolerance"])
+    todo = [c for c in todo if c["mode"] == "rgb" or palette is not None]
+
+    def run(candidate):
+        return encode_candidate(palette if candidate["mode"] == "palette" else img, candidate)
+
+    if _workers <= 1:
+        results = {}
+        for i, candidate in enumerate(todo):
+            if i and time.perf_counter() - start > policy["budget"]:
+                break
+            results[i] = run(candidate)
+    else:
+        executor = ThreadPoolExecutor(max_workers=min(_workers, len(todo)))
+        futures = [executor.submit(run, candidate) for candidate in todo]
+        futures[0].result()
+        wait(futures, timeout=max(0.0, policy["budget"] - (time.perf_counter() - start)))
+        results = {i: f.result() for i, f in enumerate(futures) if f.done()}
+        # Late candidates are not waited for, the threads finish on their own
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    best = min(results, key=lambda i: len(results[i]))
+    data = results[best]
+    report = {
+        "bytes": len(data),
+        "baseline_bytes": len(results[0]),
+        "saved_bytes": len(results[0]) - len(data),
+        "seconds": time.perf_counter() - start,
+        "candidate": label(todo[best]),
+        "tried": len(todo),
+        "completed": len(results),
+    }
+    return data, report
+
+
+def save_png(img, output_path, size=None, policy=None):
+    """encode_png() to a file. Returns the report with the path."""
+    data, report = encode_png(img, size, policy)
+    with open(output_path, "wb") as f:
+        f.write(data)
+    report["path"] = output_path
+    return report
+
+
+def format_report(report):
+    saved = report["saved_bytes"]
+    percent = saved / report["baseline_bytes"] if report["baseline_bytes"] else 0
+    return (f"{report['bytes']:>9,} bytes  saved {saved:>8,} ({percent:5.1%})  "
+            f"{report['seconds'] * 1000:7.1f} ms  {report['candidate']} "
+            f"({report['completed']}/{report['tried']} candidates)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="PNG files to re-encode")
+    parser.add_argument("--output-dir", help="Write here instead of replacing the inputs")
+    parser.add_argument("--budget", type=float, help="Seconds per file (default: per policy)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Concurrent candidate encodes per file")
+    args = parser.parse_args()
+
+    set_workers(args.workers)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    total_before = total_after = 0
+    start = time.perf_counter()
+    for path in args.inputs:
+        before = os.path.getsize(path)
+        with Image.open(path) as img:
+            img.load()
+        policy = dict(policy_for(max(img.size)))
+        if args.budget is not None:
+            policy["budget"] = args.budget
+        output = os.path.join(args.output_dir, os.path.basename(path)) if args.output_dir else path
+        report = save_png(img, output, policy=policy)
+        total_before += before
+        total_after += report["bytes"]
+        print(f"  {os.path.basename(path)} ({img.width}x{img.height}): {format_report(report)}")
+    print(f"Done! {len(args.inputs)} files, {total_before:,} -> {total_after:,} bytes "
+          f"in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Reduced-resolution glow layers for the icon renderers.
+A glow is a shape blurred by a Gaussian with standard deviation sigma (the
+radius of PIL's GaussianBlur). The shape is rasterized on a grid `factor`
+times coarser than the canvas, chosen so the blur there is about LOW_SIGMA
+px, blurred with a cascade of three box filters per axis and upsampled
+bilinearly. The coarse grid is aligned to the canvas, so a tile gets the
+same values as a full render; past the canvas edges the shape repeats its
+edge pixels, like PIL's blur. Layers are memoized by shape and radius and
+only cover the glow's bounding box.
+"""
+
+from functools import lru_cache
+import math
+
+import numpy as np
+
+from icon_shield import shield_contains
+
+# Blur size on the reduced grid; 3 box passes stay within ~1% of a Gaussian
+LOW_SIGMA = 4.0
+BOX_PASSES = 3
+
+# Per axis subsamples when rasterizing the shape on the reduced grid
+SUBSAMPLES = 4
+
+
+def reduction_factor(sigma):
+    """Canvas pixels per reduced-grid pixel for a blur of sigma px."""
+    return max(1, int(sigma // LOW_SIGMA))
+
+
+def box_sizes(sigma, passes=BOX_PASSES):
+    """
+    Odd box widths whose cascade has the variance of a Gaussian of sigma
+    (Kovesi's construction: wl and wl + 2, mixed to match 12 * sigma^2).
+    """
+    ideal = math.sqrt(12 * sigma * sigma / passes + 1)
+    lower = int(ideal)
+    if lower % 2 == 0:
+        lower -= 1
+    upper = lower + 2
+    m = round((12 * sigma * sigma - passes * lower * lower - 4 * passes * lower - 3 * passes)
+              / (-4 * lower - 4))
+    return [lower if i < m else upper for i in range(passes)]
+
+
+def _box_pass(values, width, axis):
+    """Mean over a sliding window of width along axis; the result is width - 1 shorter."""
+    count = values.shape[axis] - width + 1
+    total = np.zeros_like(np.take(values, range(count), axis=axis))
+    for i in range(width):
+        total += np.take(values, range(i, i + count), axis=axis)
+    return total / width
+
+
+def box_blur(values, sigma):
+    """
+    Separable box-cascade blur without padding: the result is smaller by
+    box_reach(sigma) on every side, so callers blur a window that already
+    holds the neighbours they need.
+    """
+    for width in box_sizes(sigma):
+        values = _box_pass(values, width, 0)
+        values = _box_pass(values, width, 1)
+    return values
+
+
+def box_reach(sigma):
+    """Pixels each side that box_blur() consumes."""
+    return sum(width // 2 for width in box_sizes(sigma))
+
+
+def _upsample_axis(values, first, start, stop, factor, axis):
+    """
+    Bilinear samples along axis for canvas pixels start..stop from a reduced
+    array whose index 0 is reduced pixel first. Reduced pixel j is centered
+    on canvas coordinate (j + 0.5) * factor - 0.5.
+    """
+    u = (np.arange(start, stop, dtype=np.float64) + 0.5) / factor - 0.5
+    j = np.floor(u).astype(np.intp)
+    frac = (u - j).astype(np.float32)
+    shape = [1, 1]
+    shape[axis] = -1
+    frac = frac.reshape(shape)
+    lo = np.take(values, j - first, axis=axis)
+    hi = np.take(values, j + 1 - first, axis=axis)
+    return lo + (hi - lo) * frac
+
+
+def _reduced_range(start, stop, factor):
+    """Reduced pixels [first, last) that bilinear samples of canvas pixels start..stop read."""
+    first = math.floor((start + 0.5) / factor - 0.5)
+    last = math.floor((stop - 1 + 0.5) / factor - 0.5) + 2
+    return first, last
+
+
+def glow_bounds(cx, cy, width, height, offset, sigma):
+    """Canvas (left, top, right, bottom) a shield_glow() can reach, unclipped."""
+    factor = reduction_factor(sigma)
+    spread = (box_reach(sigma / factor) + 2) * factor
+    return (math.floor(cx - width / 2 - offset - spread),
+            math.floor(cy - height / 2 - offset - spread),
+            math.ceil(cx + width / 2 + offset + spread) + 1,
+            math.ceil(cy + height / 2 + offset + spread) + 1)
+
+
+@lru_cache(maxsize=16)
+def shield_glow(cx, cy, width, height, offset, sigma, box, size):
+    """
+    Glow of the shield grown by offset px, blurred by sigma, inside
+    box=(left, top, right, bottom) of a size x size canvas. Returns
+    ((left, top, right, bottom), float32 coverage 0..1) for the part of box
+    the glow reaches, or None. Cached and read-only.
+    """
+    factor = reduction_factor(sigma)
+    low_sigma = sigma / factor
+    reach = box_reach(low_sigma)
+
+    # Everything the blur can spread to, clipped to the requested box
+    left, top, right, bottom = glow_bounds(cx, cy, width, height, offset, sigma)
+    bounds = (max(box[0], left), max(box[1], top), min(box[2], right), min(box[3], bottom))
+    if bounds[0] >= bounds[2] or bounds[1] >= bounds[3]:
+        return None
+
+    x0, x1 = _reduced_range(bounds[0], bounds[2], factor)
+    y0, y1 = _reduced_range(bounds[1], bounds[3], factor)
+    window = (x0 - reach, y0 - reach, x1 + reach, y1 + reach)
+
+    # Coverage of each reduced pixel from SUBSAMPLES^2 point samples. The
+    # samples of reduced pixel j are spread over canvas pixels j * factor to
+    # (j + 1) * factor - 1 and clamped to the canvas, repeating its edges
+    low = 0.0
+    step = factor / SUBSAMPLES
+    for sy in range(SUBSAMPLES):
+        y = np.arange(window[1], window[3]) * factor + (sy + 0.5) * step - 0.5
+        y = np.clip(y, 0, size - 1)[:, None]
+        for sx in range(SUBSAMPLES):
+            x = np.arange(window[0], window[2]) * factor + (sx + 0.5) * step - 0.5
+            x = np.clip(x, 0, size - 1)[None, :]
+            low = low + shield_contains(x, y, cx, cy, width + 2 * offset, height + 2 * offset)
+    low = np.float32(low) / (SUBSAMPLES * SUBSAMPLES)
+
+    low = box_blur(low, low_sigma)
+    coverage = _upsample_axis(low, y0, bounds[1], bounds[3], factor, 0)
+    coverage = _upsample_axis(coverage, x0, bounds[0], bounds[2], factor, 1)
+    coverage = np.ascontiguousarray(coverage, dtype=np.float32)
+    coverage.flags.writeable = False
+    return bounds, coverage
+
+
+def add_glow(pixels, glow, color, strength, origin=(0, 0)):
+    """
+    Add strength * color * coverage to an RGB uint8 array in place, inside
+    the glow's bounds only. color may be negative per channel (a glow darker
+    than the background in that channel). origin is the array's top-left
+    on the canvas.
+    """
+    if glow is None:
+        return
+    (left, top, right, bottom), coverage = glow
+    region = pixels[top - origin[1]:bottom - origin[1], left - origin[0]:right - origin[0]]
+    tint = np.asarray(color, dtype=np.float32) * strength
+    region[:] = np.clip(np.rint(region + tint * coverage[..., None]), 0, 255).astype(np.uint8)
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Golden-image regression tests for the icon renderers and transforms.
+Renders every renderer x theme x size (and every fix_icon_* transform x
+size) and compares it with a stored reference PNG: largest channel
+difference, number of changed pixels, PSNR and SSIM. The metrics run over
+row chunks, so a 4096x4096 comparison needs a few MB of float scratch on
+top of the two images. Failures get a diff heatmap, and cases run across
+a process pool in case order.
+"""
+
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from functools import lru_cache
+import argparse
+import contextlib
+import math
+import os
+import time
+
+import numpy as np
+
+from batch_export import RENDER_VARIANTS, TRANSFORM_VARIANTS, get_transform
+from icon_catalog import DEFAULT_APPICONSET, SCRIPT_DIR, load_contents, pixel_size
+from icon_encode import set_workers
+from icon_params import THEMES
+from icon_themes import render_theme
+
+DEFAULT_GOLDEN_DIR = os.path.join(SCRIPT_DIR, "golden-images")
+
+# Source image of the transform cases, kept with the references so the
+# transforms are tested on the same input even when the renderers change
+SOURCE_NAME = "transform-source.png"
+SOURCE_SIZE = 1024
+
+# A case passes when all of these hold
+DEFAULT_MAX_DIFF = 2
+DEFAULT_MIN_PSNR = 45.0
+DEFAULT_MIN_SSIM = 0.995
+
+# SSIM as in Wang et al. 2004: 11-tap Gaussian window, sigma 1.5, on luma
+SSIM_WINDOW = 11
+SSIM_SIGMA = 1.5
+SSIM_K1 = 0.01
+SSIM_K2 = 0.03
+
+# Rows per metric chunk; scratch memory is ~12 float32 rows of the width each
+CHUNK_ROWS = 256
+
+LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def gaussian_kernel(size=SSIM_WINDOW, sigma=SSIM_SIGMA):
+    x = np.arange(size, dtype=np.float64) - (size - 1) / 2
+    kernel = np.exp(-x * x / (2 * sigma * sigma))
+    return (kernel / kernel.sum()).astype(np.float32)
+
+
+def _filter_axis(values, kernel, axis):
+    """Weighted sliding sum along axis without padding; the result is len(kernel) - 1 shorter."""
+    count = values.shape[axis] - len(kernel) + 1
+    index = [slice(None)] * values.ndim
+    index[axis] = slice(0, count)
+    total = values[tuple(index)] * kernel[0]
+    for i in range(1, len(kernel)):
+        index[axis] = slice(i, i + count)
+        total += values[tuple(index)] * kernel[i]
+    return total
+
+
+def _window_mean(values, kernel):
+    return _filter_axis(_filter_axis(values, kernel, 0), kernel, 1)
+
+
+def luma(pixels):
+    """float32 luma of an (h, w, channels) uint8 array; gray images are their own luma."""
+    if pixels.shape[2] < 3:
+        return pixels[..., 0].astype(np.float32)
+    return pixels[..., :3].astype(np.float32) @ LUMA
+
+
+def ssim_rows(a, b, kernel):
+    """
+    Sum and count of the SSIM map of two float32 luma strips, over the
+    window positions that fit entirely inside the strips.
+    """
+    c1 = (SSIM_K1 * 255) ** 2
+    c2 = (SSIM_K2 * 255) ** 2
+    mu_a = _window_mean(a, kernel)
+    mu_b = _window_mean(b, kernel)
+    var_a = _window_mean(a * a, kernel) - mu_a * mu_a
+    var_b = _window_mean(b * b, kernel) - mu_b * mu_b
+    cov = _window_mean(a * b, kernel) - mu_a * mu_b
+    ssim = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)
+            / ((mu_a * mu_a + mu_b * mu_b + c1) * (var_a + var_b + c2)))
+    return float(ssim.sum(dtype=np.float64)), ssim.size
+
+
+def heatmap_colors():
+    """256-entry black -> red -> yellow -> white ramp, log-scaled so 1 level shows."""
+    t = np.log1p(np.arange(256)) / math.log1p(255)
+    colors = np.stack([np.clip(t * 3, 0, 1), np.clip(t * 3 - 1, 0, 1),
+                       np.clip(t * 3 - 2, 0, 1)], axis=1)
+    colors = np.rint(colors * 255).astype(np.uint8)
+    # Changed by one level still shows as dark red, not black
+    colors[1:] = np.maximum(colors[1:], (96, 0, 0))
+    return colors
+
+
+HEATMAP_COLORS = heatmap_colors()
+
+
+def compare_arrays(reference, actual, chunk_rows=CHUNK_ROWS, heatmap=False):
+    """
+    Metrics of actual against reference, two uint8 arrays of the same shape.
+    With heatmap=True the result carries an RGB uint8 "heatmap": changed
+    pixels colored by their largest channel difference over a dimmed
+    reference.
+    """
+    height, width = reference.shape[:2]
+    channels = reference.shape[2] if reference.ndim == 3 else 1
+    reference = reference.reshape(height, width, channels)
+    actual = actual.reshape(height, width, channels)
+    kernel = gaussian_kernel()
+    margin = len(kernel) - 1
+    ssim_valid = height > margin and width > margin
+
+    max_diff = changed = 0
+    squared = 0
+    ssim_sum, ssim_count = 0.0, 0
+    diff_map = np.empty((height, width, 3), dtype=np.uint8) if heatmap else None
+    for top in range(0, height, chunk_rows):
+        bottom = min(height, top + chunk_rows)
+        diff = np.abs(actual[top:bottom].astype(np.int16) - reference[top:bottom])
+        worst = diff.max(axis=2)
+        max_diff = max(max_diff, int(worst.max()))
+        changed += int(np.count_nonzero(worst))
+        squared += int(np.square(diff, dtype=np.int32).sum(dtype=np.int64))
+
+        # SSIM windows starting in these rows; they read margin rows further
+        last = min(bottom, height - margin)
+        if ssim_valid and top < last:
+            total, count = ssim_rows(luma(reference[top:last + margin]),
+                                     luma(actual[top:last + margin]), kernel)
+            ssim_sum += total
+            ssim_count += count
+
+        if heatmap:
+            base = reference[top:bottom, :, :3].astype(np.uint16)
+            dim = (base.mean(axis=2, dtype=np.float32) * 0.25).astype(np.uint8)
+            diff_map[top:bottom] = np.where(worst[..., None] > 0,
+                                            HEATMAP_COLORS[worst.astype(np.uint8)],
+                                            dim[..., None])
+
+    mse = squared / (height * width * channels)
+    result = {
+        "max_diff": max_diff,
+        "changed_pixels": changed,
+        "changed_fraction": changed / (height * width),
+        "mse": mse,
+        "psnr": math.inf if mse == 0 else 10 * math.log10(255 * 255 / mse),
+        "ssim": ssim_sum / ssim_count if ssim_count else (1.0 if max_diff == 0 else None),
+    }
+    if heatmap:
+        result["heatmap"] = diff_map
+    return result
+
+
+def _as_array(img, mode):
+    return np.asarray(img if img.mode == mode else img.convert(mode))
+
+
+def compare_images(reference, actual, chunk_rows=CHUNK_ROWS, heatmap=False):
+    """compare_arrays() for two PIL images, in RGBA when either has alpha."""
+    if reference.size != actual.size:
+        raise ValueError(f"size {actual.size[0]}x{actual.size[1]}, "
+                         f"expected {reference.size[0]}x{reference.size[1]}")
+    has_alpha = "A" in reference.getbands() or "A" in actual.getbands()
+    mode = "RGBA" if has_alpha else "RGB"
+    return compare_arrays(_as_array(reference, mode), _as_array(actual, mode),
+                          chunk_rows, heatmap)
+
+
+def failed_checks(metrics, max_diff=DEFAULT_MAX_DIFF, min_psnr=DEFAULT_MIN_PSNR,
+                  min_ssim=DEFAULT_MIN_SSIM):
+    """Reasons the metrics fail the tolerances; empty when they pass."""
+    reasons = []
+    if metrics["max_diff"] > max_diff:
+        reasons.append(f"max diff {metrics['max_diff']} > {max_diff}")
+    if metrics["psnr"] < min_psnr:
+        reasons.append(f"PSNR {metrics['psnr']:.2f} dB < {min_psnr}")
+    if metrics["ssim"] is not None and metrics["ssim"] < min_ssim:
+        reasons.append(f"SSIM {metrics['ssim']:.5f} < {min_ssim}")
+    return reasons
+
+
+def case_name(case, theme, size):
+    return f"{case}-{theme}-{size}"
+
+
+def build_cases(renderers, themes, transforms, sizes):
+    """(case, theme, size) for every renderer x theme and transform x size, sizes descending."""
+    cases = []
+    for size in sorted(set(sizes), reverse=True):
+        for renderer in renderers:
+            for theme in themes:
+                cases.append((renderer, theme, size))
+        for transform in transforms:
+            cases.append((transform, "default", size))
+    return cases
+
+
+@lru_cache(maxsize=len(TRANSFORM_VARIANTS))
+def transformed_source(case, source_path):
+    """A transform's output at the source resolution, computed once per worker for every size."""
+    # The transforms report progress with print()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return get_transform(case)(source_path, None)
+
+
+def render_case(case, theme, size, source_path=None):
+    """The image a case produces, as a PIL image."""
+    if case in RENDER_VARIANTS:
+        return render_theme(case, theme, size)
+    img = transformed_source(case, source_path)
+    if img.size != (size, size):
+        return img.convert("RGB").resize((size, size), Image.Resampling.LANCZOS)
+    return img.copy()
+
+
+def run_case(job):
+    """
+    Worker entry point: render one case, then write it as the reference
+    (update) or compare it with the reference. Returns a result record.
+    """
+    case, theme, size, golden_dir, diff_dir, source_path, update, tolerances = job
+    name = case_name(case, theme, size)
+    golden_path = os.path.join(golden_dir, name + ".png")
+    result = {"name": name, "case": case, "theme": theme, "size": size}
+    start = time.perf_counter()
+    try:
+        img = render_case(case, theme, size, source_path)
+    except Exception as exc:
+        result.update(status="error", reasons=[f"{type(exc).__name__}: {exc}"])
+        return result
+    rendered = time.perf_counter()
+    result["render_seconds"] = rendered - start
+
+    if update:
+        # Plain lossless PNG: the small-size encode policies may quantize
+        img.save(golden_path, "PNG")
+        result.update(status="updated", compare_seconds=0.0)
+        return result
+    if not os.path.exists(golden_path):
+        result.update(status="missing", reasons=["no reference (run with --update)"],
+                      compare_seconds=0.0)
+        return result
+
+    with Image.open(golden_path) as reference:
+        reference.load()
+    try:
+        metrics = compare_images(reference, img, heatmap=diff_dir is not None)
+    except ValueError as exc:
+        result.update(status="fail", reasons=[str(exc)],
+                      compare_seconds=time.perf_counter() - rendered)
+        return result
+    heatmap = metrics.pop("heatmap", None)
+    reasons = failed_checks(metrics, **tolerances)
+    if reasons and heatmap is not None:
+        os.makedirs(diff_dir, exist_ok=True)
+        result["heatmap"] = os.path.join(diff_dir, name + "-diff.png")
+        Image.fromarray(heatmap, "RGB").save(result["heatmap"])
+        result["actual"] = os.path.join(diff_dir, name + "-actual.png")
+        img.save(result["actual"], "PNG")
+    result.update(metrics, status="fail" if reasons else "pass", reasons=reasons,
+                  compare_seconds=time.perf_counter() - rendered)
+    return result
+
+
+def iter_results(jobs, workers):
+    """Yield job results in job order with at most 2 * workers jobs in flight."""
+    if workers <= 1:
+        for job in jobs:
+            yield run_case(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_workers,
+                             initargs=(1,)) as executor:
+        pending = deque()
+        for job in jobs:
+            pending.append(executor.submit(run_case, job))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def transform_source(golden_dir, update):
+    """
+    Path of the stored transform source. It is rendered once from the
+    full-bleed renderer and only replaced when it is missing on --update.
+    """
+    path = os.path.join(golden_dir, SOURCE_NAME)
+    if update and not os.path.exists(path):
+        render_theme("fullbleed", "default", SOURCE_SIZE).save(path, "PNG")
+    return path
+
+
+def format_result(result):
+    line = f"  {result['name']:<32} {result['status']:<7}"
+    if "psnr" in result:
+        psnr = "inf" if math.isinf(result["psnr"]) else f"{result['psnr']:.1f}"
+        ssim = "n/a" if result["ssim"] is None else f"{result['ssim']:.5f}"
+        line += (f" max {result['max_diff']:>3}  changed {result['changed_fraction']:7.3%}  "
+                 f"PSNR {psnr:>5} dB  SSIM {ssim}")
+    if "render_seconds" in result:
+        line += (f"  ({result['render_seconds'] * 1000:.0f} + "
+                 f"{result['compare_seconds'] * 1000:.0f} ms)")
+    for reason in result.get("reasons", []):
+        line += f"\n      {reason}"
+    if "heatmap" in result:
+        line += f"\n      heatmap: {result['heatmap']}"
+    return line
+
+
+def main():
+    all_transforms = tuple(TRANSFORM_VARIANTS)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--renderers", default=",".join(RENDER_VARIANTS),
+                        help="Comma-separated: " + ", ".join(RENDER_VARIANTS))
+    parser.add_argument("--themes", default=",".join(THEMES),
+                        help="Comma-separated: " + ", ".join(THEMES))
+    parser.add_argument("--transforms", default=",".join(all_transforms),
+                        help="Comma-separated, empty for none: " + ", ".join(all_transforms))
+    parser.add_argument("--sizes", help="Comma-separated pixel sizes "
+                                        "(default: every size in Contents.json)")
+    parser.add_argument("--appiconset", default=DEFAULT_APPICONSET,
+                        help="Path to AppIcon.appiconset")
+    parser.add_argument("--golden-dir", default=DEFAULT_GOLDEN_DIR,
+                        help="Reference PNG directory")
+    parser.add_argument("--diff-dir", default=os.path.join(os.getcwd(), "golden-diffs"),
+                        help="Where heatmaps and actual renders of failures go")
+    parser.add_argument("--no-heatmaps", action="store_true",
+                        help="Only report metrics for failures")
+    parser.add_argument("--update", action="store_true",
+                        help="Write the current renders as the new references")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Process pool size, 1 runs serially in-process")
+    parser.add_argument("--max-diff", type=int, default=DEFAULT_MAX_DIFF,
+                        help="Largest allowed channel difference")
+    parser.add_argument("--min-psnr", type=float, default=DEFAULT_MIN_PSNR,
+                        help="Smallest allowed PSNR in dB")
+    parser.add_argument("--min-ssim", type=float, default=DEFAULT_MIN_SSIM,
+                        help="Smallest allowed SSIM")
+    args = parser.parse_args()
+
+    def split(value, known, kind):
+        items = [item.strip() for item in value.split(",") if item.strip()]
+        for item in items:
+            if item not in known:
+                parser.error(f"unknown {kind}: {item}")
+        return items
+
+    renderers = split(args.renderers, RENDER_VARIANTS, "renderer")
+    themes = split(args.themes, THEMES, "theme")
+    transforms = split(args.transforms, all_transforms, "transform")
+    if args.sizes:
+        sizes = [int(s) for s in args.sizes.split(",")]
+    else:
+        sizes = [pixel_size(entry) for entry in load_contents(args.appiconset)["images"]]
+
+    os.makedirs(args.golden_dir, exist_ok=True)
+    source_path = transform_source(args.golden_dir, args.update) if transforms else None
+    if transforms and not os.path.exists(source_path):
+        parser.error(f"no transform source at {source_path} (run with --update)")
+    tolerances = {"max_diff": args.max_diff, "min_psnr": args.min_psnr,
+                  "min_ssim": args.min_ssim}
+    diff_dir = None if args.no_heatmaps else args.diff_dir
+    jobs = [(case, theme, size, args.golden_dir, diff_dir, source_path, args.update,
+             tolerances) for case, theme, size in build_cases(renderers, themes, transforms, sizes)]
+
+    print(f"{'Updating' if args.update else 'Checking'} {len(jobs)} golden images "
+          f"with {args.workers} worker(s)...")
+    start = time.perf_counter()
+    counts = {}
+    for result in iter_results(jobs, args.workers):
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+        print(format_result(result))
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"Done! {summary} in {time.perf_counter() - start:.3f}s")
+    if any(status in counts for status in ("fail", "missing", "error")):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
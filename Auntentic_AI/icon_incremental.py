@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Dirty-region incremental re-rendering for the icon renderers.
+Each renderer lists its layers as (canvas rect, key) pairs, the key holding
+every parameter the layer is drawn from. After a parameter change only the
+rects of the layers whose pair changed - at their old and their new
+position - are re-rendered through the renderer's box argument and pasted
+into the cached frame. An edit like moving the badge or one sparkle costs
+time in proportion to the area it touches, and since region renders equal
+the full render the frame stays exact.
+"""
+
+from PIL import Image
+import argparse
+import copy
+import json
+import time
+
+import numpy as np
+
+from export_appiconset import get_renderer
+from icon_params import RENDER_PARAMS
+
+# Above this share of the canvas, one full render is cheaper than the regions
+FULL_RENDER_SHARE = 0.5
+
+
+def get_layers(name):
+    """The (canvas rect, key) layer list function of a renderer."""
+    if name == "checkkicks":
+        from generate_icon import checkkicks_layers
+        return checkkicks_layers
+    if name == "fullbleed":
+        from create_icon import fullbleed_layers
+        return fullbleed_layers
+    raise ValueError(f"No layer bounds for renderer: {name}")
+
+
+def _overlap(a, b):
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def merge_rects(rects):
+    """Union touching or overlapping rects until the remaining ones are disjoint."""
+    rects = list(rects)
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(rects)):
+            for j in range(i + 1, len(rects)):
+                if _overlap(rects[i], rects[j]):
+                    a, b = rects[i], rects.pop(j)
+                    rects[i] = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                    merged = True
+                    break
+            if merged:
+                break
+    return rects
+
+
+def dirty_rects(old_layers, new_layers, size):
+    """
+    Canvas rects to re-render between two layer lists: every layer that is
+    in only one of them, clipped to the canvas and merged.
+    """
+    changed = set(old_layers) ^ set(new_layers)
+    rects = []
+    for rect, _ in changed:
+        if rect is None:
+            continue
+        rect = (max(0, rect[0]), max(0, rect[1]), min(size, rect[2]), min(size, rect[3]))
+        if rect[0] < rect[2] and rect[1] < rect[3]:
+            rects.append(rect)
+    return merge_rects(rects)
+
+
+def rect_area(rects):
+    return sum((r[2] - r[0]) * (r[3] - r[1]) for r in rects)
+
+
+class IncrementalRenderer:
+    """
+    One renderer at one size, keeping its last frame and layer list.
+    render(params) redraws only the dirty rects and returns the frame.
+    """
+
+    def __init__(self, renderer, size=1024, pixel_scale=1):
+        self.renderer = get_renderer(renderer)
+        self.layers_of = get_layers(renderer)
+        self.size = size
+        self.pixel_scale = pixel_scale
+        self.frame = None
+        self.layers = None
+        self.dirty = []
+
+    def render(self, params):
+        size = self.size
+        layers = self.layers_of(size, params, self.pixel_scale)
+        canvas = (0, 0, size, size)
+        if self.frame is None:
+            rects = [canvas]
+        else:
+            rects = dirty_rects(self.layers, layers, size)
+            if rect_area(rects) > FULL_RENDER_SHARE * size * size:
+                rects = [canvas]
+
+        for rect in rects:
+            if rect == canvas:
+                self.frame = np.array(self.renderer(size, None, self.pixel_scale, params=params))
+            else:
+                region = self.renderer(size, rect, self.pixel_scale, params=params)
+                self.frame[rect[1]:rect[3], rect[0]:rect[2]] = np.asarray(region)
+        self.layers = layers
+        self.dirty = rects
+        return Image.fromarray(self.frame)
+
+
+def parse_edit(text):
+    """'layout.badge_center=[730, 660]' -> (['layout', 'badge_center'], (730, 660))."""
+    path, _, value = text.partition("=")
+    if not value:
+        raise ValueError(f"edit needs path=value: {text}")
+
+    def tuples(item):
+        return tuple(tuples(v) for v in item) if isinstance(item, list) else item
+
+    value = tuples(json.loads(value))
+    if path.endswith("sparkles"):
+        value = list(value)
+    return path.split("."), value
+
+
+def apply_edit(params, path, value):
+    """A copy of params with the value at a dotted path replaced."""
+    params = copy.deepcopy(params)
+    target = params
+    for key in path[:-1]:
+        target = target[int(key)] if isinstance(target, list) else target[key]
+    if isinstance(target, list):
+        target[int(path[-1])] = value
+    else:
+        target[path[-1]] = value
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("renderer", choices=["checkkicks", "fullbleed"])
+    parser.add_argument("edits", nargs="+",
+                        help="Parameter edits applied in turn, e.g. layout.badge_center=[730,660]"
+                             " or layout.sparkles.1=[0.2,-0.05,3]")
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--output", help="Write the final frame to this PNG")
+    parser.add_argument("--check", action="store_true",
+                        help="Compare every frame with a full render and time both")
+    args = parser.parse_args()
+
+    incremental = IncrementalRenderer(args.renderer, args.size)
+    params = copy.deepcopy(RENDER_PARAMS[args.renderer])
+    start = time.perf_counter()
+    incremental.render(params)
+    print(f"  {'initial render':40} {1000 * (time.perf_counter() - start):8.1f} ms")
+
+    failed = False
+    for edit in args.edits:
+        params = apply_edit(params, *parse_edit(edit))
+        start = time.perf_counter()
+        frame = incremental.render(params)
+        elapsed = time.perf_counter() - start
+        area = rect_area(incremental.dirty)
+        line = (f"  {edit[:40]:40} {1000 * elapsed:8.1f} ms  {len(incremental.dirty)} rect(s), "
+                f"{area:,} px ({area / (args.size * args.size):.1%})")
+        if args.check:
+            start = time.perf_counter()
+            full = get_renderer(args.renderer)(args.size, params=params)
+            full_ms = 1000 * (time.perf_counter() - start)
+            diff = int(np.abs(np.asarray(full, dtype=np.int16) - incremental.frame).max())
+            failed |= diff != 0
+            line += f"  full {full_ms:.1f} ms, max diff {diff}"
+        print(line)
+
+    if args.output:
+        frame.save(args.output, "PNG")
+        print(f"Saved: {args.output}")
+    if failed:
+        raise SystemExit("Incremental frames differ from the full render")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Corner masks for the CheckKicks icon scripts.
+Builds antialiased circular rounded-rectangle and superellipse (continuous
+corner "squircle") masks as NumPy arrays, cached per size, and applies
+them with a single composite. Run as a script to preview what the iOS
+mask clips from every icon in the asset catalog, at each exported size.
+"""
+
+from PIL import Image, ImageDraw
+from functools import lru_cache
+import argparse
+import math
+import os
+
+import numpy as np
+
+# Circular approximation of the iOS icon mask: corner radius / icon edge
+IOS_CORNER_RATIO = 0.2237
+
+# Superellipse exponent approximating the iOS continuous-corner icon shape
+SQUIRCLE_EXPONENT = 5.0
+
+
+def _normalize_size(size):
+    if isinstance(size, int):
+        return size, size
+    return tuple(size)
+
+
+def _centered_grid(width, height, inset):
+    """|offset from the canvas center| of every pixel center, and the half extents."""
+    x = np.abs(np.arange(width, dtype=np.float64) + 0.5 - width / 2)[None, :]
+    y = np.abs(np.arange(height, dtype=np.float64) + 0.5 - height / 2)[:, None]
+    return x, y, width / 2 - inset, height / 2 - inset
+
+
+def _readonly(mask):
+    # Cached masks are shared between callers
+    mask.flags.writeable = False
+    return mask
+
+
+@lru_cache(maxsize=64)
+def _rounded_rect(width, height, radius, inset):
+    x, y, half_w, half_h = _centered_grid(width, height, inset)
+    radius = min(radius, half_w, half_h)
+    qx = x - (half_w - radius)
+    qy = y - (half_h - radius)
+    # Signed distance to the rounded rectangle, in pixels
+    outside = np.hypot(np.maximum(qx, 0.0), np.maximum(qy, 0.0))
+    dist = outside + np.minimum(np.maximum(qx, qy), 0.0) - radius
+    return _readonly(np.clip(0.5 - dist, 0.0, 1.0).astype(np.float32))
+
+
+@lru_cache(maxsize=64)
+def _superellipse(width, height, exponent, inset):
+    x, y, half_w, half_h = _centered_grid(width, height, inset)
+    u = x / half_w
+    v = y / half_h
+    g = (u ** exponent + v ** exponent) ** (1.0 / exponent)
+    # First-order distance to the g = 1 level set: (g - 1) / |grad g|
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gx = u ** (exponent - 1) / half_w
+        gy = v ** (exponent - 1) / half_h
+        grad = np.hypot(gx, gy) / g ** (exponent - 1)
+        dist = np.where(g > 0.5, (g - 1.0) / grad, -half_w)
+    return _readonly(np.clip(0.5 - dist, 0.0, 1.0).astype(np.float32))
+
+
+def rounded_rect_mask(size, radius=None, inset=0):
+    """
+    Coverage (float32, 0..1) of a rectangle with circular corners, inset by
+    inset px from every edge. radius defaults to the iOS approximation.
+    """
+    width, height = _normalize_size(size)
+    if radius is None:
+        radius = IOS_CORNER_RATIO * min(width, height)
+    return _rounded_rect(width, height, float(radius), float(inset))
+
+
+def squircle_mask(size, exponent=SQUIRCLE_EXPONENT, inset=0):
+    """Coverage (float32, 0..1) of the superellipse |x|^n + |y|^n <= 1 filling the canvas."""
+    width, height = _normalize_size(size)
+    return _superellipse(width, height, float(exponent), float(inset))
+
+
+def ios_mask(size, shape="squircle"):
+    """The iOS icon mask at size, as a squircle or its circular approximation."""
+    if shape == "circle":
+        return rounded_rect_mask(size)
+    return squircle_mask(size)
+
+
+def mask_image(mask):
+    """Coverage array -> PIL 'L' image."""
+    return Image.fromarray(np.rint(mask * 255).astype(np.uint8), "L")
+
+
+def apply_mask(img, mask, background=None):
+    """
+    Keep img where the mask covers it, in one composite. With a background
+    color the rest is painted over; without one it becomes transparent.
+    """
+    alpha = mask_image(mask)
+    if background is not None:
+        return Image.composite(img, Image.new(img.mode, img.size, background), alpha)
+    result = img.convert("RGBA")
+    if img.mode == "RGBA":
+        alpha = Image.fromarray(
+            (np.asarray(img.getchannel("A"), dtype=np.uint16) * np.asarray(alpha) // 255)
+            .astype(np.uint8), "L")
+    result.putalpha(alpha)
+    return result
+
+
+def preview_tile(img, shape="squircle", min_cell=128):
+    """
+    Side by side at the icon's own pixel size: the masked icon on a light
+    background, and the icon with everything the mask clips tinted red.
+    Small sizes are magnified with nearest-neighbour so every pixel shows.
+    """
+    img = img.convert("RGB")
+    mask = ios_mask(img.size, shape)
+    shown = apply_mask(img, mask, (242, 242, 247))
+    clipped = Image.composite(img, Image.blend(img, Image.new("RGB", img.size, (255, 0, 0)), 0.6),
+                              mask_image(mask))
+
+    zoom = max(1, math.ceil(min_cell / img.width))
+    cell = (img.width * zoom, img.height * zoom)
+    tile = Image.new("RGB", (cell[0] * 2 + 8, cell[1]), (255, 255, 255))
+    tile.paste(shown.resize(cell, Image.Resampling.NEAREST), (0, 0))
+    tile.paste(clipped.resize(cell, Image.Resampling.NEAREST), (cell[0] + 8, 0))
+    return tile
+
+
+def preview_appiconset(appiconset_dir, shape="squircle", min_cell=128, source=None):
+    """
+    Contact sheet of every distinct exported size in the asset catalog. Uses
+    the PNGs in the catalog, or sizes derived from source like the exporter.
+    """
+    from export_appiconset import build_pyramid, derive, load_contents, pixel_size
+
+    contents = load_contents(appiconset_dir)
+    sizes = sorted({pixel_size(entry) for entry in contents["images"]}, reverse=True)
+    files = {pixel_size(entry): entry["filename"]
+             for entry in contents["images"] if entry.get("filename")}
+
+    levels = None
+    if source:
+        from icon_svg import open_image
+        levels = build_pyramid(open_image(source).convert("RGB"), min(sizes))
+
+    tiles = []
+    for size in sizes:
+        if levels is not None:
+            img = derive(levels, size)
+        else:
+            path = os.path.join(appiconset_dir, files.get(size, ""))
+            if not os.path.isfile(path):
+                continue
+            img = Image.open(path)
+        tiles.append((size, preview_tile(img, shape, min_cell)))
+    if not tiles:
+        raise FileNotFoundError(f"No exported icons in {appiconset_dir}, "
+                                "run export_appiconset.py or pass a source image")
+
+    label_height = 16
+    sheet = Image.new("RGB", (max(t.width for _, t in tiles) + 16,
+                              sum(t.height + label_height + 16 for _, t in tiles) + 8),
+                      (255, 255, 255))
+    draw = ImageDraw.Draw(sheet)
+    y = 8
+    for size, tile in tiles:
+        zoom = tile.height // size
+        label = f"{size}x{size}" + (f" (shown {zoom}x)" if zoom > 1 else "")
+        draw.text((8, y), label, fill=(0, 0, 0))
+        sheet.paste(tile, (8, y + label_height))
+        y += tile.height + label_height + 16
+    return sheet
+
+
+def main():
+    from export_appiconset import DEFAULT_APPICONSET
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help="Preview sheet PNG")
+    parser.add_argument("--appiconset", default=DEFAULT_APPICONSET,
+                        help="Path to AppIcon.appiconset")
+    parser.add_argument("--source", help="Preview a master image instead of the exported PNGs")
+    parser.add_argument("--shape", choices=["squircle", "circle"], default="squircle")
+    parser.add_argument("--min-cell", type=int, default=128,
+                        help="Magnify smaller sizes to at least this many pixels")
+    args = parser.parse_args()
+
+    sheet = preview_appiconset(args.appiconset, args.shape, args.min_cell, args.source)
+    sheet.save(args.output, "PNG")
+    print(f"Saved preview: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Drawing parameters for the CheckKicks icon renderers.
+Colors and layout for create_checkkicks_icon_v2 (generate_icon.py) and
+create_fullbleed_icon (create_icon.py), plus the theme table of color
+overrides for the dark, tinted and seasonal variants. Kept free of imaging
+imports so render_cache can hash them without loading PIL.
+"""
+
+import copy
+
+# === generate_icon.py - create_checkkicks_icon_v2 ===
+# Layout is on the 1024px design grid and scaled to the output size
+CHECKKICKS_V2 = {
+    "background": {
+        "start": (15, 23, 42),       # #0F172A - Deep Navy
+        "end": (30, 41, 59),         # #1E293B - Charcoal
+    },
+    "sneaker": {
+        "shoe_white": (248, 250, 252),  # #F8FAFC - Main shoe
+        "shoe_light": (241, 245, 249),  # #F1F5F9 - Highlights
+        "shoe_gray": (226, 232, 240),   # #E2E8F0 - Shadows
+        "sole_gray": (203, 213, 225),   # #CBD5E1 - Sole
+        "sole_dark": (148, 163, 184),   # #94A3B8 - Sole details
+        "dark_navy": (15, 23, 42),      # #0F172A - Lace holes
+        "lace_hole_inner": (30, 41, 59),  # #1E293B - Lace hole highlight
+    },
+    "badge": {
+        "dark_navy": (15, 23, 42),      # #0F172A
+        "gold_light": (229, 197, 71),   # #E5C547
+        "gold_main": (212, 175, 55),    # #D4AF37
+        "gold_dark": (184, 150, 46),    # #B8962E
+    },
+    "layout": {
+        "sneaker_offset": (60, 230),
+        "sneaker_scale": 0.88,
+        "badge_center": (710, 660),
+        "badge_radius": 150,
+    },
+}
+
+# === create_icon.py - create_fullbleed_icon ===
+# Layout values are fractions of the output size
+FULLBLEED = {
+    "colors": {
+        "bg_dark": (10, 14, 26),        # #0a0e1a - Dark navy
+        "bg_light": (18, 24, 41),       # Gradient target (30% strength)
+        "gold_bright": (255, 215, 0),   # #ffd700
+        "gold_dark": (184, 134, 11),    # #b8860b
+        "gold_mid": (218, 165, 32),     # #daa520
+        "shield_inner": (13, 17, 23),   # Dark interior
+        "sparkle_core": (255, 255, 102),  # Sparkle center, fading out to
+        "sparkle_edge": (255, 255, 255),  # white at the rim
+    },
+    "layout": {
+        "center_y": 0.47,           # Slightly above center
+        "shield_width": 0.62,       # Larger shield
+        "shield_height": 0.72,
+        "border_width": 0.04,       # Gold border thickness
+        "stroke_width": 0.055,      # Thicker checkmark
+        # Checkmark points relative to the shield center
+        "check_start": (-0.12, 0.02),
+        "check_mid": (-0.02, 0.12),
+        "check_end": (0.17, -0.10),
+        # (dx, dy, radius in px) relative to the shield center
+        "sparkles": [
+            (-0.22, -0.20, 4),
+            (0.20, -0.08, 3),
+            (0.14, 0.16, 2),
+        ],
+        "reflection_y": 0.88,
+        "reflection_width": 0.2,
+    },
+}
+
+RENDER_PARAMS = {
+    "checkkicks": CHECKKICKS_V2,
+    "fullbleed": FULLBLEED,
+}
+
+# === Themes ===
+# Per renderer, overrides merged into its parameters above (section -> key
+# -> value). "monochrome" themes turn every remaining color into its luma
+# gray, like the iOS 18 tinted appearance the system colors itself.
+THEMES = {
+    "default": {},
+    # iOS 18 dark appearance: near-black background, artwork unchanged
+    "dark": {
+        "fullbleed": {
+            "colors": {
+                "bg_dark": (0, 0, 0),
+                "bg_light": (8, 10, 16),
+                "shield_inner": (4, 5, 8),
+            },
+        },
+        "checkkicks": {
+            "background": {"start": (0, 0, 0), "end": (12, 16, 24)},
+            "badge": {"dark_navy": (4, 6, 12)},
+        },
+    },
+    # iOS 18 tinted appearance: grayscale artwork on black
+    "tinted": {
+        "monochrome": True,
+        "fullbleed": {
+            "colors": {"bg_dark": (0, 0, 0), "bg_light": (0, 0, 0), "shield_inner": (0, 0, 0)},
+        },
+        "checkkicks": {
+            "background": {"start": (0, 0, 0), "end": (0, 0, 0)},
+            "badge": {"dark_navy": (0, 0, 0)},
+        },
+    },
+    # Seasonal alternate icons
+    "winter": {
+        "fullbleed": {
+            "colors": {
+                "bg_dark": (8, 20, 38),         # #081426 - Midnight blue
+                "bg_light": (20, 40, 64),
+                "gold_bright": (224, 242, 254),  # #E0F2FE - Ice
+                "gold_dark": (14, 116, 144),     # #0E7490
+                "gold_mid": (125, 211, 252),     # #7DD3FC
+                "shield_inner": (6, 14, 28),
+            },
+        },
+        "checkkicks": {
+            "background": {"start": (8, 20, 38), "end": (20, 40, 64)},
+            "badge": {
+                "dark_navy": (8, 20, 38),
+                "gold_light": (224, 242, 254),
+                "gold_main": (125, 211, 252),
+                "gold_dark": (14, 116, 144),
+            },
+        },
+    },
+    "holiday": {
+        "fullbleed": {
+            "colors": {
+                "bg_dark": (60, 8, 18),         # #3C0812 - Cranberry
+                "bg_light": (96, 16, 32),
+                "shield_inner": (22, 48, 32),   # #163020 - Pine
+            },
+        },
+        "checkkicks": {
+            "background": {"start": (60, 8, 18), "end": (22, 48, 32)},
+            "badge": {"dark_navy": (22, 48, 32)},
+        },
+    },
+}
+
+
+def _luma_gray(color):
+    gray = int(round(0.299 * color[0] + 0.587 * color[1] + 0.114 * color[2]))
+    return (gray, gray, gray) + tuple(color[3:])
+
+
+def _monochrome(value):
+    """Every RGB(A) tuple inside value replaced by its luma gray."""
+    if isinstance(value, dict):
+        return {key: _monochrome(item) for key, item in value.items()}
+    if (isinstance(value, tuple) and len(value) in (3, 4)
+            and all(isinstance(c, int) for c in value)):
+        return _luma_gray(value)
+    return value
+
+
+def themed_params(renderer, theme="default"):
+    """
+    A renderer's parameters with a theme's overrides applied (a new dict).
+    Renderers without parameters (the SVG sources) only have the default theme.
+    """
+    spec = THEMES[theme]
+    if renderer not in RENDER_PARAMS:
+        if theme != "default":
+            raise ValueError(f"{renderer} has no parameters to theme")
+        return None
+    params = copy.deepcopy(RENDER_PARAMS[renderer])
+    if spec.get("monochrome"):
+        # Only colors are converted: layout lives in its own section
+        params = {section: values if section == "layout" else _monochrome(values)
+                  for section, values in params.items()}
+    for section, overrides in spec.get(renderer, {}).items():
+        params[section].update(overrides)
+    return params
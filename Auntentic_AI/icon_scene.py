@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Declarative scene description for the CheckKicks icon artwork.
+Shapes are recorded once in design units, compiled into flat coordinate
+arrays and transformed to any output size with a single matrix multiply.
+The same scene can be written out as SVG elements, so the vector source
+and the PIL renderer are generated from one description.
+"""
+
+import math
+
+import numpy as np
+from PIL import ImageDraw
+
+from icon_stroke import draw_stroke
+
+
+class Px:
+    """A length in output pixels that does not scale with the scene (e.g. a 2px outline)."""
+
+    def __init__(self, value):
+        self.value = value
+
+
+def _split_length(length):
+    """
+    Length -> (scaled design units, fixed pixels). A length is a number in
+    design units, a Px, or a (number, Px) pair for "radius + 4px" style sizes.
+    """
+    if isinstance(length, Px):
+        return 0.0, length.value
+    if isinstance(length, tuple):
+        value, extra = length
+        return float(value), extra.value
+    return float(length), 0
+
+
+def resolve_color(spec, palette):
+    """
+    Color spec -> RGB(A) tuple. A spec is a literal tuple, a palette key, or
+    (palette key, alpha) for a translucent palette color.
+    """
+    if isinstance(spec, str):
+        return palette[spec]
+    if len(spec) == 2 and isinstance(spec[0], str):
+        return tuple(palette[spec[0]][:3]) + (spec[1],)
+    return spec
+
+
+def svg_color(spec, palette):
+    """Color spec -> (hex color, opacity or None) for SVG attributes."""
+    color = resolve_color(spec, palette)
+    hex_color = "#{:02X}{:02X}{:02X}".format(*color[:3])
+    opacity = round(color[3] / 255, 3) if len(color) == 4 else None
+    return hex_color, opacity
+
+
+class Scene:
+    """
+    Ordered list of shapes in design units. Points may carry a pixel nudge
+    (dx, dy) that is added after scaling, as the hand-written drawing code
+    did for 1px highlights and inset arcs.
+    """
+
+    def __init__(self):
+        self.shapes = []
+
+    def polygon(self, points, fill):
+        self.shapes.append(("polygon", [(p, (0, 0)) for p in points], [], {"fill": fill}))
+
+    def line(self, points, fill, width):
+        self.shapes.append(("line", [(p, (0, 0)) for p in points], [width], {"fill": fill}))
+
+    def stroke(self, points, fill, width):
+        """Antialiased polyline with round caps and joins (see icon_stroke)."""
+        self.shapes.append(("stroke", [(p, (0, 0)) for p in points], [width], {"fill": fill}))
+
+    def ellipse(self, center, radius, fill=None, outline=None, width=None, nudge=(0, 0)):
+        lengths = [radius] + ([width] if width is not None else [])
+        style = {"fill": fill, "outline": outline}
+        self.shapes.append(("ellipse", [(center, nudge)], lengths, style))
+
+    def arc(self, box, start, end, fill, width, inset=0):
+        """Arc of the ellipse inscribed in box, inset by a fixed number of pixels."""
+        corners = [((box[0], box[1]), (inset, inset)), ((box[2], box[3]), (-inset, -inset))]
+        style = {"fill": fill, "start": start, "end": end}
+        self.shapes.append(("arc", corners, [width], style))
+
+    def compile(self):
+        return CompiledScene(self)
+
+
+class CompiledScene:
+    """
+    Flat arrays for every vertex and length in a Scene. Transforming to an
+    output size is one (N, 2) @ (2, 2) multiply plus one length multiply.
+    """
+
+    def __init__(self, scene):
+        points, point_nudges, lengths, length_nudges = [], [], [], []
+        self.ops = []
+        for kind, vertices, shape_lengths, style in scene.shapes:
+            p0, l0 = len(points), len(lengths)
+            for point, nudge in vertices:
+                points.append(point)
+                point_nudges.append(nudge)
+            for length in shape_lengths:
+                value, nudge = _split_length(length)
+                lengths.append(value)
+                length_nudges.append(nudge)
+            self.ops.append((kind, p0, len(points), l0, len(lengths), style))
+
+        self.points = np.array(points, dtype=np.float64).reshape(-1, 2)
+        self.point_nudges = np.array(point_nudges, dtype=np.int64).reshape(-1, 2)
+        self.lengths = np.array(lengths, dtype=np.float64)
+        self.length_nudges = np.array(length_nudges, dtype=np.int64)
+
+    def transform(self, scale, offset=(0, 0), pixel_scale=1):
+        """
+        Integer output coordinates and lengths for a uniform scale and pixel
+        offset. Scaled values are truncated before the offset is added,
+        matching offset + int(x * scale) in the original drawing code.
+        pixel_scale multiplies the fixed pixel nudges (supersampled renders).
+        """
+        matrix = np.array([[scale, 0.0], [0.0, scale]])
+        points = np.trunc(self.points @ matrix.T).astype(np.int64)
+        points += np.asarray(offset, dtype=np.int64) + self.point_nudges * pixel_scale
+        lengths = np.trunc(self.lengths * scale).astype(np.int64)
+        lengths += self.length_nudges * pixel_scale
+        return points, lengths
+
+    def bounds(self, scale, offset=(0, 0), pixel_scale=1):
+        """
+        Output (left, top, right, bottom) the scene can draw into: every
+        vertex grown by the longest length (a radius or line width) plus
+        a pixel of antialiasing.
+        """
+        points, lengths = self.transform(scale, offset, pixel_scale)
+        reach = int(lengths.max()) + 2 if len(lengths) else 2
+        return (int(points[:, 0].min()) - reach, int(points[:, 1].min()) - reach,
+                int(points[:, 0].max()) + reach + 1, int(points[:, 1].max()) + reach + 1)
+
+    def rasterize(self, img, scale, offset, palette, pixel_scale=1):
+        """Draw every shape onto a PIL image at the given scale and offset."""
+        draw = ImageDraw.Draw(img)
+        points, lengths = self.transform(scale, offset, pixel_scale)
+        points = points.tolist()
+        lengths = lengths.tolist()
+
+        for kind, p0, p1, l0, l1, style in self.ops:
+            xy = [coord for point in points[p0:p1] for coord in point]
+            if kind == "polygon":
+                draw.polygon(xy, fill=resolve_color(style["fill"], palette))
+            elif kind == "line":
+                draw.line(xy, fill=resolve_color(style["fill"], palette), width=lengths[l0])
+            elif kind == "stroke":
+                draw_stroke(img, points[p0:p1], lengths[l0], resolve_color(style["fill"], palette))
+            elif kind == "ellipse":
+                cx, cy = xy
+                r = lengths[l0]
+                kwargs = {}
+                if style["fill"] is not None:
+                    kwargs["fill"] = resolve_color(style["fill"], palette)
+                if style["outline"] is not None:
+                    kwargs["outline"] = resolve_color(style["outline"], palette)
+                    kwargs["width"] = lengths[l0 + 1]
+                draw.ellipse([cx - r, cy - r, cx + r, cy + r], **kwargs)
+            elif kind == "arc":
+                draw.arc(xy, start=style["start"], end=style["end"],
+                         fill=resolve_color(style["fill"], palette), width=lengths[l0])
+
+    def svg_elements(self, palette, px_per_unit=1.0, indent="    "):
+        """
+        SVG markup for the scene in design units. Pixel nudges are converted
+        with px_per_unit, the scale the scene is drawn at on the 1024 canvas.
+        """
+        points = self.points + self.point_nudges / px_per_unit
+        lengths = self.lengths + self.length_nudges / px_per_unit
+
+        def num(value):
+            return f"{value:.2f}".rstrip("0").rstrip(".")
+
+        def paint(attr, spec):
+            color, opacity = svg_color(spec, palette)
+            text = f'{attr}="{color}"'
+            if opacity is not None:
+                text += f' {attr}-opacity="{num(opacity)}"'
+            return text
+
+        elements = []
+        for kind, p0, p1, l0, l1, style in self.ops:
+            coords = " ".join(f"{num(x)},{num(y)}" for x, y in points[p0:p1])
+            if kind == "polygon":
+                elements.append(f'<polygon points="{coords}" {paint("fill", style["fill"])}/>')
+            elif kind == "line":
+                elements.append(
+                    f'<polyline points="{coords}" fill="none" {paint("stroke", style["fill"])} '
+                    f'stroke-width="{num(lengths[l0])}"/>')
+            elif kind == "stroke":
+                elements.append(
+                    f'<polyline points="{coords}" fill="none" {paint("stroke", style["fill"])} '
+                    f'stroke-width="{num(lengths[l0])}" stroke-linecap="round" '
+                    f'stroke-linejoin="round"/>')
+            elif kind == "ellipse":
+                cx, cy = points[p0]
+                attrs = [f'cx="{num(cx)}" cy="{num(cy)}" r="{num(lengths[l0])}"']
+                attrs.append(paint("fill", style["fill"]) if style["fill"] is not None
+                             else 'fill="none"')
+                if style["outline"] is not None:
+                    attrs.append(paint("stroke", style["outline"]))
+                    attrs.append(f'stroke-width="{num(lengths[l0 + 1])}"')
+                elements.append(f'<circle {" ".join(attrs)}/>')
+            elif kind == "arc":
+                (x0, y0), (x1, y1) = points[p0:p1]
+                cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+                rx, ry = (x1 - x0) / 2, (y1 - y0) / 2
+                start, end = math.radians(style["start"]), math.radians(style["end"])
+                sx, sy = cx + rx * math.cos(start), cy + ry * math.sin(start)
+                ex, ey = cx + rx * math.cos(end), cy + ry * math.sin(end)
+                large = 1 if (style["end"] - style["start"]) % 360 > 180 else 0
+                elements.append(
+                    f'<path d="M {num(sx)} {num(sy)} A {num(rx)} {num(ry)} 0 {large} 1 '
+                    f'{num(ex)} {num(ey)}" fill="none" {paint("stroke", style["fill"])} '
+                    f'stroke-width="{num(lengths[l0])}"/>')
+        return [indent + element for element in elements]
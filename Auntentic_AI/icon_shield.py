@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Distance-field renderer for the create_icon.py shield.
+The shield outline is evaluated once per pixel as a signed offset field:
+d is how far the outline has to move outwards (width and height both grow
+by 2 * d) before the pixel is inside. The gold border rings and the inner
+fill are then threshold and lookup operations on that one field, and the
+glow is a single mask, instead of ~70 polygon fills of a rebuilt
+300-point outline. The field holds no colors, so it is cached and shared
+by every theme rendered at the same size.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# Bisection steps per pixel; 12 halvings of a 4096px icon's ~210px bracket is < 0.06px
+FIELD_ITERATIONS = 12
+
+
+def shield_contains(x, y, cx, cy, width, height):
+    """Vectorized point-in-shield test matching create_icon's outline."""
+    top = cy - height * 0.5
+    ty = (y - top) / height
+    # Sides curve inwards to the bottom point: half width * (1 - t^1.5)
+    half_width = width * 0.5 * (1.0 - np.clip(ty, 0.0, 1.0) ** 1.5)
+    inside = (ty >= 0.0) & (ty <= 1.0) & (np.abs(x - cx) <= half_width)
+    # Gentle curve along the top edge: top + sin(t * pi) * 2% of height
+    tx = np.clip((x - (cx - width * 0.5)) / width, 0.0, 1.0)
+    inside &= y >= top + np.sin(tx * np.pi) * (height * 0.02)
+    return inside
+
+
+def _bounds(cx, cy, width, height, box, offset):
+    """Rows and columns of box that can be inside the shield grown by offset."""
+    shape = (box[3] - box[1], box[2] - box[0])
+    c0 = int(np.clip(np.floor(cx - width / 2 - offset) - box[0], 0, shape[1]))
+    c1 = int(np.clip(np.ceil(cx + width / 2 + offset) + 1 - box[0], 0, shape[1]))
+    r0 = int(np.clip(np.floor(cy - height / 2 - offset) - box[1], 0, shape[0]))
+    r1 = int(np.clip(np.ceil(cy + height / 2 + offset) + 1 - box[1], 0, shape[0]))
+    return shape, slice(r0, max(r0, r1)), slice(c0, max(c0, c1))
+
+
+def shield_mask(cx, cy, width, height, box, offset=0):
+    """Pixels of box=(left, top, right, bottom) inside the shield grown by offset."""
+    shape, rows, cols = _bounds(cx, cy, width, height, box, offset)
+    mask = np.zeros(shape, dtype=bool)
+    x = np.arange(box[0] + cols.start, box[0] + cols.stop, dtype=np.float32)[None, :]
+    y = np.arange(box[1] + rows.start, box[1] + rows.stop, dtype=np.float32)[:, None]
+    mask[rows, cols] = shield_contains(x, y, cx, cy, width + 2 * offset, height + 2 * offset)
+    return mask
+
+
+@lru_cache(maxsize=8)
+def shield_field(cx, cy, width, height, box, lo, hi, iterations=FIELD_ITERATIONS):
+    """
+    Signed outline offset in pixels for every pixel of box=(left, top, right,
+    bottom): negative inside the shield, positive outside. Values are only
+    resolved within [lo, hi] and clamp to the bracket outside of it, so only
+    the band between the two outlines is bisected. Cached and read-only.
+    """
+    field = np.full((box[3] - box[1], box[2] - box[0]), hi, dtype=np.float32)
+    field[shield_mask(cx, cy, width, height, box, lo)] = lo
+    band = shield_mask(cx, cy, width, height, box, hi) & (field > lo)
+    ys, xs = np.nonzero(band)
+    x = (xs + box[0]).astype(np.float32)
+    y = (ys + box[1]).astype(np.float32)
+    low = np.full(x.shape, lo, dtype=np.float32)
+    high = np.full(x.shape, hi, dtype=np.float32)
+
+    for _ in range(iterations):
+        mid = (low + high) * 0.5
+        inside = shield_contains(x, y, cx, cy, width + 2 * mid, height + 2 * mid)
+        high = np.where(inside, mid, high)
+        low = np.where(inside, low, mid)
+
+    field[ys, xs] = (low + high) * 0.5
+    field.flags.writeable = False
+    return field
+
+
+def coverage(field, threshold):
+    """Antialiased coverage of the region field <= threshold (1px ramp)."""
+    return np.clip(threshold + 0.5 - field, 0.0, 1.0)
+
+
+def border_colors(border_width, bright, dark):
+    """
+    Colors of the gold border rings, outermost (ring border_width) first,
+    with the same int() blend the per-ring polygon fills used.
+    """
+    table = np.zeros((border_width + 1, 3), dtype=np.float32)
+    for i in range(1, border_width + 1):
+        t = i / border_width
+        table[i] = [int(bright[c] * t + dark[c] * (1 - t)) for c in range(3)]
+    return table
+
+
+def composite(base, color, alpha):
+    """Blend a solid color (or per-pixel colors) over base with per-pixel alpha."""
+    alpha = alpha[..., None]
+    return base * (1.0 - alpha) + np.asarray(color, dtype=np.float32) * alpha
+
+
+def paint_shield(pixels, field, ring_colors, inner_color, inner_offset):
+    """
+    Paint the gold border and inner fill into an RGB uint8 array in place.
+    ring_colors comes from border_colors(); ring i covers the pixels
+    (border_width - i) to (border_width - i + 1) px inside the outline, and
+    the inner fill everything inner_offset px inside. Only the antialiased
+    band between the outline and the inner fill is blended, the rest of the
+    inner fill is a plain assignment.
+    """
+    border_width = len(ring_colors) - 1
+    pixels[field <= -inner_offset] = inner_color
+    ys, xs = np.nonzero((field > -inner_offset) & (field < 1.0))
+    # Polygon fills include the pixels their outline touches: grow by half a pixel
+    d = field[ys, xs] - 0.5
+    ring = np.clip(np.ceil(border_width + d), 1, border_width).astype(np.intp)
+    blended = composite(pixels[ys, xs].astype(np.float32), ring_colors[ring], coverage(d, 0))
+    blended = composite(blended, inner_color, coverage(d, -inner_offset))
+    pixels[ys, xs] = np.rint(blended).astype(np.uint8)
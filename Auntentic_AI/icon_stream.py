@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Strip-streamed rendering and PNG writing for very large icon assets.
+A 4096-8192 px feature graphic is rendered as full-width horizontal strips
+through the renderers' box argument, and each strip is filtered and
+deflated into the PNG as soon as it exists. The blur halo a strip needs
+comes from the glow layer's own reduced window, so strips equal the full
+render. Peak memory follows the strip height instead of the image area.
+"""
+
+from PIL import Image
+import argparse
+import struct
+import time
+import zlib
+
+import numpy as np
+
+import icon_glow
+import icon_gradients
+import icon_shield
+import icon_stroke
+from icon_encode import STRATEGIES
+from icon_supersample import render_tile
+from icon_svg import SVG_RENDERERS
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# IHDR color type and bytes per pixel by PIL mode
+PNG_MODES = {"L": (0, 1), "RGB": (2, 3), "RGBA": (6, 4)}
+
+# Pixels per strip at render resolution (after supersampling). The renderers
+# need ~70 bytes of scratch per pixel, so 1M pixels peak at ~100 MB
+STRIP_PIXELS = 1024 * 1024
+
+# Deflate output is collected up to this many bytes per IDAT chunk
+IDAT_BYTES = 256 * 1024
+
+
+def strip_rows(width, factor=1, budget=STRIP_PIXELS):
+    """Output rows per strip so one strip renders about budget pixels at factor x."""
+    return max(1, budget // (width * factor * factor))
+
+
+def _filter_rows(rows, previous, bpp):
+    """
+    PNG-filter a strip of raw rows (h, row bytes) given the raw row above it.
+    Every row gets the filter with the smallest sum of absolute signed
+    bytes, the heuristic libpng and Pillow use, all rows at once. uint8
+    arithmetic wraps modulo 256 as the filters require.
+    """
+    up = np.empty_like(rows)
+    up[0] = previous
+    up[1:] = rows[:-1]
+    left = np.zeros_like(rows)
+    left[:, bpp:] = rows[:, :-bpp]
+    upper_left = np.zeros_like(rows)
+    upper_left[:, bpp:] = up[:, :-bpp]
+
+    # Paeth: distances of left + up - upper_left to each neighbour
+    a, b, c = left.astype(np.int16), up.astype(np.int16), upper_left.astype(np.int16)
+    pa = np.abs(b - c)
+    pb = np.abs(a - c)
+    pc = np.abs(a + b - 2 * c)
+    paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, upper_left))
+    average = (left >> 1) + (up >> 1) + (left & up & 1)
+
+    filtered = np.stack([rows, rows - left, rows - up, rows - average, rows - paeth])
+    # |byte as int8|, without int8's -128 overflow
+    cost = np.minimum(filtered, -filtered).sum(axis=2, dtype=np.uint32)
+    best = cost.argmin(axis=0)
+
+    out = np.empty((rows.shape[0], rows.shape[1] + 1), dtype=np.uint8)
+    out[:, 0] = best
+    out[:, 1:] = filtered[best, np.arange(rows.shape[0])]
+    return out
+
+
+class PNGStreamWriter:
+    """
+    Incremental PNG writer: write_rows() takes uint8 strips of shape
+    (rows, width[, channels]) top to bottom; only the deflate window and
+    the last raw row are kept between strips.
+    """
+
+    def __init__(self, path, width, height, mode="RGB", level=6, strategy="default"):
+        self.color_type, self.bpp = PNG_MODES[mode]
+        self.width, self.height = width, height
+        self.rows_written = 0
+        self.previous = np.zeros(width * self.bpp, dtype=np.uint8)
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 15, 9, STRATEGIES[strategy])
+        self.pending = []
+        self.pending_bytes = 0
+        self.bytes_written = 0
+        self.file = open(path, "wb")
+        self.file.write(PNG_SIGNATURE)
+        self.bytes_written += len(PNG_SIGNATURE)
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, self.color_type, 0, 0, 0))
+
+    def _chunk(self, kind, data):
+        self.file.write(struct.pack(">I", len(data)) + kind)
+        self.file.write(data)
+        self.file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+        self.bytes_written += len(data) + 12
+
+    def _deflated(self, data):
+        if data:
+            self.pending.append(data)
+            self.pending_bytes += len(data)
+        if self.pending_bytes >= IDAT_BYTES:
+            self._flush_idat()
+
+    def _flush_idat(self):
+        if self.pending:
+            self._chunk(b"IDAT", b"".join(self.pending))
+            self.pending = []
+            self.pending_bytes = 0
+
+    def write_rows(self, pixels):
+        pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+        rows = pixels.reshape(pixels.shape[0], -1)
+        if rows.shape[1] != self.width * self.bpp:
+            raise ValueError(f"strip rows are {rows.shape[1]} bytes, "
+                             f"expected {self.width * self.bpp}")
+        if self.rows_written + rows.shape[0] > self.height:
+            raise ValueError("more rows than the image height")
+        self._deflated(self.compressor.compress(_filter_rows(rows, self.previous, self.bpp)))
+        self.previous = rows[-1].copy()
+        self.rows_written += rows.shape[0]
+
+    def close(self):
+        if self.rows_written != self.height:
+            self.file.close()
+            raise ValueError(f"{self.rows_written} rows written, expected {self.height}")
+        self._deflated(self.compressor.flush())
+        self._flush_idat()
+        self._chunk(b"IEND", b"")
+        self.file.close()
+        return self.bytes_written
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+
+
+def _drop_strip_layers():
+    """
+    Forget the memoized layers of the last strip. They are keyed by the
+    strip's box, so no later strip of the stream reuses them, and keeping
+    them would make memory grow with the cache sizes instead of one strip.
+    """
+    icon_glow.shield_glow.cache_clear()
+    icon_shield.shield_field.cache_clear()
+    icon_stroke._cached_coverage.cache_clear()
+    icon_gradients._diagonal_positions.cache_clear()
+
+
+def render_strips(renderer, size, factor=1, rows=None):
+    """Yield a renderer's size x size output as RGB uint8 strips, top to bottom."""
+    rows = rows or strip_rows(size, factor)
+    for top in range(0, size, rows):
+        box, data = render_tile((renderer, size, (0, top, size, min(size, top + rows)), factor))
+        yield np.frombuffer(data, dtype=np.uint8).reshape(box[3] - box[1], size, 3)
+        _drop_strip_layers()
+
+
+def resize_strips(img, size, rows=None):
+    """
+    Yield img resized to size x size with Lanczos, strip by strip. Each
+    strip resamples only the source rows its filter reaches. The result
+    equals a full-frame resize when the scale is a power of two, otherwise
+    a few pixels round differently (1 level) at the float strip boxes.
+    """
+    rows = rows or strip_rows(size)
+    scale = img.height / size
+    for top in range(0, size, rows):
+        bottom = min(size, top + rows)
+        strip = img.resize((size, bottom - top), Image.Resampling.LANCZOS,
+                           box=(0, top * scale, img.width, bottom * scale))
+        yield np.asarray(strip)
+
+
+def stream_png(strips, output_path, width, height, mode="RGB", level=6, strategy="default"):
+    """Write an iterable of strips as one PNG. Returns the file size in bytes."""
+    with PNGStreamWriter(output_path, width, height, mode, level, strategy) as writer:
+        for strip in strips:
+            writer.write_rows(strip)
+    return writer.bytes_written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output")
+    parser.add_argument("--renderer", choices=["checkkicks", "fullbleed", *SVG_RENDERERS],
+                        default="fullbleed")
+    parser.add_argument("--input", help="Upscale this image instead of rendering")
+    parser.add_argument("--size", type=int, default=4096)
+    parser.add_argument("--supersample", type=int, default=1,
+                        help="Supersample factor per axis for rendered strips")
+    parser.add_argument("--rows", type=int, help="Rows per strip (default: by pixel budget)")
+    parser.add_argument("--level", type=int, default=6, help="zlib level")
+    parser.add_argument("--strategy", choices=list(STRATEGIES), default="default")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.input:
+        with Image.open(args.input) as img:
+            img = img.convert("RGB")
+        print(f"Upscaling {args.input} to {args.size}x{args.size} in strips...")
+        strips = resize_strips(img, args.size, args.rows)
+    else:
+        print(f"Rendering {args.renderer} at {args.size}x{args.size} in strips...")
+        strips = render_strips(args.renderer, args.size, args.supersample, args.rows)
+    written = stream_png(strips, args.output, args.size, args.size,
+                         level=args.level, strategy=args.strategy)
+    print(f"Saved: {args.output} ({written:,} bytes in {time.perf_counter() - start:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
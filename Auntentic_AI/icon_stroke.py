@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Analytic polyline strokes with round caps and joins.
+A round-capped, round-joined polyline is the set of pixels within width / 2
+of any of its segments, so coverage is one vectorized distance-to-segment
+pass over the stroke's bounding box, antialiased over a 1px ramp. This
+replaces drawing a stroke as thousands of offset thin lines plus ellipse
+caps. Coverage is cached by geometry, so recoloring a stroke is free.
+"""
+
+from PIL import Image
+from functools import lru_cache
+
+import numpy as np
+
+
+def stroke_bounds(points, width, box):
+    """
+    Integer (left, top, right, bottom) of the stroke's bounding box clipped
+    to box, or None when the stroke misses it.
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    reach = width / 2 + 1
+    left = max(int(np.floor(pts[:, 0].min() - reach)), box[0])
+    top = max(int(np.floor(pts[:, 1].min() - reach)), box[1])
+    right = min(int(np.ceil(pts[:, 0].max() + reach)) + 1, box[2])
+    bottom = min(int(np.ceil(pts[:, 1].max() + reach)) + 1, box[3])
+    if left >= right or top >= bottom:
+        return None
+    return left, top, right, bottom
+
+
+def stroke_coverage(points, width, bounds):
+    """
+    Coverage (float32, 0..1) of the stroke for every pixel in bounds, with
+    pixel (x, y) sampled at its integer coordinate like PIL's drawing calls.
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    x = np.arange(bounds[0], bounds[2], dtype=np.float64)[None, :]
+    y = np.arange(bounds[1], bounds[3], dtype=np.float64)[:, None]
+
+    # Squared distance to the nearest segment; a single point is a dot
+    dist2 = np.full((bounds[3] - bounds[1], bounds[2] - bounds[0]), np.inf)
+    segments = zip(pts[:-1], pts[1:]) if len(pts) > 1 else [(pts[0], pts[0])]
+    for (x0, y0), (x1, y1) in segments:
+        dx, dy = x1 - x0, y1 - y0
+        length2 = dx * dx + dy * dy
+        if length2 > 0:
+            t = np.clip(((x - x0) * dx + (y - y0) * dy) / length2, 0.0, 1.0)
+        else:
+            t = 0.0
+        px = x - (x0 + t * dx)
+        py = y - (y0 + t * dy)
+        np.minimum(dist2, px * px + py * py, out=dist2)
+
+    return np.clip(width / 2 + 0.5 - np.sqrt(dist2), 0.0, 1.0).astype(np.float32)
+
+
+@lru_cache(maxsize=64)
+def _cached_coverage(points, width, bounds):
+    coverage = stroke_coverage(points, width, bounds)
+    coverage.flags.writeable = False
+    return coverage
+
+
+def draw_stroke(img, points, width, fill):
+    """
+    Composite an antialiased polyline stroke onto a PIL image in place.
+    points are in img's pixel coordinates; fill is RGB, or RGBA whose alpha
+    scales the coverage.
+    """
+    bounds = stroke_bounds(points, width, (0, 0) + img.size)
+    if bounds is None:
+        return
+    coverage = _cached_coverage(tuple(map(tuple, points)), width, bounds)
+    if len(fill) == 4:
+        coverage = coverage * (fill[3] / 255)
+    mask = Image.fromarray(np.rint(coverage * 255).astype(np.uint8), "L")
+    img.paste(tuple(fill[:3]) + (255,) * (len(img.getbands()) - 3), bounds, mask)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tile-based supersampled antialiasing for the icon renderers.
+Each output tile is rendered at factor x resolution and reduced straight
+away, so only one high-resolution tile exists at a time (per worker).
+The high-resolution tile edge is fixed, which keeps peak memory the same
+whatever the supersample factor.
+"""
+
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import argparse
+import os
+
+from export_appiconset import get_renderer
+from icon_encode import save_png
+from icon_svg import SVG_RENDERERS
+
+# Edge of one high-resolution tile in pixels: 512x512 RGB is 768 KB
+TILE_PIXELS = 512
+
+
+def tile_boxes(size, tile):
+    """Output-space (left, top, right, bottom) boxes covering a size x size canvas."""
+    return [(x, y, min(x + tile, size), min(y + tile, size))
+            for y in range(0, size, tile)
+            for x in range(0, size, tile)]
+
+
+def render_tile(job):
+    """
+    Worker entry point: render one output tile at factor x and reduce it.
+    Returns the tile's box and raw RGB bytes so the parent never sees the
+    high-resolution buffer.
+    """
+    renderer, size, box, factor = job
+    hi_box = tuple(v * factor for v in box)
+    hi = get_renderer(renderer)(size * factor, box=hi_box, pixel_scale=factor)
+    lo = hi.convert("RGB").reduce(factor)
+    return box, lo.tobytes()
+
+
+def render_supersampled(renderer, size, factor=4, workers=1, tile_pixels=TILE_PIXELS):
+    """
+    Render a size x size icon with factor x factor supersampling, tile by tile.
+    factor=1 renders the same tiles without supersampling.
+    """
+    tile = max(1, tile_pixels // factor)
+    jobs = [(renderer, size, box, factor) for box in tile_boxes(size, tile)]
+    output = Image.new("RGB", (size, size))
+
+    def paste(result):
+        box, data = result
+        width, height = box[2] - box[0], box[3] - box[1]
+        output.paste(Image.frombytes("RGB", (width, height), data), box[:2])
+
+    if workers <= 1:
+        for job in jobs:
+            paste(render_tile(job))
+        return output
+
+    # Bounded number of tiles in flight, like batch_export
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for job in jobs:
+            pending.append(executor.submit(render_tile, job))
+            if len(pending) >= workers * 2:
+                paste(pending.popleft().result())
+        while pending:
+            paste(pending.popleft().result())
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("renderer", choices=["checkkicks", "fullbleed", *SVG_RENDERERS])
+    parser.add_argument("output")
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--factor", type=int, default=4, help="Supersample factor per axis")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"Rendering {args.renderer} at {args.size}x{args.size}, "
+          f"{args.factor}x{args.factor} supersampling...")
+    img = render_supersampled(args.renderer, args.size, args.factor, args.workers)
+    save_png(img, args.output)
+    print(f"Saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1120 @@
+#!/usr/bin/env python3
+"""
+NumPy rasterizer for the SVG subset of the checked-in icon sources.
+Covers paths (M/L/H/V/C/S/Q/T/A/Z), rect, circle, ellipse, line, polygon
+and polyline; solid, linear/radial gradient and pattern paints; strokes
+with butt/round/square caps and miter/round/bevel joins; group opacity
+and transforms; and the filters the sources use (feGaussianBlur,
+feDropShadow, feOffset, feFlood, feColorMatrix, feComposite, feMerge).
+Shapes are filled by a scanline coverage pass: SUBSCANLINES samples per
+pixel row with exact horizontal coverage. Parsed and flattened paths are
+memoized. Renders take box= like the other renderers and a tile equals
+the full render, filters included.
+"""
+
+from PIL import Image
+from functools import lru_cache, partial
+import argparse
+import math
+import os
+import re
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from icon_glow import box_reach, box_sizes
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Renderer name -> checked-in SVG source
+SVG_RENDERERS = {
+    "svg-source": "AppIcon-source.svg",
+    "svg-fullbleed": "app-icon-fullbleed.svg",
+    "svg-new": "app-icon-new.svg",
+}
+
+# Vertical samples per pixel row; horizontal coverage is exact
+SUBSCANLINES = 16
+
+# Largest distance between a curve and its flattened polyline, in pixels
+FLATNESS = 0.1
+
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+# Properties children take over from their parent
+INHERITED = ("fill", "fill-opacity", "fill-rule", "stroke", "stroke-width", "stroke-opacity",
+             "stroke-linecap", "stroke-linejoin", "stroke-miterlimit")
+
+DEFAULT_STYLE = {
+    "fill": "black",
+    "fill-opacity": "1",
+    "fill-rule": "nonzero",
+    "stroke": "none",
+    "stroke-width": "1",
+    "stroke-opacity": "1",
+    "stroke-linecap": "butt",
+    "stroke-linejoin": "miter",
+    "stroke-miterlimit": "4",
+}
+
+NAMED_COLORS = {
+    "black": (0, 0, 0), "white": (255, 255, 255), "red": (255, 0, 0),
+    "green": (0, 128, 0), "blue": (0, 0, 255), "gray": (128, 128, 128),
+    "grey": (128, 128, 128), "gold": (255, 215, 0), "transparent": None,
+}
+
+SHAPES = ("path", "rect", "circle", "ellipse", "line", "polygon", "polyline")
+
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_PATH_TOKEN = re.compile(r"([MmLlHhVvCcSsQqTtZzAa])|(" + _NUMBER + ")")
+_TRANSFORM = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+
+
+# --- parsing ---
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def numbers(text):
+    return [float(v) for v in re.findall(_NUMBER, text or "")]
+
+
+def attributes(element):
+    """Presentation attributes merged with the style attribute, which wins."""
+    attrs = dict(element.attrib)
+    for declaration in attrs.pop("style", "").split(";"):
+        if ":" in declaration:
+            name, value = declaration.split(":", 1)
+            attrs[name.strip()] = value.strip()
+    return attrs
+
+
+def parse_color(value):
+    """'#RGB', '#RRGGBB', 'rgb(r, g, b)' or a color name -> RGB 0..1, None for none."""
+    value = value.strip()
+    if value in ("none", "transparent"):
+        return None
+    if value.startswith("#"):
+        digits = value[1:]
+        if len(digits) == 3:
+            digits = "".join(c * 2 for c in digits)
+        rgb = tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+    elif value.startswith("rgb"):
+        rgb = tuple(numbers(value)[:3])
+    elif value.lower() in NAMED_COLORS:
+        rgb = NAMED_COLORS[value.lower()]
+    else:
+        raise ValueError(f"unsupported color: {value}")
+    return tuple(c / 255 for c in rgb)
+
+
+def url_id(value):
+    """'url(#name)' -> 'name', else None."""
+    match = re.match(r"url\(\s*#([^)\s]+)\s*\)", value or "")
+    return match.group(1) if match else None
+
+
+def fraction(value, default=0.0, reference=1.0):
+    """A number or percentage; percentages are of reference."""
+    if value is None:
+        return default
+    value = value.strip()
+    if value.endswith("%"):
+        return float(value[:-1]) / 100 * reference
+    return float(value)
+
+
+def compose(m, n):
+    """Affine m after n, both (a, b, c, d, e, f) as in SVG matrix()."""
+    a, b, c, d, e, f = m
+    a2, b2, c2, d2, e2, f2 = n
+    return (a * a2 + c * b2, b * a2 + d * b2, a * c2 + c * d2, b * c2 + d * d2,
+            a * e2 + c * f2 + e, b * e2 + d * f2 + f)
+
+
+def invert(m):
+    a, b, c, d, e, f = m
+    det = a * d - b * c
+    return (d / det, -b / det, -c / det, a / det, (c * f - d * e) / det, (b * e - a * f) / det)
+
+
+def apply(m, points):
+    """Map an (..., 2) array of points through an affine."""
+    a, b, c, d, e, f = m
+    x, y = points[..., 0], points[..., 1]
+    return np.stack([a * x + c * y + e, b * x + d * y + f], axis=-1)
+
+
+def scale_of(m):
+    """Length scale of an affine (geometric mean of its axes)."""
+    return math.sqrt(abs(m[0] * m[3] - m[1] * m[2]))
+
+
+def parse_transform(text):
+    matrix = IDENTITY
+    for name, args in _TRANSFORM.findall(text or ""):
+        v = numbers(args)
+        if name == "matrix":
+            step = tuple(v[:6])
+        elif name == "translate":
+            step = (1.0, 0.0, 0.0, 1.0, v[0], v[1] if len(v) > 1 else 0.0)
+        elif name == "scale":
+            step = (v[0], 0.0, 0.0, v[1] if len(v) > 1 else v[0], 0.0, 0.0)
+        elif name == "rotate":
+            angle = math.radians(v[0])
+            cos, sin = math.cos(angle), math.sin(angle)
+            step = (cos, sin, -sin, cos, 0.0, 0.0)
+            if len(v) == 3:
+                step = compose((1.0, 0.0, 0.0, 1.0, v[1], v[2]),
+                               compose(step, (1.0, 0.0, 0.0, 1.0, -v[1], -v[2])))
+        elif name == "skewX":
+            step = (1.0, 0.0, math.tan(math.radians(v[0])), 1.0, 0.0, 0.0)
+        else:
+            step = (1.0, math.tan(math.radians(v[0])), 0.0, 1.0, 0.0, 0.0)
+        matrix = compose(matrix, step)
+    return matrix
+
+
+def _arc_segments(p0, rx, ry, rotation, large, sweep, p1):
+    """
+    An elliptical arc as line or cubic segments, at most a quarter turn
+    per cubic (SVG's endpoint to center parameterization, radii scaled up
+    when they cannot reach p1).
+    """
+    if p0 == p1:
+        return []
+    rx, ry = abs(rx), abs(ry)
+    if rx == 0 or ry == 0:
+        return [(p1,)]
+    cos, sin = math.cos(math.radians(rotation)), math.sin(math.radians(rotation))
+    dx, dy = (p0[0] - p1[0]) / 2, (p0[1] - p1[1]) / 2
+    x1, y1 = cos * dx + sin * dy, -sin * dx + cos * dy
+    reach = (x1 / rx) ** 2 + (y1 / ry) ** 2
+    if reach > 1:
+        rx, ry = rx * math.sqrt(reach), ry * math.sqrt(reach)
+    num = (rx * ry) ** 2 - (rx * y1) ** 2 - (ry * x1) ** 2
+    den = (rx * y1) ** 2 + (ry * x1) ** 2
+    coef = math.sqrt(max(0.0, num / den)) * (-1 if large == sweep else 1)
+    cx1, cy1 = coef * rx * y1 / ry, -coef * ry * x1 / rx
+    cx = cos * cx1 - sin * cy1 + (p0[0] + p1[0]) / 2
+    cy = sin * cx1 + cos * cy1 + (p0[1] + p1[1]) / 2
+
+    theta = math.atan2((y1 - cy1) / ry, (x1 - cx1) / rx)
+    sweep_angle = math.atan2((-y1 - cy1) / ry, (-x1 - cx1) / rx) - theta
+    if sweep and sweep_angle < 0:
+        sweep_angle += 2 * math.pi
+    elif not sweep and sweep_angle > 0:
+        sweep_angle -= 2 * math.pi
+
+    def to_user(x, y):
+        return (cx + cos * rx * x - sin * ry * y, cy + sin * rx * x + cos * ry * y)
+
+    count = max(1, math.ceil(abs(sweep_angle) / (math.pi / 2) - 1e-9))
+    step = sweep_angle / count
+    k = 4 / 3 * math.tan(step / 4)
+    segments = []
+    for n in range(count):
+        a, b = theta + n * step, theta + (n + 1) * step
+        c1 = to_user(math.cos(a) - k * math.sin(a), math.sin(a) + k * math.cos(a))
+        c2 = to_user(math.cos(b) + k * math.sin(b), math.sin(b) - k * math.cos(b))
+        segments.append((c1, c2, p1 if n == count - 1 else to_user(math.cos(b), math.sin(b))))
+    return segments
+
+
+@lru_cache(maxsize=256)
+def parse_path(d):
+    """
+    Path data -> tuple of (segments, closed) subpaths in user units. A
+    segment is a tuple of points: (p,) for a line to p, (c1, c2, p) for a
+    cubic; the first point of a subpath is segments[0][0].
+    """
+    tokens = [(cmd, num) for cmd, num in _PATH_TOKEN.findall(d)]
+    subpaths = []
+    segments = None
+    current = start = (0.0, 0.0)
+    last_control = None
+    command = None
+    i = 0
+
+    def take(count):
+        nonlocal i
+        values = []
+        while len(values) < count:
+            if i >= len(tokens) or not tokens[i][1]:
+                raise ValueError(f"path data ends early: {d[:40]}...")
+            values.append(float(tokens[i][1]))
+            i += 1
+        return values
+
+    def take_flag():
+        # Arc flags may be packed against what follows: "a5 5 0 01 10 0"
+        nonlocal i
+        if i >= len(tokens) or not tokens[i][1] or tokens[i][1][0] not in "01":
+            raise ValueError(f"bad arc flag in path data: {d[:40]}...")
+        text = tokens[i][1]
+        if len(text) > 1:
+            tokens[i] = ("", text[1:])
+        else:
+            i += 1
+        return text[0] == "1"
+
+    def finish(closed):
+        if segments and len(segments) > 1:
+            subpaths.append((tuple(segments), closed))
+
+    while i < len(tokens):
+        if tokens[i][0]:
+            command = tokens[i][0]
+            i += 1
+        elif command is None:
+            raise ValueError("path data must start with a command")
+        relative = command.islower()
+        base = current if relative else (0.0, 0.0)
+        kind = command.upper()
+
+        def point(x, y):
+            return (base[0] + x, base[1] + y)
+
+        if kind == "M":
+            finish(False)
+            current = start = point(*take(2))
+            segments = [(current,)]
+            # Further coordinate pairs are implicit line-tos
+            command = "l" if relative else "L"
+            last_control = None
+            continue
+        if segments is None:
+            segments = [(current,)]
+        if kind == "Z":
+            if current != start:
+                segments.append((start,))
+            finish(True)
+            segments = None
+            current = start
+            last_control = None
+            continue
+        if kind == "L":
+            current = point(*take(2))
+            segments.append((current,))
+            last_control = None
+        elif kind == "H":
+            x = take(1)[0]
+            current = (base[0] + x if relative else x, current[1])
+            segments.append((current,))
+            last_control = None
+        elif kind == "V":
+            y = take(1)[0]
+            current = (current[0], base[1] + y if relative else y)
+            segments.append((current,))
+            last_control = None
+        elif kind in ("C", "S"):
+            if kind == "C":
+                c1 = point(*take(2))
+            else:
+                c1 = ((2 * current[0] - last_control[0], 2 * current[1] - last_control[1])
+                      if last_control else current)
+            c2 = point(*take(2))
+            end = point(*take(2))
+            segments.append((c1, c2, end))
+            current, last_control = end, c2
+        elif kind in ("Q", "T"):
+            if kind == "Q":
+                q = point(*take(2))
+            else:
+                q = ((2 * current[0] - last_control[0], 2 * current[1] - last_control[1])
+                     if last_control else current)
+            end = point(*take(2))
+            # Degree elevation: the same curve as a cubic
+            c1 = (current[0] + 2 / 3 * (q[0] - current[0]), current[1] + 2 / 3 * (q[1] - current[1]))
+            c2 = (end[0] + 2 / 3 * (q[0] - end[0]), end[1] + 2 / 3 * (q[1] - end[1]))
+            segments.append((c1, c2, end))
+            current, last_control = end, q
+        elif kind == "A":
+            rx, ry, rotation = take(3)
+            large, sweep = take_flag(), take_flag()
+            end = point(*take(2))
+            segments.extend(_arc_segments(current, rx, ry, rotation, large, sweep, end))
+            current = end
+        else:
+            raise ValueError(f"unsupported path command: {command}")
+        if kind not in ("C", "S", "Q", "T"):
+            last_control = None
+    finish(False)
+    return tuple(subpaths)
+
+
+def shape_path(tag, attrs):
+    """Path data for a basic shape element, so every shape shares the path code."""
+    def num(name):
+        return fraction(attrs.get(name), 0.0)
+
+    if tag == "path":
+        return attrs.get("d", "")
+    if tag == "rect":
+        x, y, w, h = num("x"), num("y"), num("width"), num("height")
+        if w <= 0 or h <= 0:
+            return ""
+        return f"M{x},{y} H{x + w} V{y + h} H{x} Z"
+    if tag in ("circle", "ellipse"):
+        cx, cy = num("cx"), num("cy")
+        rx = num("r") if tag == "circle" else num("rx")
+        ry = num("r") if tag == "circle" else num("ry")
+        if rx <= 0 or ry <= 0:
+            return ""
+        # Four cubic quarter arcs, off the true ellipse by < 0.03% of the radius
+        k = 0.5522847498
+        return (f"M{cx + rx},{cy} "
+                f"C{cx + rx},{cy + k * ry} {cx + k * rx},{cy + ry} {cx},{cy + ry} "
+                f"C{cx - k * rx},{cy + ry} {cx - rx},{cy + k * ry} {cx - rx},{cy} "
+                f"C{cx - rx},{cy - k * ry} {cx - k * rx},{cy - ry} {cx},{cy - ry} "
+                f"C{cx + k * rx},{cy - ry} {cx + rx},{cy - k * ry} {cx + rx},{cy} Z")
+    if tag == "line":
+        return f"M{num('x1')},{num('y1')} L{num('x2')},{num('y2')}"
+    points = numbers(attrs.get("points"))
+    if len(points) < 4:
+        return ""
+    pairs = " ".join(f"{points[i]},{points[i + 1]}" for i in range(0, len(points) - 1, 2))
+    return "M" + pairs + (" Z" if tag == "polygon" else "")
+
+
+# --- flattening and scanline fill ---
+
+def _cubic_points(p0, c1, c2, p1, tolerance):
+    """Points of a device-space cubic after p0, within tolerance px of the curve."""
+    dd = max(math.hypot(p0[0] - 2 * c1[0] + c2[0], p0[1] - 2 * c1[1] + c2[1]),
+             math.hypot(c1[0] - 2 * c2[0] + p1[0], c1[1] - 2 * c2[1] + p1[1]))
+    count = max(1, math.ceil(math.sqrt(0.75 * dd / tolerance)))
+    t = np.linspace(0.0, 1.0, count + 1)[1:, None]
+    u = 1 - t
+    return (u ** 3 * p0 + 3 * u * u * t * np.asarray(c1) + 3 * u * t * t * np.asarray(c2)
+            + t ** 3 * np.asarray(p1))
+
+
+@lru_cache(maxsize=512)
+def flatten(d, matrix=IDENTITY, tolerance=FLATNESS):
+    """
+    Path data -> tuple of (float64 (n, 2) device points, closed) polylines
+    through matrix. Cached and read-only.
+    """
+    polylines = []
+    for segments, closed in parse_path(d):
+        pieces = [apply(matrix, np.array([segments[0][0]], dtype=np.float64))]
+        for segment in segments[1:]:
+            control = apply(matrix, np.array(segment, dtype=np.float64))
+            if len(segment) == 1:
+                pieces.append(control)
+            else:
+                pieces.append(_cubic_points(pieces[-1][-1], control[0], control[1], control[2],
+                                            tolerance))
+        points = np.concatenate(pieces)
+        points.flags.writeable = False
+        polylines.append((points, closed))
+    return tuple(polylines)
+
+
+def _edges(rings):
+    """(x0, y0, x1, y1) arrays of every edge of closed rings: (n, 2) or batches (k, n, 2)."""
+    starts, ends = [], []
+    for ring in rings:
+        ring = np.asarray(ring, dtype=np.float64)
+        if ring.ndim == 2:
+            ring = ring[None]
+        starts.append(ring.reshape(-1, 2))
+        ends.append(np.roll(ring, -1, axis=1).reshape(-1, 2))
+    if not starts:
+        return None
+    p, q = np.concatenate(starts), np.concatenate(ends)
+    return p[:, 0], p[:, 1], q[:, 0], q[:, 1]
+
+
+def rings_bounds(rings):
+    points = np.concatenate([np.asarray(r).reshape(-1, 2) for r in rings])
+    return points[:, 0].min(), points[:, 1].min(), points[:, 0].max(), points[:, 1].max()
+
+
+def coverage(rings, rect, rule="nonzero"):
+    """
+    Scanline coverage of closed rings inside rect=(left, top, right, bottom)
+    device pixels. Returns ((left, top, right, bottom), float32 coverage)
+    over the rings' bounds within rect, or None.
+
+    Every pixel row is sampled by SUBSCANLINES horizontal lines. Along each
+    line the edge crossings, sorted by x, give the covered spans, and each
+    span adds its exact horizontal overlap with every pixel through a
+    difference array; all lines of all rows are handled at once.
+    """
+    edges = _edges(rings)
+    if edges is None:
+        return None
+    x_min, y_min, x_max, y_max = rings_bounds(rings)
+    bounds = (max(rect[0], math.floor(x_min)), max(rect[1], math.floor(y_min)),
+              min(rect[2], math.ceil(x_max)), min(rect[3], math.ceil(y_max)))
+    if bounds[0] >= bounds[2] or bounds[1] >= bounds[3]:
+        return None
+    left, top, right, bottom = bounds
+    width, rows = right - left, bottom - top
+    samples = rows * SUBSCANLINES
+
+    x0, y0, x1, y1 = edges
+    direction = np.sign(y1 - y0)
+    keep = direction != 0
+    x0, y0, x1, y1, direction = x0[keep], y0[keep], x1[keep], y1[keep], direction[keep]
+    flip = direction < 0
+    xa, ya = np.where(flip, x1, x0), np.where(flip, y1, y0)
+    xb, yb = np.where(flip, x0, x1), np.where(flip, y0, y1)
+    slope = (xb - xa) / (yb - ya)
+
+    # Sample lines k sit at y = top + (k + 0.5) / SUBSCANLINES; an edge
+    # crosses those with ya <= y < yb
+    first = np.clip(np.ceil((ya - top) * SUBSCANLINES - 0.5), 0, samples).astype(np.int64)
+    last = np.clip(np.ceil((yb - top) * SUBSCANLINES - 0.5), 0, samples).astype(np.int64)
+    counts = np.maximum(last - first, 0)
+    total = int(counts.sum())
+    if total == 0:
+        return None
+    edge = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.cumsum(counts) - counts
+    line = first[edge] + np.arange(total) - offsets[edge]
+    y = top + (line + 0.5) / SUBSCANLINES
+    x = xa[edge] + (y - ya[edge]) * slope[edge]
+
+    order = np.lexsort((x, line))
+    line, x, winding = line[order], x[order], direction[edge][order]
+    # A closed ring crosses every line an even number of times with zero
+    # net winding, so running totals restart at 0 on each line by themselves
+    if rule == "evenodd":
+        inside = np.cumsum(np.ones_like(winding)) % 2 == 1
+    else:
+        inside = np.cumsum(winding) != 0
+    span = inside[:-1] & (line[:-1] == line[1:])
+    row = line[:-1][span] // SUBSCANLINES
+    a = np.clip(x[:-1][span] - left, 0, width)
+    b = np.clip(x[1:][span] - left, 0, width)
+
+    # Pixel p gets clamp(b - p, 0, 1) - clamp(a - p, 0, 1): a step down at
+    # floor(t) in a cumulative array plus frac(t) at floor(t), per endpoint
+    stride = width + 1
+    ends = np.concatenate([a, b])
+    signs = np.concatenate([-np.ones_like(a), np.ones_like(b)]) / SUBSCANLINES
+    cells = np.floor(ends).astype(np.int64)
+    index = np.concatenate([row, row]) * stride + cells
+    steps = np.bincount(index, weights=-signs, minlength=rows * stride).reshape(rows, stride)
+    fractions = np.bincount(index, weights=signs * (ends - cells),
+                            minlength=rows * stride).reshape(rows, stride)
+    values = np.cumsum(steps, axis=1) + fractions
+    return bounds, np.clip(values[:, :width], 0.0, 1.0).astype(np.float32)
+
+
+# --- strokes ---
+
+def _circle_ring(center, radius, tolerance=FLATNESS):
+    count = max(8, math.ceil(math.pi / math.acos(max(-1.0, 1 - tolerance / max(radius, 1e-9)))))
+    angle = np.linspace(0, 2 * math.pi, count, endpoint=False)
+    return np.stack([center[0] + radius * np.cos(angle), center[1] + radius * np.sin(angle)], axis=1)
+
+
+def _positive(ring):
+    """ring with positive signed area, so overlapping pieces add up under nonzero."""
+    x, y = ring[..., 0], ring[..., 1]
+    area = (x * np.roll(y, -1, axis=-1) - np.roll(x, -1, axis=-1) * y).sum(axis=-1)
+    if ring.ndim == 2:
+        return ring if area >= 0 else ring[::-1]
+    ring = ring.copy()
+    ring[area < 0] = ring[area < 0][:, ::-1]
+    return ring
+
+
+def stroke_rings(points, closed, width, cap="butt", join="miter", miterlimit=4.0):
+    """
+    Closed rings whose nonzero union is the stroke of a device polyline:
+    one quad per segment plus the join and cap pieces, all wound the same way.
+    """
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.any(np.diff(points, axis=0) != 0, axis=1)
+    points = points[keep]
+    if closed and len(points) > 1 and np.array_equal(points[0], points[-1]):
+        points = points[:-1]
+    half = width / 2
+    if len(points) < 2:
+        if cap == "round" and len(points):
+            return [_circle_ring(points[0], half)]
+        return []
+
+    starts = points if closed else points[:-1]
+    ends = np.roll(points, -1, axis=0) if closed else points[1:]
+    direction = ends - starts
+    unit = direction / np.hypot(direction[:, 0], direction[:, 1])[:, None]
+    normal = np.stack([-unit[:, 1], unit[:, 0]], axis=1) * half
+
+    if not closed and cap == "square":
+        starts = starts.copy()
+        ends = ends.copy()
+        starts[0] -= unit[0] * half
+        ends[-1] += unit[-1] * half
+    quads = np.stack([starts + normal, ends + normal, ends - normal, starts - normal], axis=1)
+    rings = [_positive(quads)]
+
+    # Joins at interior vertices (every vertex when closed)
+    vertices = range(len(points)) if closed else range(1, len(points) - 1)
+    for i in vertices:
+        before, after = (i - 1) % len(unit), i % len(unit)
+        vertex = points[i]
+        if join == "round":
+            rings.append(_positive(_circle_ring(vertex, half)))
+            continue
+        cross = unit[before, 0] * unit[after, 1] - unit[before, 1] * unit[after, 0]
+        if abs(cross) < 1e-12:
+            continue
+        side = -1.0 if cross > 0 else 1.0
+        na, nb = normal[before] * side, normal[after] * side
+        piece = [vertex, vertex + na, vertex + nb]
+        if join == "miter":
+            turn = float(np.clip(np.dot(unit[before], unit[after]), -1, 1))
+            # Miter length / stroke width = 1 / sin(half the interior angle)
+            ratio = 1 / math.sqrt(max(1e-12, (1 + turn) / 2))
+            if ratio <= miterlimit:
+                tip = vertex + (na + nb) / np.linalg.norm(na + nb) * half * ratio
+                piece = [vertex, vertex + na, tip, vertex + nb]
+        rings.append(_positive(np.array(piece)))
+
+    if not closed and cap == "round":
+        rings.append(_positive(_circle_ring(points[0], half)))
+        rings.append(_positive(_circle_ring(points[-1], half)))
+    return rings
+
+
+# --- paints ---
+
+def _stops(element, ids):
+    """Gradient stops as (offsets, straight RGBA 0..1), following xlink:href."""
+    stops = [s for s in element if _local(s.tag) == "stop"]
+    href = element.get("{http://www.w3.org/1999/xlink}href") or element.get("href")
+    if not stops and href and href.lstrip("#") in ids:
+        return _stops(ids[href.lstrip("#")], ids)
+    offsets, colors = [], []
+    for stop in stops:
+        attrs = attributes(stop)
+        offset = min(1.0, max(0.0, fraction(attrs.get("offset"), 0.0)))
+        offsets.append(max(offset, offsets[-1]) if offsets else offset)
+        rgb = parse_color(attrs.get("stop-color", "black")) or (0.0, 0.0, 0.0)
+        colors.append(rgb + (float(attrs.get("stop-opacity", 1)),))
+    return np.array(offsets), np.array(colors)
+
+
+def _gradient_colors(t, offsets, colors):
+    """Premultiplied RGBA for gradient positions t (pad spread)."""
+    if len(offsets) == 1:
+        straight = np.broadcast_to(colors[0], t.shape + (4,))
+    else:
+        straight = np.stack([np.interp(t, offsets, colors[:, c]) for c in range(4)], axis=-1)
+    rgba = np.empty(t.shape + (4,), dtype=np.float32)
+    rgba[..., :3] = straight[..., :3] * straight[..., 3:]
+    rgba[..., 3] = straight[..., 3]
+    return rgba
+
+
+def _pixel_centers(bounds, inverse):
+    """User-space coordinates of the pixel centers in bounds."""
+    left, top, right, bottom = bounds
+    x, y = np.meshgrid(np.arange(left, right) + 0.5, np.arange(top, bottom) + 0.5)
+    return apply(inverse, np.stack([x, y], axis=-1))
+
+
+class Renderer:
+    """One render of a parsed SVG document into a device rectangle."""
+
+    def __init__(self, root, size, rect):
+        self.root = root
+        self.ids = {el.get("id"): el for el in root.iter() if el.get("id")}
+        self.size = size
+        self.rect = rect
+        self.tiles = {}
+
+    # --- geometry ---
+
+    def geometry_bounds(self, element, matrix, local=False):
+        """
+        Bounds of an element's fill geometry through matrix, or None; local
+        leaves out the element's own transform (its objectBoundingBox).
+        """
+        tag = _local(element.tag)
+        if not local:
+            matrix = compose(matrix, parse_transform(element.get("transform")))
+        if tag in SHAPES:
+            polylines = flatten(shape_path(tag, attributes(element)), matrix)
+            if not polylines:
+                return None
+            return rings_bounds([points for points, _ in polylines])
+        if tag in ("g", "svg"):
+            found = [self.geometry_bounds(child, matrix) for child in element]
+            found = [b for b in found if b]
+            if not found:
+                return None
+            return (min(b[0] for b in found), min(b[1] for b in found),
+                    max(b[2] for b in found), max(b[3] for b in found))
+        return None
+
+    def paint_bounds(self, element, matrix, style):
+        """Device pixels an element may paint without filters: geometry plus strokes."""
+        tag = _local(element.tag)
+        own = attributes(element)
+        style = {**style, **{k: v for k, v in own.items() if k in INHERITED}}
+        matrix = compose(matrix, parse_transform(element.get("transform")))
+        if tag in SHAPES:
+            polylines = flatten(shape_path(tag, own), matrix)
+            if not polylines:
+                return None
+            x0, y0, x1, y1 = rings_bounds([points for points, _ in polylines])
+            pad = 1.0
+            if style["stroke"] != "none":
+                # Miters may reach miterlimit half-widths out
+                pad += float(style["stroke-width"]) * scale_of(matrix) / 2 * max(
+                    1.0, float(style["stroke-miterlimit"]))
+            return (x0 - pad, y0 - pad, x1 + pad, y1 + pad)
+        if tag == "g":
+            found = [self.paint_bounds(child, matrix, style) for child in element]
+            found = [b for b in found if b]
+            if not found:
+                return None
+            bounds = (min(b[0] for b in found), min(b[1] for b in found),
+                      max(b[2] for b in found), max(b[3] for b in found))
+            filter_id = url_id(own.get("filter"))
+            if filter_id in self.ids:
+                bounds = self.filter_region(self.ids[filter_id], element, matrix)
+            return bounds
+        return None
+
+    # --- paints ---
+
+    def paint(self, value, opacity, bounds, matrix, element):
+        """
+        Premultiplied RGBA for a fill/stroke value over bounds: an array
+        (h, w, 4), a constant (4,) or None for no paint.
+        """
+        if value is None or value == "none":
+            return None
+        ref = url_id(value)
+        if ref:
+            target = self.ids.get(ref)
+            if target is None:
+                return None
+            kind = _local(target.tag)
+            if kind in ("linearGradient", "radialGradient"):
+                rgba = self.gradient(target, bounds, matrix, element)
+            elif kind == "pattern":
+                rgba = self.pattern(target, bounds, matrix, element)
+            else:
+                raise ValueError(f"unsupported paint server: {kind}")
+            return None if rgba is None else rgba * opacity
+        rgb = parse_color(value)
+        if rgb is None:
+            return None
+        return np.array([c * opacity for c in rgb] + [opacity], dtype=np.float32)
+
+    def gradient(self, gradient, bounds, matrix, element):
+        offsets, colors = _stops(gradient, self.ids)
+        if not len(offsets):
+            return None
+        attrs = attributes(gradient)
+        user = attrs.get("gradientUnits", "objectBoundingBox") == "userSpaceOnUse"
+        space = compose(matrix, parse_transform(attrs.get("gradientTransform")))
+        if not user:
+            # Gradient coordinates are fractions of the element's bounding box
+            x0, y0, x1, y1 = self.geometry_bounds(element, IDENTITY, local=True)
+            space = compose(space, (x1 - x0, 0.0, 0.0, y1 - y0, x0, y0))
+        q = _pixel_centers(bounds, invert(space))
+        if _local(gradient.tag) == "linearGradient":
+            p1 = np.array([fraction(attrs.get("x1"), 0.0), fraction(attrs.get("y1"), 0.0)])
+            p2 = np.array([fraction(attrs.get("x2"), 1.0), fraction(attrs.get("y2"), 0.0)])
+            axis = p2 - p1
+            t = ((q - p1) @ axis) / max(float(axis @ axis), 1e-12)
+        else:
+            center = np.array([fraction(attrs.get("cx"), 0.5), fraction(attrs.get("cy"), 0.5)])
+            radius = fraction(attrs.get("r"), 0.5)
+            t = np.hypot(q[..., 0] - center[0], q[..., 1] - center[1]) / max(radius, 1e-12)
+        return _gradient_colors(np.clip(t, 0.0, 1.0), offsets, colors)
+
+    def pattern(self, pattern, bounds, matrix, element):
+        """
+        Pattern paint: one tile is rendered at its device resolution and
+        looked up per pixel, repeating in user space.
+        """
+        attrs = attributes(pattern)
+        tile_w, tile_h = fraction(attrs.get("width"), 0.0), fraction(attrs.get("height"), 0.0)
+        px, py = fraction(attrs.get("x"), 0.0), fraction(attrs.get("y"), 0.0)
+        if attrs.get("patternUnits", "objectBoundingBox") != "userSpaceOnUse":
+            x0, y0, x1, y1 = self.geometry_bounds(element, IDENTITY, local=True)
+            px, py = x0 + px * (x1 - x0), y0 + py * (y1 - y0)
+            tile_w, tile_h = tile_w * (x1 - x0), tile_h * (y1 - y0)
+        if tile_w <= 0 or tile_h <= 0:
+            return None
+        scale = scale_of(matrix)
+        res = (max(1, round(tile_w * scale)), max(1, round(tile_h * scale)))
+        key = (pattern.get("id"), res)
+        if key not in self.tiles:
+            tile = Surface((0, 0, res[0], res[1]))
+            tile_matrix = (res[0] / tile_w, 0.0, 0.0, res[1] / tile_h, 0.0, 0.0)
+            for child in pattern:
+                self.render(child, tile, tile_matrix, dict(DEFAULT_STYLE))
+            self.tiles[key] = tile.pixels
+        tile = self.tiles[key]
+        q = _pixel_centers(bounds, invert(matrix))
+        u = np.floor(np.mod(q[..., 0] - px, tile_w) / tile_w * res[0]).astype(np.intp)
+        v = np.floor(np.mod(q[..., 1] - py, tile_h) / tile_h * res[1]).astype(np.intp)
+        return tile[np.clip(v, 0, res[1] - 1), np.clip(u, 0, res[0] - 1)]
+
+    # --- filters ---
+
+    def filter_region(self, filter_el, element, matrix):
+        """Device bounds of a filter's region for element (objectBoundingBox units)."""
+        attrs = attributes(filter_el)
+        x0, y0, x1, y1 = self.geometry_bounds(element, IDENTITY, local=True) or (0, 0, 0, 0)
+        w, h = x1 - x0, y1 - y0
+        fx = x0 + fraction(attrs.get("x"), -0.1, 1.0) * w
+        fy = y0 + fraction(attrs.get("y"), -0.1, 1.0) * h
+        fw = fraction(attrs.get("width"), 1.2, 1.0) * w
+        fh = fraction(attrs.get("height"), 1.2, 1.0) * h
+        element_matrix = compose(matrix, parse_transform(element.get("transform")))
+        corners = apply(element_matrix, np.array([[fx, fy], [fx + fw, fy], [fx, fy + fh],
+                                                  [fx + fw, fy + fh]]))
+        return (corners[:, 0].min(), corners[:, 1].min(), corners[:, 0].max(), corners[:, 1].max())
+
+    def filter_reach(self, filter_el, matrix):
+        """Pixels a filter can move content by: blur reaches plus offsets."""
+        scale = scale_of(matrix)
+        reach = 0
+        for primitive in filter_el:
+            kind = _local(primitive.tag)
+            attrs = attributes(primitive)
+            if kind in ("feGaussianBlur", "feDropShadow"):
+                sigma = max(numbers(attrs.get("stdDeviation", "0")) or [0.0]) * scale
+                reach += box_reach(sigma) if sigma > 0 else 0
+            if kind in ("feOffset", "feDropShadow"):
+                dx, dy = float(attrs.get("dx", 2 if kind == "feDropShadow" else 0)), \
+                    float(attrs.get("dy", 2 if kind == "feDropShadow" else 0))
+                reach += math.ceil(max(abs(dx), abs(dy)) * scale) + 1
+        return reach
+
+    def apply_filter(self, filter_el, source, matrix):
+        """Run a filter's primitives on a premultiplied RGBA layer."""
+        scale = scale_of(matrix)
+        results = {}
+        previous = source
+        for primitive in filter_el:
+            kind = _local(primitive.tag)
+            attrs = attributes(primitive)
+
+            def input_of(name):
+                if name is None:
+                    return previous
+                if name == "SourceGraphic":
+                    return source
+                if name == "SourceAlpha":
+                    alpha = np.zeros_like(source)
+                    alpha[..., 3] = source[..., 3]
+                    return alpha
+                return results.get(name, previous)
+
+            layer = input_of(attrs.get("in"))
+            if kind == "feGaussianBlur":
+                sigma = numbers(attrs.get("stdDeviation", "0")) or [0.0]
+                out = gaussian_blur(layer, sigma[0] * scale, sigma[-1] * scale)
+            elif kind == "feOffset":
+                out = offset(layer, float(attrs.get("dx", 0)) * matrix[0],
+                             float(attrs.get("dy", 0)) * matrix[3])
+            elif kind == "feFlood":
+                out = flood(layer.shape, attrs)
+            elif kind == "feColorMatrix":
+                out = color_matrix(layer, attrs)
+            elif kind == "feComposite":
+                out = composite(layer, input_of(attrs.get("in2")), attrs.get("operator", "over"))
+            elif kind == "feMerge":
+                out = np.zeros_like(source)
+                for node in primitive:
+                    out = composite(input_of(node.get("in")), out, "over")
+            elif kind == "feDropShadow":
+                sigma = numbers(attrs.get("stdDeviation", "2")) or [2.0]
+                alpha = np.zeros_like(layer)
+                alpha[..., 3] = layer[..., 3]
+                shadow = gaussian_blur(alpha, sigma[0] * scale, sigma[-1] * scale)
+                shadow = offset(shadow, float(attrs.get("dx", 2)) * matrix[0],
+                                float(attrs.get("dy", 2)) * matrix[3])
+                shadow = composite(flood(layer.shape, attrs), shadow, "in")
+                out = composite(layer, shadow, "over")
+            elif kind == "feBlend":
+                out = composite(layer, input_of(attrs.get("in2")), "over")
+            else:
+                raise ValueError(f"unsupported filter primitive: {kind}")
+            previous = out
+            if attrs.get("result"):
+                results[attrs["result"]] = out
+        return previous
+
+    # --- rendering ---
+
+    def render(self, element, surface, matrix, style):
+        tag = _local(element.tag)
+        if tag in ("defs", "pattern", "linearGradient", "radialGradient", "filter",
+                   "clipPath", "mask", "title", "desc", "metadata", "style"):
+            return
+        if tag not in SHAPES and tag not in ("g", "svg"):
+            raise ValueError(f"unsupported SVG element: {tag}")
+        attrs = attributes(element)
+        if attrs.get("display") == "none" or attrs.get("visibility") == "hidden":
+            return
+        for name in ("clip-path", "mask"):
+            if url_id(attrs.get(name)):
+                raise ValueError(f"unsupported SVG attribute: {name}")
+        style = {**style, **{k: v for k, v in attrs.items() if k in INHERITED}}
+        matrix = compose(matrix, parse_transform(attrs.get("transform")))
+        opacity = float(attrs.get("opacity", 1))
+        filter_id = url_id(attrs.get("filter"))
+        filter_el = self.ids.get(filter_id) if filter_id else None
+
+        needs_layer = filter_el is not None or (tag in ("g", "svg") and opacity < 1) or (
+            opacity < 1 and style["fill"] != "none" and style["stroke"] != "none")
+        if not needs_layer:
+            if tag in ("g", "svg"):
+                for child in element:
+                    self.render(child, surface, matrix, style)
+            elif tag in SHAPES:
+                self.draw_shape(element, attrs, surface, matrix, style, opacity)
+            return
+
+        # Rendered on its own layer, then filtered and composited with opacity
+        parent_matrix = compose(matrix, invert(parse_transform(attrs.get("transform"))))
+        if filter_el is not None:
+            region = self.filter_region(filter_el, element, parent_matrix)
+            reach = self.filter_reach(filter_el, matrix)
+            # Only what can reach the surface is rendered: its rect grown by the reach
+            limit = (surface.rect[0] - reach, surface.rect[1] - reach,
+                     surface.rect[2] + reach, surface.rect[3] + reach)
+        else:
+            region = self.paint_bounds(element, parent_matrix, style) or (0, 0, 0, 0)
+            limit = surface.rect
+        rect = (max(limit[0], math.floor(region[0])), max(limit[1], math.floor(region[1])),
+                min(limit[2], math.ceil(region[2])), min(limit[3], math.ceil(region[3])))
+        if rect[0] >= rect[2] or rect[1] >= rect[3]:
+            return
+        layer = Surface(rect)
+        if tag in ("g", "svg"):
+            for child in element:
+                self.render(child, layer, matrix, style)
+        else:
+            self.draw_shape(element, attrs, layer, matrix, style, 1.0)
+        pixels = layer.pixels
+        if filter_el is not None:
+            pixels = self.apply_filter(filter_el, pixels, matrix)
+        surface.composite_layer(rect, pixels * opacity)
+
+    def draw_shape(self, element, attrs, surface, matrix, style, opacity):
+        tag = _local(element.tag)
+        polylines = flatten(shape_path(tag, attrs), matrix)
+        if not polylines:
+            return
+        if tag not in ("line", "polyline"):
+            fill_opacity = opacity * float(style["fill-opacity"])
+            rings = [points for points, _ in polylines]
+            covered = coverage(rings, surface.rect, style["fill-rule"])
+            if covered:
+                paint = self.paint(style["fill"], fill_opacity, covered[0], matrix, element)
+                surface.fill(covered, paint)
+        if style["stroke"] != "none":
+            width = float(style["stroke-width"]) * scale_of(matrix)
+            if width <= 0:
+                return
+            rings = []
+            for points, closed in polylines:
+                rings += stroke_rings(points, closed, width, style["stroke-linecap"],
+                                      style["stroke-linejoin"], float(style["stroke-miterlimit"]))
+            covered = coverage(rings, surface.rect, "nonzero") if rings else None
+            if covered:
+                stroke_opacity = opacity * float(style["stroke-opacity"])
+                paint = self.paint(style["stroke"], stroke_opacity, covered[0], matrix, element)
+                surface.fill(covered, paint)
+
+
+class Surface:
+    """Premultiplied float32 RGBA pixels of a device rectangle."""
+
+    def __init__(self, rect):
+        self.rect = rect
+        self.pixels = np.zeros((rect[3] - rect[1], rect[2] - rect[0], 4), dtype=np.float32)
+
+    def _window(self, bounds):
+        left, top, right, bottom = bounds
+        return self.pixels[top - self.rect[1]:bottom - self.rect[1],
+                           left - self.rect[0]:right - self.rect[0]]
+
+    def fill(self, covered, paint):
+        """Source-over a coverage mask in a premultiplied paint."""
+        if paint is None:
+            return
+        bounds, mask = covered
+        source = paint * mask[..., None]
+        window = self._window(bounds)
+        window *= 1 - source[..., 3:]
+        window += source
+
+    def composite_layer(self, rect, pixels):
+        """Source-over another surface's pixels, clipped to this one."""
+        left, top = max(rect[0], self.rect[0]), max(rect[1], self.rect[1])
+        right, bottom = min(rect[2], self.rect[2]), min(rect[3], self.rect[3])
+        if left >= right or top >= bottom:
+            return
+        source = pixels[top - rect[1]:bottom - rect[1], left - rect[0]:right - rect[0]]
+        window = self._window((left, top, right, bottom))
+        window *= 1 - source[..., 3:]
+        window += source
+
+
+# --- filter primitives on premultiplied RGBA ---
+
+def _box_pass(values, width, axis):
+    """Centered box mean of odd width along axis, zeros outside; same shape."""
+    reach = width // 2
+    pad = [(0, 0)] * values.ndim
+    pad[axis] = (reach + 1, reach)
+    total = np.cumsum(np.pad(values, pad), axis=axis, dtype=np.float64)
+    count = values.shape[axis]
+    hi = [slice(None)] * values.ndim
+    lo = [slice(None)] * values.ndim
+    hi[axis] = slice(width, width + count)
+    lo[axis] = slice(0, count)
+    return ((total[tuple(hi)] - total[tuple(lo)]) / width).astype(np.float32)
+
+
+def gaussian_blur(layer, sigma_x, sigma_y):
+    """Three box passes per axis, as the SVG spec suggests for feGaussianBlur."""
+    if sigma_y > 0:
+        for width in box_sizes(sigma_y):
+            layer = _box_pass(layer, width, 0)
+    if sigma_x > 0:
+        for width in box_sizes(sigma_x):
+            layer = _box_pass(layer, width, 1)
+    return layer
+
+
+def offset(layer, dx, dy):
+    dx, dy = int(round(dx)), int(round(dy))
+    out = np.zeros_like(layer)
+    h, w = layer.shape[:2]
+    if abs(dx) >= w or abs(dy) >= h:
+        return out
+    out[max(0, dy):h + min(0, dy), max(0, dx):w + min(0, dx)] = \
+        layer[max(0, -dy):h - max(0, dy), max(0, -dx):w - max(0, dx)]
+    return out
+
+
+def flood(shape, attrs):
+    rgb = parse_color(attrs.get("flood-color", "black")) or (0.0, 0.0, 0.0)
+    alpha = float(attrs.get("flood-opacity", 1))
+    out = np.empty(shape, dtype=np.float32)
+    out[..., :3] = np.multiply(rgb, alpha)
+    out[..., 3] = alpha
+    return out
+
+
+def color_matrix(layer, attrs):
+    """feColorMatrix type="matrix" (the default), on unpremultiplied colors."""
+    kind = attrs.get("type", "matrix")
+    if kind != "matrix":
+        raise ValueError(f"unsupported feColorMatrix type: {kind}")
+    values = numbers(attrs.get("values")) or [1, 0, 0, 0, 0, 0, 1, 0, 0, 0,
+                                              0, 0, 1, 0, 0, 0, 0, 0, 1, 0]
+    matrix = np.array(values, dtype=np.float32).reshape(4, 5)
+    alpha = layer[..., 3:]
+    straight = np.where(alpha > 0, layer[..., :3] / np.maximum(alpha, 1e-12), 0.0)
+    rgba = np.concatenate([straight, alpha], axis=-1)
+    out = np.clip(rgba @ matrix[:, :4].T + matrix[:, 4], 0.0, 1.0).astype(np.float32)
+    out[..., :3] *= out[..., 3:]
+    return out
+
+
+def composite(top, bottom, operator="over"):
+    if operator == "over":
+        return top + bottom * (1 - top[..., 3:])
+    if operator == "in":
+        return top * bottom[..., 3:]
+    if operator == "out":
+        return top * (1 - bottom[..., 3:])
+    if operator == "atop":
+        return top * bottom[..., 3:] + bottom * (1 - top[..., 3:])
+    raise ValueError(f"unsupported feComposite operator: {operator}")
+
+
+# --- entry points ---
+
+@lru_cache(maxsize=8)
+def _parse_document(path, mtime_ns):
+    return ET.parse(path).getroot()
+
+
+def load_document(path):
+    """Parsed SVG root, re-read only when the file changes."""
+    return _parse_document(os.path.abspath(path), os.stat(path).st_mtime_ns)
+
+
+def view_box(root):
+    box = numbers(root.get("viewBox"))
+    if len(box) == 4:
+        return box
+    return [0.0, 0.0, fraction(root.get("width"), 1024.0), fraction(root.get("height"), 1024.0)]
+
+
+def render_svg(path, size=1024, box=None, pixel_scale=1, params=None):
+    """
+    Rasterize an SVG file at size x size (or the box=(left, top, right,
+    bottom) region of it). Lengths are all in SVG user units, so
+    pixel_scale and params are accepted for the renderer interface only.
+    RGB when the result is opaque, else RGBA.
+    """
+    root = load_document(path)
+    vx, vy, vw, vh = view_box(root)
+    rect = tuple(box) if box else (0, 0, size, size)
+    matrix = (size / vw, 0.0, 0.0, size / vh, -vx * size / vw, -vy * size / vh)
+    renderer = Renderer(root, size, rect)
+    surface = Surface(rect)
+    for child in root:
+        renderer.render(child, surface, matrix, dict(DEFAULT_STYLE))
+
+    pixels = surface.pixels
+    alpha = pixels[..., 3:]
+    if alpha.min() >= 1 - 1e-4:
+        return Image.fromarray(np.rint(np.clip(pixels[..., :3], 0, 1) * 255).astype(np.uint8),
+                               "RGB")
+    straight = np.where(alpha > 0, pixels[..., :3] / np.maximum(alpha, 1e-12), 0.0)
+    rgba = np.concatenate([straight, alpha], axis=-1)
+    return Image.fromarray(np.rint(np.clip(rgba, 0, 1) * 255).astype(np.uint8), "RGBA")
+
+
+def svg_renderer(name):
+    """Renderer function for one of the SVG_RENDERERS sources."""
+    return partial(render_svg, os.path.join(SCRIPT_DIR, SVG_RENDERERS[name]))
+
+
+def open_image(path, size=None):
+    """A raster image, or an SVG rasterized at size (default: its viewBox width)."""
+    if path.lower().endswith(".svg"):
+        return render_svg(path, size or int(view_box(load_document(path))[2]))
+    return Image.open(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", help="SVG file")
+    parser.add_argument("output", help="PNG file")
+    parser.add_argument("--size", type=int, default=1024)
+    args = parser.parse_args()
+
+    import time
+    start = time.perf_counter()
+    img = render_svg(args.input, args.size)
+    elapsed = time.perf_counter() - start
+    img.save(args.output, "PNG")
+    print(f"Saved: {args.output} ({img.width}x{img.height} {img.mode}, {elapsed:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Batch generator for the themed icon variants.
+Renders every renderer x theme in icon_params.THEMES (dark, tinted and
+seasonal alternates) in one process. All themes of one size are rendered
+back to back, so the layers that do not depend on colors - shield field,
+blurred glow, stroke coverage, gradient positions - are computed by the
+first theme and reused by the rest.
+"""
+
+import argparse
+import os
+import time
+
+from export_appiconset import get_renderer
+from icon_encode import save_png
+from icon_params import THEMES, themed_params
+from render_cache import DEFAULT_CACHE_DIR, RenderCache, render_key
+
+RENDERERS = ("checkkicks", "fullbleed")
+
+
+def render_theme(renderer, theme, size, box=None, pixel_scale=1):
+    """One renderer in one theme, as a PIL image."""
+    return get_renderer(renderer)(size, box, pixel_scale, params=themed_params(renderer, theme))
+
+
+def theme_output_path(output_dir, renderer, theme, size):
+    return os.path.join(output_dir, f"{renderer}-{theme}-{size}.png")
+
+
+def generate_themes(renderers, themes, sizes, output_dir, cache_dir=None):
+    """
+    Write every renderer x theme x size, theme-minor so the shared layers
+    stay in their caches. Returns one result record per output.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    cache = RenderCache(cache_dir) if cache_dir else None
+    results = []
+    for renderer in renderers:
+        for size in sorted(set(sizes), reverse=True):
+            for theme in themes:
+                params = themed_params(renderer, theme)
+                output_path = theme_output_path(output_dir, renderer, theme, size)
+                key = render_key(renderer, params, size=size)
+                start = rendered = time.perf_counter()
+                if cache and cache.is_fresh(output_path, key):
+                    status = "up to date"
+                elif cache and cache.restore(key, output_path):
+                    status = "from cache"
+                else:
+                    img = render_theme(renderer, theme, size)
+                    rendered = time.perf_counter()
+                    save_png(img, output_path, size)
+                    if cache:
+                        cache.put(key, output_path)
+                    status = "rendered"
+                if cache and status != "up to date":
+                    cache.record(output_path, key)
+                done = time.perf_counter()
+                results.append({"renderer": renderer, "theme": theme, "size": size,
+                                "path": output_path, "status": status,
+                                "render_seconds": rendered - start,
+                                "encode_seconds": done - rendered})
+                print(f"  {renderer:<11} {theme:<9} {size:>5}px  "
+                      f"render {rendered - start:6.3f}s  encode {done - rendered:6.3f}s  {status}")
+    if cache:
+        cache.save_manifest()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--renderers", default=",".join(RENDERERS),
+                        help="Comma-separated: " + ", ".join(RENDERERS))
+    parser.add_argument("--themes", default=",".join(THEMES),
+                        help="Comma-separated: " + ", ".join(THEMES))
+    parser.add_argument("--sizes", default="1024", help="Comma-separated pixel sizes")
+    parser.add_argument("--output-dir", default=os.path.join(os.getcwd(), "icon-themes"))
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="Render cache location")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-render and re-encode every variant")
+    args = parser.parse_args()
+
+    renderers = [r.strip() for r in args.renderers.split(",") if r.strip()]
+    themes = [t.strip() for t in args.themes.split(",") if t.strip()]
+    for renderer in renderers:
+        if renderer not in RENDERERS:
+            parser.error(f"unknown renderer: {renderer}")
+    for theme in themes:
+        if theme not in THEMES:
+            parser.error(f"unknown theme: {theme}")
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    print(f"Generating {len(renderers)} renderer(s) x {len(themes)} theme(s) x "
+          f"{len(sizes)} size(s) -> {args.output_dir}")
+    start = time.perf_counter()
+    results = generate_themes(renderers, themes, sizes, args.output_dir,
+                              None if args.no_cache else args.cache_dir)
+    rendered = sum(1 for result in results if result["status"] == "rendered")
+    print(f"Done! {len(results)} icons ({rendered} rendered) in "
+          f"{time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
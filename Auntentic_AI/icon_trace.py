@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Per-stage tracing for the icon pipeline.
+Code marks its stages with `with stage("name"):`. While tracing is off a
+stage is one global lookup returning a shared no-op context manager; while
+it is on, every stage becomes a Chrome trace / Perfetto complete event,
+optionally with tracemalloc allocation figures. Worker processes spool
+their events to a directory that the parent merges into one trace file
+and a summary table.
+"""
+
+from collections import defaultdict
+import argparse
+import contextlib
+import functools
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+# Set in the parent by start_session(), inherited by worker processes
+SPOOL_ENV = "ICON_TRACE_SPOOL"
+ALLOCATIONS_ENV = "ICON_TRACE_ALLOCATIONS"
+
+_NULL_STAGE = contextlib.nullcontext()
+_recorder = None
+
+
+class _Recorder:
+    """Collects complete ("X") events for this process."""
+
+    def __init__(self, allocations=False):
+        self.events = []
+        self.allocations = allocations
+        self.pid = os.getpid()
+        self._stack = []
+        if allocations:
+            import tracemalloc
+            self._tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    def _memory(self):
+        """Current traced bytes; the peak since the last call goes to the enclosing stage."""
+        current, peak = self._tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+        self._tracemalloc.reset_peak()
+        return current
+
+    @contextlib.contextmanager
+    def span(self, name, args):
+        if self.pid != os.getpid():
+            # Forked worker: the parent's events are the parent's to write
+            self.events = []
+            self.pid = os.getpid()
+        frame = {"before": 0, "peak": 0}
+        if self.allocations:
+            frame["before"] = frame["peak"] = self._memory()
+        self._stack.append(frame)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            if self.allocations:
+                current = self._memory()
+                self._stack.pop()
+                if self._stack:
+                    self._stack[-1]["peak"] = max(self._stack[-1]["peak"], frame["peak"])
+                args = dict(args, alloc_bytes=current - frame["before"],
+                            peak_alloc_bytes=frame["peak"] - frame["before"])
+            else:
+                self._stack.pop()
+            self.events.append({
+                "name": name,
+                "cat": "icon",
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": (end - start) / 1000,
+                "pid": self.pid,
+                "tid": threading.get_ident() % 100000,
+                "args": args,
+            })
+
+
+def enable(allocations=False):
+    """Start recording stages in this process."""
+    global _recorder
+    if _recorder is None:
+        _recorder = _Recorder(allocations)
+    return _recorder
+
+
+def disable():
+    """Stop recording and return the events recorded so far."""
+    global _recorder
+    events = _recorder.events if _recorder else []
+    _recorder = None
+    return events
+
+
+def stage(name, **args):
+    """Context manager timing one pipeline stage; a shared no-op while tracing is off."""
+    if _recorder is None:
+        return _NULL_STAGE
+    return _recorder.span(name, args)
+
+
+def traced(name=None):
+    """Decorator: record every call of a function as a stage."""
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return func(*args, **kwargs)
+            with _recorder.span(label, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def flush():
+    """
+    In a worker process of a tracing session, append the events recorded so
+    far to the session's spool directory. Workers call this after each job,
+    since pool processes exit without running atexit handlers.
+    """
+    spool = os.environ.get(SPOOL_ENV)
+    if _recorder is None or not spool or not _recorder.events:
+        return
+    with open(os.path.join(spool, f"{os.getpid()}.jsonl"), "a") as f:
+        for event in _recorder.events:
+            f.write(json.dumps(event) + "\n")
+    _recorder.events = []
+
+
+def start_session(allocations=False):
+    """Enable tracing here and in every worker process started from now on."""
+    os.environ[SPOOL_ENV] = tempfile.mkdtemp(prefix="icon-trace-")
+    os.environ[ALLOCATIONS_ENV] = "1" if allocations else ""
+    enable(allocations)
+
+
+def finish_session(output_path):
+    """
+    Merge this process's events with everything the workers spooled, write
+    the Chrome trace JSON and return the events.
+    """
+    events = disable()
+    spool = os.environ.pop(SPOOL_ENV, None)
+    os.environ.pop(ALLOCATIONS_ENV, None)
+    if spool:
+        for name in sorted(os.listdir(spool)):
+            with open(os.path.join(spool, name)) as f:
+                events.extend(json.loads(line) for line in f if line.strip())
+        shutil.rmtree(spool, ignore_errors=True)
+    write_trace(output_path, events)
+    return events
+
+
+def write_trace(output_path, events):
+    """Chrome trace / Perfetto JSON, loadable in chrome://tracing or ui.perfetto.dev."""
+    events = sorted(events, key=lambda event: event["ts"])
+    metadata = [{"name": "process_name", "ph": "M", "pid": pid,
+                 "args": {"name": f"icon worker {pid}"}}
+                for pid in sorted({event["pid"] for event in events})]
+    with open(output_path, "w") as f:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+
+
+def summarize(events):
+    """
+    Per stage name: calls, total / mean / max duration in ms, and the largest
+    peak allocation (bytes, None without allocation tracing). Sorted by total.
+    """
+    stats = defaultdict(lambda: {"calls": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                 "peak_alloc_bytes": None})
+    for event in events:
+        if event.get("ph") != "X":
+            continue
+        row = stats[event["name"]]
+        ms = event["dur"] / 1000
+        row["calls"] += 1
+        row["total_ms"] += ms
+        row["max_ms"] = max(row["max_ms"], ms)
+        peak = event.get("args", {}).get("peak_alloc_bytes")
+        if peak is not None:
+            row["peak_alloc_bytes"] = max(row["peak_alloc_bytes"] or 0, peak)
+    for row in stats.values():
+        row["mean_ms"] = row["total_ms"] / row["calls"]
+    return sorted(stats.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+
+
+def print_summary(events):
+    rows = summarize(events)
+    print(f"{'stage':<28} {'calls':>6} {'total ms':>10} {'mean ms':>9} "
+          f"{'max ms':>9} {'peak alloc':>11}")
+    for name, row in rows:
+        peak = row["peak_alloc_bytes"]
+        peak = f"{peak / (1024 * 1024):.1f} MB" if peak is not None else "-"
+        print(f"{name:<28} {row['calls']:>6} {row['total_ms']:>10.2f} "
+              f"{row['mean_ms']:>9.2f} {row['max_ms']:>9.2f} {peak:>11}")
+
+
+# Worker processes of a tracing session start recording on import
+if os.environ.get(SPOOL_ENV):
+    enable(bool(os.environ.get(ALLOCATIONS_ENV)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    render = subparsers.add_parser("render", help="Trace one render of a renderer")
+    render.add_argument("renderer", choices=["checkkicks", "fullbleed"])
+    render.add_argument("output", help="Chrome trace JSON")
+    render.add_argument("--size", type=int, default=1024)
+    render.add_argument("--allocations", action="store_true",
+                        help="Also record tracemalloc allocations per stage")
+    summary = subparsers.add_parser("summary", help="Summary table of a trace file")
+    summary.add_argument("trace")
+    args = parser.parse_args()
+
+    if args.command == "summary":
+        with open(args.trace) as f:
+            print_summary(json.load(f)["traceEvents"])
+        return
+
+    # Run as a script this module is __main__; the renderers record into
+    # the imported icon_trace module
+    import icon_trace
+    from export_appiconset import get_renderer
+    renderer = get_renderer(args.renderer)
+    icon_trace.enable(args.allocations)
+    renderer(args.size)
+    events = icon_trace.disable()
+    write_trace(args.output, events)
+    print_summary(events)
+    print(f"Trace: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
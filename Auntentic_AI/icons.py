@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Command-line entry point for the CheckKicks icon toolchain.
+Subcommands: render (draw an icon with a renderer, or rasterize one of
+the checked-in SVGs), fullbleed (convert a framed icon to full-bleed),
+export (write the AppIcon asset catalog), verify (check the exported
+PNGs), golden (golden-image regression tests) and bench (benchmark
+suite). Outputs are checked against the render cache manifest before any
+imaging code is imported, so an up-to-date build returns almost
+immediately.
+"""
+
+import argparse
+import os
+import struct
+import sys
+
+from icon_catalog import (DEFAULT_APPICONSET, SCRIPT_DIR, export_is_fresh, export_key,
+                          load_contents, pixel_size)
+from icon_params import THEMES, themed_params
+from render_cache import DEFAULT_CACHE_DIR, RenderCache, output_key, render_key
+
+# The svg-* renderers rasterize the checked-in SVG sources (icon_svg.py)
+RENDERERS = ("checkkicks", "fullbleed", "svg-source", "svg-fullbleed", "svg-new")
+
+# fullbleed --method -> batch_export variant
+FULLBLEED_METHODS = {
+    "auto": "fix_auto",
+    "borders": "fix_borders",
+    "v2": "fix_v2",
+    "v3": "fix_v3",
+    "final": "fix_final",
+}
+
+DEFAULT_OUTPUTS = {
+    "checkkicks": os.path.join(SCRIPT_DIR, "icon-1024.png"),
+    "fullbleed": os.path.join(SCRIPT_DIR, "app-icon-1024.png"),
+    "svg-source": os.path.join(SCRIPT_DIR, "AppIcon-source-1024.png"),
+    "svg-fullbleed": os.path.join(SCRIPT_DIR, "app-icon-fullbleed-svg-1024.png"),
+    "svg-new": os.path.join(SCRIPT_DIR, "app-icon-new-1024.png"),
+}
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# IHDR color types that carry an alpha channel
+ALPHA_COLOR_TYPES = {4: "gray + alpha", 6: "RGBA"}
+
+
+def _cache(args):
+    return None if args.no_cache else RenderCache(args.cache_dir)
+
+
+def _write_cached(cache, key, output_path, write):
+    """Restore output_path from the cache, or write() it and cache it."""
+    if cache and cache.restore(key, output_path):
+        status = "from cache"
+    else:
+        status = write(output_path)
+        if cache:
+            cache.put(key, output_path)
+    if cache:
+        cache.record(output_path, key)
+        cache.save_manifest()
+    return status
+
+
+def _encoded(produce, size):
+    """write() for _write_cached that encodes the image produce() returns."""
+    def write(output_path):
+        from icon_encode import format_report, save_png
+        return "rendered, " + format_report(save_png(produce(), output_path, size))
+    return write
+
+
+def _streamed(strips, size):
+    """write() for _write_cached that streams strips into the PNG."""
+    def write(output_path):
+        from icon_stream import stream_png
+        written = stream_png(strips(), output_path, size, size)
+        return f"streamed, {written:,} bytes"
+    return write
+
+
+def cmd_render(args):
+    try:
+        params = themed_params(args.renderer, args.theme)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    output = args.output or DEFAULT_OUTPUTS[args.renderer]
+    key = render_key(args.renderer, params, size=args.size, supersample=args.supersample)
+    cache = _cache(args)
+    if cache and cache.is_fresh(output, key):
+        print(f"{output}: up to date")
+        return 0
+    if (args.supersample > 1 or args.stream) and args.theme != "default":
+        raise SystemExit("--supersample and --stream only render the default theme")
+
+    def produce():
+        if args.supersample > 1:
+            from icon_supersample import render_supersampled
+            return render_supersampled(args.renderer, args.size, args.supersample, args.workers)
+        from icon_themes import render_theme
+        return render_theme(args.renderer, args.theme, args.size)
+
+    def strips():
+        from icon_stream import render_strips
+        return render_strips(args.renderer, args.size, args.supersample)
+
+    write = _streamed(strips, args.size) if args.stream else _encoded(produce, args.size)
+    print(f"{output}: {_write_cached(cache, key, output, write)}")
+    return 0
+
+
+def cmd_fullbleed(args):
+    if not os.path.isfile(args.input):
+        print(f"Error: Input file not found: {args.input}")
+        return 1
+    if args.stream and not args.size:
+        raise SystemExit("--stream needs --size")
+    variant = FULLBLEED_METHODS[args.method]
+    output = args.output or os.path.splitext(args.input)[0] + "-fullbleed.png"
+    key = render_key(variant, None, args.input, size=args.size)
+    cache = _cache(args)
+    if cache and cache.is_fresh(output, key):
+        print(f"{output}: up to date")
+        return 0
+
+    def transformed():
+        from batch_export import get_transform
+        return get_transform(variant)(args.input, None)
+
+    def produce():
+        from PIL import Image
+        img = transformed()
+        if args.size and img.size != (args.size, args.size):
+            img = img.convert("RGB").resize((args.size, args.size), Image.Resampling.LANCZOS)
+        return img
+
+    def strips():
+        # Transform at the source resolution, then upscale strip by strip
+        from icon_stream import resize_strips
+        return resize_strips(transformed().convert("RGB"), args.size)
+
+    write = _streamed(strips, args.size) if args.stream else _encoded(produce, args.size)
+    print(f"{output}: {_write_cached(cache, key, output, write)}")
+    return 0
+
+
+def cmd_export(args):
+    contents = load_contents(args.appiconset)
+    key = export_key(contents, args.renderer, args.source, args.supersample)
+    cache = _cache(args)
+    if cache and export_is_fresh(args.appiconset, contents, cache, key):
+        print(f"{args.appiconset}: {len(contents['images'])} icons up to date")
+        return 0
+
+    from export_appiconset import export_appiconset, master_loader
+    master = master_loader(contents, args.renderer, args.source, args.supersample, args.workers)
+    print(f"Exporting to: {args.appiconset}")
+    written = export_appiconset(master, args.appiconset, contents, cache, key)
+    rendered = sum(1 for _, _, status in written if status.startswith("rendered"))
+    print(f"Done! {len(written)} icons ({rendered} rendered), Contents.json up to date.")
+    return 0
+
+
+def png_header(path):
+    """(width, height, bit depth, color type) from a PNG's IHDR chunk, without decoding."""
+    with open(path, "rb") as f:
+        head = f.read(33)
+    if len(head) < 33 or head[:8] != PNG_SIGNATURE or head[12:16] != b"IHDR":
+        raise ValueError("not a PNG file")
+    width, height, depth, color_type = struct.unpack(">IIBB", head[16:26])
+    return width, height, depth, color_type
+
+
+def verify_catalog(appiconset_dir, cache=None, key=None):
+    """
+    Problems with the exported asset catalog, as (filename, message) pairs:
+    missing files, wrong pixel sizes, alpha channels (rejected by App Store
+    Connect) and, given a cache and export key, files that are out of date.
+    """
+    contents = load_contents(appiconset_dir)
+    problems = []
+    for entry in contents["images"]:
+        size = pixel_size(entry)
+        filename = entry.get("filename")
+        if not filename:
+            problems.append((entry["size"], "no filename in Contents.json"))
+            continue
+        path = os.path.join(appiconset_dir, filename)
+        if not os.path.isfile(path):
+            problems.append((filename, "missing"))
+            continue
+        try:
+            width, height, _, color_type = png_header(path)
+        except ValueError as exc:
+            problems.append((filename, str(exc)))
+            continue
+        if (width, height) != (size, size):
+            problems.append((filename, f"is {width}x{height}, expected {size}x{size}"))
+        if color_type in ALPHA_COLOR_TYPES:
+            problems.append((filename, f"has an alpha channel ({ALPHA_COLOR_TYPES[color_type]})"))
+        if cache and key and not cache.is_fresh(path, output_key(key, size=size)):
+            problems.append((filename, "out of date with the renderer"))
+    return problems
+
+
+def cmd_verify(args):
+    contents = load_contents(args.appiconset)
+    key = None
+    if args.check_fresh:
+        key = export_key(contents, args.renderer, args.source, args.supersample)
+    problems = verify_catalog(args.appiconset, RenderCache(args.cache_dir), key)
+    for filename, message in problems:
+        print(f"  {filename}: {message}")
+    if problems:
+        print(f"{len(problems)} problem(s) in {args.appiconset}")
+        return 1
+    print(f"{args.appiconset}: {len(contents['images'])} icons OK")
+    return 0
+
+
+# Subcommands that hand all their arguments to another script's main()
+PASSTHROUGH = {
+    "bench": ("bench_icons", "Run the benchmark suite (bench_icons.py)"),
+    "golden": ("icon_golden", "Compare renders with the golden images (icon_golden.py)"),
+}
+
+
+def cmd_passthrough(args):
+    module = __import__(PASSTHROUGH[args.command][0])
+    sys.argv = [module.__name__ + ".py"] + args.passthrough_args
+    module.main()
+    return 0
+
+
+def add_cache_arguments(parser):
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Render cache location")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore the cache and always render and encode")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    render = subparsers.add_parser("render", help="Render an icon with a renderer")
+    render.add_argument("renderer", choices=RENDERERS)
+    render.add_argument("-o", "--output", help="Output PNG (default: next to this script)")
+    render.add_argument("--size", type=int, default=1024)
+    render.add_argument("--theme", choices=list(THEMES), default="default")
+    render.add_argument("--supersample", type=int, default=1,
+                        help="Tile-based NxN supersampling")
+    render.add_argument("--workers", type=int, default=1, help="Processes for supersampled tiles")
+    render.add_argument("--stream", action="store_true",
+                        help="Render in strips straight into the PNG (4096-8192 px assets)")
+    add_cache_arguments(render)
+    render.set_defaults(func=cmd_render)
+
+    fullbleed = subparsers.add_parser("fullbleed", help="Convert a framed icon to full-bleed")
+    fullbleed.add_argument("input")
+    fullbleed.add_argument("output", nargs="?", help="Output PNG (default: <input>-fullbleed.png)")
+    fullbleed.add_argument("--method", choices=list(FULLBLEED_METHODS), default="auto",
+                           help="auto detects the frame; the others are the fix_icon_* scripts")
+    fullbleed.add_argument("--size", type=int, help="Output edge in pixels")
+    fullbleed.add_argument("--stream", action="store_true",
+                           help="Upscale to --size in strips straight into the PNG")
+    add_cache_arguments(fullbleed)
+    fullbleed.set_defaults(func=cmd_fullbleed)
+
+    for name, help_text in (("export", "Write every size of the AppIcon asset catalog"),
+                            ("verify", "Check the exported asset catalog PNGs")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--appiconset", default=DEFAULT_APPICONSET,
+                         help="Path to AppIcon.appiconset")
+        sub.add_argument("--renderer", choices=RENDERERS, default="fullbleed",
+                         help="Renderer of the master (ignored with --source)")
+        sub.add_argument("--source", help="Master image (PNG or SVG) to export instead of rendering")
+        sub.add_argument("--supersample", type=int, default=1,
+                         help="NxN supersampling of the master (verify: as it was exported)")
+        if name == "export":
+            sub.add_argument("--workers", type=int, default=1,
+                             help="Processes for supersampled tiles")
+            add_cache_arguments(sub)
+            sub.set_defaults(func=cmd_export)
+        else:
+            sub.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                             help="Render cache location")
+            sub.add_argument("--check-fresh", action="store_true",
+                             help="Also fail on icons the renderer would now draw differently")
+            sub.set_defaults(func=cmd_verify)
+
+    # Everything after these goes to their script, including --help
+    for name, (_, help_text) in PASSTHROUGH.items():
+        sub = subparsers.add_parser(name, help=help_text, add_help=False)
+        sub.set_defaults(func=cmd_passthrough)
+
+    args, extra = parser.parse_known_args()
+    if args.command in PASSTHROUGH:
+        args.passthrough_args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+Perceptual-hash index that maps resubmitted photo sets to cached results.
+A retry of the same six photos after a timeout should not cost another
+authenticate-sneaker model call. Each photo gets a 64-bit pHash (sign of
+the low 8x8 DCT coefficients of a 32x32 luma copy, one matrix product for
+the whole batch). The index stores hashes in .npy arrays that are memory
+mapped on open, and finds every hash within a Hamming radius by multi-index
+hashing: the hash is cut into four 16-bit chunks, and any hash within r
+bits matches at least one chunk within r // 4 bits, so a lookup is a few
+binary searches in sorted chunk tables plus a popcount over the candidates.
+Sets are indexed by their first photo and match when every slot is within
+MATCH_DISTANCE of the stored set.
+Results expire after a TTL and the least recently used ones are evicted,
+like the render cache.
+"""
+
+from PIL import Image, ImageOps
+from contextlib import contextmanager
+from functools import lru_cache
+import argparse
+import fcntl
+import hashlib
+import io
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from photo_preprocess import draft_size
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INDEX_DIR = os.path.join(SCRIPT_DIR, ".photo-index")
+
+# pHash: DCT of a HASH_INPUT x HASH_INPUT luma copy, low HASH_SIZE x HASH_SIZE terms
+HASH_INPUT = 32
+HASH_SIZE = 8
+
+# Bits out of 64 two photos of the same retry may differ by (re-encoding, resizing)
+MATCH_DISTANCE = 6
+
+# Multi-index hashing: 64-bit hashes as CHUNKS chunks of 16 bits
+CHUNKS = 4
+CHUNK_BITS = 64 // CHUNKS
+
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_SETS = 1_000_000
+
+# Arrays of one index generation: every photo's hash, sets as contiguous runs
+# of them, and each set's first hash, which the multi-index is built over
+ARRAYS = ("hashes", "set_first", "set_keys", "set_start", "set_count", "set_created")
+
+_BYTE_BITS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(values):
+    """Set bits of every uint64 in an array."""
+    values = np.asarray(values, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    octets = np.ascontiguousarray(values).reshape(-1).view(np.uint8)
+    return _BYTE_BITS[octets].reshape(values.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+# --- hashing ---
+
+def hash_luma(data):
+    """HASH_INPUT x HASH_INPUT float32 luma of an encoded photo, decoded in draft mode."""
+    img = Image.open(io.BytesIO(data))
+    if img.format == "JPEG":
+        img.draft("L", draft_size(img.size, HASH_INPUT * 4))
+    img = ImageOps.exif_transpose(img).convert("L")
+    img = img.resize((HASH_INPUT, HASH_INPUT), Image.Resampling.BOX)
+    return np.asarray(img, dtype=np.float32)
+
+
+@lru_cache(maxsize=None)
+def _dct_rows(n=HASH_INPUT, keep=HASH_SIZE):
+    """The first keep rows of the orthonormal DCT-II matrix of size n."""
+    k = np.arange(keep)[:, None]
+    x = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    matrix = matrix.astype(np.float32)
+    matrix.flags.writeable = False
+    return matrix
+
+
+def phash(lumas):
+    """
+    64-bit pHashes of a batch of luma copies (N, HASH_INPUT, HASH_INPUT):
+    bit i is set where low-frequency DCT term i is above the median of
+    the terms other than DC.
+    """
+    dct = _dct_rows()
+    terms = np.einsum("ki,nij,lj->nkl", dct, np.asarray(lumas, dtype=np.float32), dct)
+    terms = terms.reshape(len(terms), -1)
+    median = np.median(terms[:, 1:], axis=1, keepdims=True)
+    bits = np.packbits(terms > median, axis=1)
+    return bits.view(">u8").ravel().astype(np.uint64)
+
+
+def hash_photos(photos):
+    """pHashes (uint64 array) of encoded photos, in order."""
+    if not photos:
+        return np.zeros(0, dtype=np.uint64)
+    return phash(np.stack([hash_luma(data) for data in photos]))
+
+
+# --- index ---
+
+@lru_cache(maxsize=None)
+def _flip_masks(bits=CHUNK_BITS, radius=1):
+    """XOR masks of every chunk value within radius bits, including 0."""
+    masks = [0]
+    for r in range(1, radius + 1):
+        for positions in itertools.combinations(range(bits), r):
+            masks.append(sum(1 << p for p in positions))
+    return np.array(masks, dtype=np.uint16)
+
+
+def chunk_keys(hashes, chunk):
+    return ((np.asarray(hashes, dtype=np.uint64) >> np.uint64(chunk * CHUNK_BITS))
+            & np.uint64(0xFFFF)).astype(np.uint16)
+
+
+class MultiIndex:
+    """
+    Hamming-radius search over uint64 hashes. Per chunk, the row order
+    sorted by that chunk's 16 bits and the sorted chunk values themselves;
+    both are plain arrays, so they can come from memory-mapped files.
+    """
+
+    def __init__(self, hashes, orders=None, sorted_keys=None):
+        self.hashes = hashes
+        if orders is None:
+            orders, sorted_keys = [], []
+            for chunk in range(CHUNKS):
+                keys = chunk_keys(hashes, chunk)
+                order = np.argsort(keys, kind="stable").astype(np.uint32)
+                orders.append(order)
+                sorted_keys.append(keys[order])
+        self.orders = orders
+        self.sorted_keys = sorted_keys
+
+    def search(self, value, radius=MATCH_DISTANCE):
+        """Rows whose hash is within radius bits of value, as (rows, distances)."""
+        value = np.uint64(value)
+        masks = _flip_masks(CHUNK_BITS, radius // CHUNKS)
+        candidates = []
+        for chunk in range(CHUNKS):
+            probes = chunk_keys(value, chunk) ^ masks
+            lo = np.searchsorted(self.sorted_keys[chunk], probes, side="left")
+            hi = np.searchsorted(self.sorted_keys[chunk], probes, side="right")
+            counts = hi - lo
+            total = int(counts.sum())
+            if total:
+                # Every index in each [lo, hi) run, without a Python loop over probes
+                starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+                candidates.append(self.orders[chunk][starts + np.arange(total)])
+        if not candidates:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint8)
+        rows = np.unique(np.concatenate(candidates)).astype(np.int64)
+        distances = popcount(np.asarray(self.hashes)[rows] ^ value)
+        keep = distances <= radius
+        return rows[keep], distances[keep]
+
+
+class PhotoSetIndex:
+    """
+    Cached analysis results keyed by photo sets, found by perceptual hash.
+    On disk: index_dir/CURRENT names the live generation directory of .npy
+    arrays (written whole by save()), and index_dir/results holds one JSON
+    file per set whose mtime is its recency. add() keeps new sets in memory
+    until save().
+    """
+
+    def __init__(self, index_dir=DEFAULT_INDEX_DIR, ttl=DEFAULT_TTL, max_sets=DEFAULT_MAX_SETS,
+                 distance=MATCH_DISTANCE):
+        self.index_dir = index_dir
+        self.results_dir = os.path.join(index_dir, "results")
+        self.ttl = ttl
+        self.max_sets = max_sets
+        self.distance = distance
+        self.pending = []
+        self._load()
+
+    # --- storage ---
+
+    def _generation(self):
+        try:
+            with open(os.path.join(self.index_dir, "CURRENT")) as f:
+                return os.path.join(self.index_dir, f.read().strip())
+        except FileNotFoundError:
+            return None
+
+    def _load(self, attempts=3):
+        self.arrays = {}
+        self.index = None
+        for attempt in range(attempts):
+            generation = self._generation()
+            if generation is None:
+                return
+            try:
+                arrays = {name: np.load(os.path.join(generation, name + ".npy"), mmap_mode="r")
+                          for name in ARRAYS}
+                orders = [np.load(os.path.join(generation, f"order{c}.npy"), mmap_mode="r")
+                          for c in range(CHUNKS)]
+                sorted_keys = [np.load(os.path.join(generation, f"keys{c}.npy"), mmap_mode="r")
+                               for c in range(CHUNKS)]
+            except FileNotFoundError:
+                # Another writer's save() replaced this generation meanwhile
+                if attempt == attempts - 1:
+                    raise
+                continue
+            self.arrays = arrays
+            self.index = MultiIndex(arrays["set_first"], orders, sorted_keys)
+            return
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock on the index directory, held by save() across processes."""
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(os.path.join(self.index_dir, "LOCK"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def result_path(self, key):
+        return os.path.join(self.results_dir, f"{key:016x}.json")
+
+    # --- lookup ---
+
+    def _match_stored(self, hashes, now):
+        """Key of a live stored set matching hashes, or None."""
+        if self.index is None:
+            return None
+        positions, _ = self.index.search(hashes[0], self.distance)
+        for position in positions:
+            start = int(self.arrays["set_start"][position])
+            count = int(self.arrays["set_count"][position])
+            if count != len(hashes):
+                continue
+            if now - float(self.arrays["set_created"][position]) > self.ttl:
+                continue
+            stored = np.asarray(self.arrays["hashes"][start:start + count])
+            if popcount(stored ^ hashes).max() <= self.distance:
+                return int(self.arrays["set_keys"][position])
+        return None
+
+    def _match_pending(self, hashes, now):
+        for key, stored, created in self.pending:
+            if (len(stored) == len(hashes) and now - created <= self.ttl
+                    and popcount(stored ^ hashes).max() <= self.distance):
+                return key
+        return None
+
+    def lookup(self, hashes):
+        """The cached result for a photo set (pHashes in slot order), or None."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if not len(hashes):
+            return None
+        now = time.time()
+        key = self._match_pending(hashes, now)
+        if key is None:
+            key = self._match_stored(hashes, now)
+        if key is None:
+            return None
+        path = self.result_path(key)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            return None  # evicted
+        return result
+
+    def add(self, hashes, result):
+        """
+        Cache result for a photo set. Searchable at once, stored on save().
+        The key is a hash of the set's pHashes and a random nonce, so
+        writers sharing the index never hand out the same one.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        os.makedirs(self.results_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.results_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(result, f)
+            while True:
+                digest = hashlib.blake2b(hashes.tobytes() + os.urandom(8), digest_size=8)
+                key = int.from_bytes(digest.digest(), "big")
+                # link() fails if the name exists, like O_EXCL, and the file
+                # appears complete: an existing result is never overwritten
+                try:
+                    os.link(tmp, self.result_path(key))
+                    break
+                except FileExistsError:
+                    continue
+        finally:
+            os.remove(tmp)
+        self.pending.append((key, hashes, time.time()))
+        return key
+
+    # --- maintenance ---
+
+    def evict(self):
+        """
+        Delete result files past the TTL, then the least recently used ones
+        beyond max_sets. Returns the keys still cached. A file of a set this
+        index does not know is another writer's unsaved add(), kept until
+        it is older than the TTL.
+        """
+        entries = []
+        if os.path.isdir(self.results_dir):
+            for entry in os.scandir(self.results_dir):
+                if entry.name.endswith(".json"):
+                    entries.append((entry.stat().st_mtime, int(entry.name[:-5], 16), entry.path))
+        created = dict(zip(np.asarray(self.arrays.get("set_keys", [])).tolist(),
+                           np.asarray(self.arrays.get("set_created", [])).tolist()))
+        created.update((key, stamp) for key, _, stamp in self.pending)
+        now = time.time()
+        live = []
+        for mtime, key, path in entries:
+            if now - created.get(key, mtime) <= self.ttl:
+                live.append((mtime, key, path))
+            else:
+                os.remove(path)
+        live.sort(reverse=True)
+        for _, _, path in live[self.max_sets:]:
+            os.remove(path)
+        return {key for _, key, _ in live[:self.max_sets]}
+
+    def save(self):
+        """
+        Under the index lock: re-read the current generation (another
+        writer may have saved since this one was opened), evict, then write
+        a new generation holding every live set, stored and pending, with
+        freshly sorted chunk tables, and switch CURRENT to it.
+        """
+        with self._locked():
+            self._load()
+            return self._save_generation()
+
+    def _save_generation(self):
+        keep = self.evict()
+        sets = []
+        if self.arrays:
+            hashes = np.asarray(self.arrays["hashes"])
+            for position, key in enumerate(np.asarray(self.arrays["set_keys"]).tolist()):
+                if key in keep:
+                    start = int(self.arrays["set_start"][position])
+                    count = int(self.arrays["set_count"][position])
+                    sets.append((key, hashes[start:start + count],
+                                 float(self.arrays["set_created"][position])))
+        sets += [entry for entry in self.pending if entry[0] in keep]
+
+        counts = np.array([len(h) for _, h, _ in sets], dtype=np.uint8)
+        arrays = {
+            "hashes": (np.concatenate([h for _, h, _ in sets]) if sets
+                       else np.zeros(0, dtype=np.uint64)),
+            "set_first": np.array([h[0] for _, h, _ in sets], dtype=np.uint64),
+            "set_keys": np.array([k for k, _, _ in sets], dtype=np.uint64),
+            "set_start": (np.cumsum(counts, dtype=np.uint32) - counts).astype(np.uint32),
+            "set_count": counts,
+            "set_created": np.array([c for _, _, c in sets], dtype=np.float64),
+        }
+        index = MultiIndex(arrays["set_first"])
+
+        name = f"gen-{time.time_ns():x}-{os.getpid()}"
+        generation = os.path.join(self.index_dir, name)
+        os.makedirs(generation)
+        for array_name, values in arrays.items():
+            np.save(os.path.join(generation, array_name + ".npy"), values)
+        for chunk in range(CHUNKS):
+            np.save(os.path.join(generation, f"order{chunk}.npy"), index.orders[chunk])
+            np.save(os.path.join(generation, f"keys{chunk}.npy"), index.sorted_keys[chunk])
+        with open(os.path.join(generation, "meta.json"), "w") as f:
+            json.dump({"sets": len(sets)}, f)
+
+        previous = self._generation()
+        current = os.path.join(self.index_dir, "CURRENT")
+        with open(current + ".tmp", "w") as f:
+            f.write(name)
+        os.replace(current + ".tmp", current)
+        if previous and os.path.abspath(previous) != os.path.abspath(generation):
+            shutil.rmtree(previous, ignore_errors=True)
+        self.pending = []
+        self._load()
+        return len(sets)
+
+
+def _read_photos(paths):
+    photos = []
+    for path in paths:
+        with open(path, "rb") as f:
+            photos.append(f.read())
+    return photos
+
+
+def cmd_hash(args):
+    for path, value in zip(args.photos, hash_photos(_read_photos(args.photos))):
+        print(f"{int(value):016x}  {path}")
+    return 0
+
+
+def cmd_lookup(args):
+    index = PhotoSetIndex(args.index_dir, args.ttl)
+    hashes = hash_photos(_read_photos(args.photos))
+    start = time.perf_counter()
+    result = index.lookup(hashes)
+    elapsed = 1000 * (time.perf_counter() - start)
+    if result is None:
+        print(f"miss ({elapsed:.3f} ms)")
+        return 1
+    print(json.dumps(result, indent=2))
+    print(f"hit ({elapsed:.3f} ms)", file=sys.stderr)
+    return 0
+
+
+def cmd_add(args):
+    index = PhotoSetIndex(args.index_dir, args.ttl, args.max_sets)
+    with open(args.result) as f:
+        result = json.load(f)
+    key = index.add(hash_photos(_read_photos(args.photos)), result)
+    print(f"Added set {key:016x}; index holds {index.save()} sets")
+    return 0
+
+
+def cmd_bench(args):
+    """Random sets plus perturbed copies of some of them, timed against a fresh index."""
+    rng = np.random.default_rng(0)
+    # Never the live index: bench would evict and rewrite its generation
+    index_dir = args.index_dir or tempfile.mkdtemp(prefix="photo-index-bench-")
+    try:
+        return _bench(args, rng, index_dir)
+    finally:
+        if not args.index_dir:
+            shutil.rmtree(index_dir, ignore_errors=True)
+
+
+def _bench(args, rng, index_dir):
+    index = PhotoSetIndex(index_dir, max_sets=args.sets + 1)
+    hashes = rng.integers(0, 2 ** 63, size=(args.sets, 6), dtype=np.uint64) * np.uint64(2) \
+        + rng.integers(0, 2, size=(args.sets, 6), dtype=np.uint64)
+    start = time.perf_counter()
+    for row in hashes:
+        index.add(row, {})
+    index.save()
+    print(f"Built {args.sets:,} sets ({6 * args.sets:,} photos) in "
+          f"{time.perf_counter() - start:.1f}s")
+
+    index = PhotoSetIndex(index_dir)
+    queries = hashes[rng.integers(0, args.sets, size=args.queries)].copy()
+    # Flip up to MATCH_DISTANCE random bits per photo, like a re-encoded retry
+    for _ in range(MATCH_DISTANCE):
+        bits = rng.integers(0, 64, size=queries.shape).astype(np.uint64)
+        queries ^= np.where(rng.random(queries.shape) < 0.5, np.uint64(1) << bits, np.uint64(0))
+    misses = rng.integers(0, 2 ** 63, size=(args.queries, 6), dtype=np.uint64)
+
+    for label, batch in (("near-duplicate", queries), ("new set", misses)):
+        timings, hits = [], 0
+        for query in batch:
+            start = time.perf_counter()
+            hits += index.lookup(query) is not None
+            timings.append(1000 * (time.perf_counter() - start))
+        timings = np.sort(timings)
+        print(f"  {label:15} {hits:>6}/{len(batch)} hits  "
+              f"p50 {timings[len(timings) // 2]:.3f} ms  p99 {timings[int(len(timings) * 0.99)]:.3f} ms")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--index-dir",
+                        help=f"Index location (default: {DEFAULT_INDEX_DIR}; bench: a temporary one)")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL, help="Seconds a result stays valid")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sub = subparsers.add_parser("hash", help="Print the pHash of each photo")
+    sub.add_argument("photos", nargs="+")
+    sub.set_defaults(func=cmd_hash)
+
+    sub = subparsers.add_parser("lookup", help="Print the cached result of a photo set")
+    sub.add_argument("photos", nargs="+", help="Photo files, in slot order")
+    sub.set_defaults(func=cmd_lookup)
+
+    sub = subparsers.add_parser("add", help="Cache a result for a photo set")
+    sub.add_argument("photos", nargs="+", help="Photo files, in slot order")
+    sub.add_argument("--result", required=True, help="Analysis result JSON file")
+    sub.add_argument("--max-sets", type=int, default=DEFAULT_MAX_SETS)
+    sub.set_defaults(func=cmd_add)
+
+    sub = subparsers.add_parser("bench", help="Time lookups in a synthetic index")
+    sub.add_argument("--sets", type=int, default=200_000)
+    sub.add_argument("--queries", type=int, default=2000)
+    sub.set_defaults(func=cmd_bench)
+
+    args = parser.parse_args()
+    if args.command != "bench" and not args.index_dir:
+        args.index_dir = DEFAULT_INDEX_DIR
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
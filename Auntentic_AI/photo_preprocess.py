@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Shrink authentication photos before they are sent to the analysis model.
+authenticate-sneaker's imageUrlToBase64 ships each full-resolution phone
+photo as-is. Here every photo is decoded in JPEG draft mode (the decoder's
+DCT scaling hands back a 1/2, 1/4 or 1/8 size image at a fraction of the
+work), rotated upright from its EXIF orientation, resized to the model's
+long edge with Lanczos and re-encoded as a JPEG without EXIF. The six
+photos of a submission go through a process pool in parallel.
+"""
+
+from PIL import Image, ImageOps
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import io
+import math
+import os
+import time
+
+# Long edge the model works at: Claude downsizes anything larger to ~1568 px
+DEFAULT_LONG_EDGE = 1568
+DEFAULT_QUALITY = 85
+
+# Formats the model takes as they are, so a small photo can go out unchanged
+PASSTHROUGH_FORMATS = ("JPEG", "PNG", "WEBP", "GIF")
+
+
+def draft_size(size, long_edge):
+    """The smallest size draft() may decode to so that the long edge still reaches long_edge."""
+    scale = long_edge / max(size)
+    return math.ceil(size[0] * scale), math.ceil(size[1] * scale)
+
+
+def has_metadata(img):
+    """Whether an opened image carries EXIF or XMP (GPS, device, time) that must not go out."""
+    return bool(img.getexif()) or any(key in img.info for key in ("exif", "xmp", "XML:com.adobe.xmp"))
+
+
+def preprocess_photo(data, long_edge=DEFAULT_LONG_EDGE, quality=DEFAULT_QUALITY):
+    """
+    Downscale one encoded photo. Returns (encoded bytes, report) where
+    report has the source and output sizes, the draft scale, bytes in/out,
+    ms and whether the original was kept. Photos already within long_edge
+    are re-encoded without resizing, unless they carry no metadata and
+    re-encoding would not make them smaller: those go out as they are.
+    """
+    start = time.perf_counter()
+    img = Image.open(io.BytesIO(data))
+    source_size = img.size
+    source_format = img.format
+    icc_profile = img.info.get("icc_profile")
+    keepable = (source_format in PASSTHROUGH_FORMATS and max(source_size) <= long_edge
+                and not has_metadata(img))
+
+    # Orientation only matters after decoding, and draft keeps the EXIF
+    if img.format == "JPEG" and max(source_size) > long_edge:
+        img.draft("RGB", draft_size(source_size, long_edge))
+    decoded_size = img.size
+    img = ImageOps.exif_transpose(img)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+
+    scale = long_edge / max(img.size)
+    if scale < 1:
+        size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        img = img.resize(size, Image.Resampling.LANCZOS)
+
+    # No exif= argument: the re-encoded file carries no EXIF (GPS, device, time)
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=quality, icc_profile=icc_profile)
+    encoded = out.getvalue()
+    kept = keepable and len(encoded) >= len(data)
+    if kept:
+        encoded = data
+    return encoded, {
+        "source_size": source_size,
+        "draft_scale": source_size[0] // decoded_size[0],
+        "size": img.size,
+        "bytes_in": len(data),
+        "bytes_out": len(encoded),
+        "ms": 1000 * (time.perf_counter() - start),
+        "kept_original": kept,
+    }
+
+
+def _preprocess_job(job):
+    return preprocess_photo(*job)
+
+
+def preprocess_photos(photos, long_edge=DEFAULT_LONG_EDGE, quality=DEFAULT_QUALITY, workers=1):
+    """
+    Downscale a submission's photos (encoded bytes), in order. With workers
+    > 1 they are spread over a process pool, one photo per job.
+    """
+    jobs = [(data, long_edge, quality) for data in photos]
+    if workers <= 1 or len(jobs) <= 1:
+        return [_preprocess_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+        return list(executor.map(_preprocess_job, jobs))
+
+
+def format_report(name, report):
+    return (f"  {name:24} {report['source_size'][0]:>5}x{report['source_size'][1]:<5} "
+            f"(draft 1/{report['draft_scale']}) -> {report['size'][0]:>4}x{report['size'][1]:<4} "
+            f"{report['bytes_in']:>11,} -> {report['bytes_out']:>9,} bytes "
+            f"({report['bytes_out'] / report['bytes_in']:6.1%})  {report['ms']:7.1f} ms"
+            + ("  original kept" if report["kept_original"] else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("photos", nargs="+", help="Photo files, in slot order")
+    parser.add_argument("--output-dir", help="Write the processed JPEGs here")
+    parser.add_argument("--long-edge", type=int, default=DEFAULT_LONG_EDGE)
+    parser.add_argument("--quality", type=int, default=DEFAULT_QUALITY, help="JPEG quality")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    photos = []
+    for path in args.photos:
+        with open(path, "rb") as f:
+            photos.append(f.read())
+
+    start = time.perf_counter()
+    results = preprocess_photos(photos, args.long_edge, args.quality, args.workers)
+    elapsed = time.perf_counter() - start
+
+    for path, (encoded, report) in zip(args.photos, results):
+        print(format_report(os.path.basename(path)[:24], report))
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+            stem, extension = os.path.splitext(os.path.basename(path))
+            name = stem + (extension if report["kept_original"] else ".jpg")
+            with open(os.path.join(args.output_dir, name), "wb") as f:
+                f.write(encoded)
+
+    bytes_in = sum(len(data) for data in photos)
+    bytes_out = sum(len(encoded) for encoded, _ in results)
+    print(f"Done! {len(photos)} photos, {bytes_in:,} -> {bytes_out:,} bytes "
+          f"({bytes_out / bytes_in:.1%}) in {1000 * elapsed:.1f} ms "
+          f"with {args.workers} worker(s)")
+
+
+if __name__ == "__main__":
+    main()
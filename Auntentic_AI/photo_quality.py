@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Local quality prefilter for the six authentication photos.
+Rejects what authenticate-sneaker would otherwise pay a model call to
+report: black, white or blank frames, photos too dark or blown out to
+read and photos too blurry to analyze. Each photo is decoded in JPEG draft
+mode straight to a small grayscale copy; exposure comes from its histogram,
+sharpness from the variance of its Laplacian. Results use the model's
+perImageValidations shape (photoIndex, photoType, isValid, invalidReason,
+qualityScore). Whether a photo shows footwear at all is left to the model.
+--calibrate blurs sharp photos by known amounts and prints what the
+checks make of them, to re-check the blur thresholds on real photos.
+"""
+
+from PIL import Image, ImageFilter, ImageOps
+import argparse
+import io
+import json
+import sys
+import time
+
+import numpy as np
+
+from photo_preprocess import DEFAULT_LONG_EDGE as MODEL_EDGE, draft_size
+
+# Slots in upload order, as named in the edge function's schema
+PHOTO_TYPES = ("Outer Side", "Inner Side", "Size Tag", "Sole View", "Tongue Label", "Heel Detail")
+
+# Long edge of the grayscale copy the checks run on
+ANALYSIS_EDGE = 320
+
+# Luma standard deviation below which a frame is one flat color
+CONSTANT_STD = 4.0
+
+# Histogram: luma <= DARK_LEVEL is crushed black, >= BRIGHT_LEVEL blown white
+DARK_LEVEL = 16
+BRIGHT_LEVEL = 240
+
+# Share of crushed or blown pixels that leaves too little to analyze
+CLIPPED_REJECT = 0.85
+
+# Mean luma below which a photo is too dark to read even if not clipped
+DARK_MEAN = 24.0
+
+# Sharpness is the Laplacian variance of the sharpest tiles (SHARP_PERCENTILE
+# over a TILES x TILES grid), so a crisp shoe on a plain background counts as
+# sharp. For any source at least MODEL_EDGE long the copy is the same
+# fraction of the view the model gets, so the thresholds are blurs in that
+# view. Measured on synthetic 4032x3024 JPEGs of a size tag (36-110 px
+# text) on a shoe, blurred before sensor grain (sigma 2-10) was added;
+# --calibrate repeats this on real photos:
+#   blur sigma at 1568 px    0     1     2    3    4   6   10
+#   full contrast         2250  1640   700  260  110  33  10-26
+#   half contrast          570   420   180   73   34  14
+# 10 px (GaussianBlur(25) on the 4032 px original) leaves no text legible
+# and 4 px only the largest; a real blurred shot keeps its grain, so these
+# are lower bounds. BLUR_REJECT rejects from about 6 px at full contrast and
+# 4 px at half; SHARP_VARIANCE is a blur of 1-2 px
+TILES = 8
+SHARP_PERCENTILE = 90
+BLUR_REJECT = 40.0
+SHARP_VARIANCE = 1000.0
+
+# --calibrate blurs, as the Gaussian sigma in pixels of the MODEL_EDGE view
+CALIBRATION_SIGMAS = (0, 1, 2, 3, 4, 6, 8, 10)
+
+
+def analysis_copy(data, edge=ANALYSIS_EDGE):
+    """Upright float32 luma of an encoded photo with its long edge near edge."""
+    img = Image.open(io.BytesIO(data))
+    if img.format == "JPEG" and max(img.size) > edge:
+        img.draft("L", draft_size(img.size, edge))
+    img = ImageOps.exif_transpose(img).convert("L")
+    if max(img.size) > edge:
+        img.thumbnail((edge, edge), Image.Resampling.BOX)
+    return np.asarray(img, dtype=np.float32)
+
+
+def laplacian_variance(luma, tiles=TILES, percentile=SHARP_PERCENTILE):
+    """
+    Variance of the 4-neighbour Laplacian per tile of a tiles x tiles grid,
+    at the given percentile over the tiles.
+    """
+    laplacian = (luma[:-2, 1:-1] + luma[2:, 1:-1] + luma[1:-1, :-2] + luma[1:-1, 2:]
+                 - 4 * luma[1:-1, 1:-1])
+    rows, cols = (laplacian.shape[0] // tiles) * tiles, (laplacian.shape[1] // tiles) * tiles
+    if rows == 0 or cols == 0:
+        return float(laplacian.var()) if laplacian.size else 0.0
+    grid = laplacian[:rows, :cols].reshape(tiles, rows // tiles, tiles, cols // tiles)
+    return float(np.percentile(grid.var(axis=(1, 3)), percentile))
+
+
+def photo_metrics(luma):
+    """Exposure and sharpness figures of an analysis copy."""
+    histogram = np.bincount(luma.astype(np.uint8).ravel(), minlength=256)
+    total = histogram.sum()
+    return {
+        "mean": float(luma.mean()),
+        "std": float(luma.std()),
+        "dark": float(histogram[:DARK_LEVEL + 1].sum() / total),
+        "bright": float(histogram[BRIGHT_LEVEL:].sum() / total),
+        "sharpness": laplacian_variance(luma),
+    }
+
+
+def invalid_reason(metrics):
+    """Why a photo cannot be analyzed, or None."""
+    if metrics["std"] < CONSTANT_STD:
+        if metrics["mean"] <= DARK_LEVEL:
+            return "Photo is completely black"
+        if metrics["mean"] >= BRIGHT_LEVEL:
+            return "Photo is completely white"
+        return "Photo is a blank, uniform frame"
+    if metrics["dark"] >= CLIPPED_REJECT or metrics["mean"] < DARK_MEAN:
+        return "Photo is too dark to analyze"
+    if metrics["bright"] >= CLIPPED_REJECT:
+        return "Photo is overexposed"
+    if metrics["sharpness"] < BLUR_REJECT:
+        return "Too blurry to analyze"
+    return None
+
+
+def quality_score(metrics):
+    """
+    0-100: sharpness (square root of the Laplacian variance against
+    SHARP_VARIANCE) times exposure (the share of pixels neither crushed
+    nor blown, and a penalty for a mean far from mid-gray).
+    """
+    sharpness = min(1.0, (metrics["sharpness"] / SHARP_VARIANCE) ** 0.5)
+    clipped = metrics["dark"] + metrics["bright"]
+    balance = 1.0 - min(1.0, abs(metrics["mean"] - 128) / 128) ** 2
+    exposure = max(0.0, 1.0 - clipped) * (0.5 + 0.5 * balance)
+    return int(round(100 * sharpness * exposure))
+
+
+def validate_photo(data, index):
+    """(perImageValidations entry, metrics) for the photo in slot index (0-based)."""
+    start = time.perf_counter()
+    metrics = photo_metrics(analysis_copy(data))
+    reason = invalid_reason(metrics)
+    metrics["ms"] = 1000 * (time.perf_counter() - start)
+    entry = {
+        "photoIndex": index + 1,
+        "photoType": PHOTO_TYPES[index] if index < len(PHOTO_TYPES) else "Additional angle",
+        "isValid": reason is None,
+        "invalidReason": reason,
+        "qualityScore": 0 if reason else quality_score(metrics),
+    }
+    return entry, metrics
+
+
+def calibrate(data, sigmas=CALIBRATION_SIGMAS):
+    """
+    (sigma, metrics, invalid reason) for a sharp photo blurred by each
+    sigma of the MODEL_EDGE view, re-encoded like a phone JPEG.
+    """
+    img = ImageOps.exif_transpose(Image.open(io.BytesIO(data))).convert("RGB")
+    scale = max(img.size) / min(max(img.size), MODEL_EDGE)
+    rows = []
+    for sigma in sigmas:
+        blurred = img.filter(ImageFilter.GaussianBlur(sigma * scale)) if sigma else img
+        out = io.BytesIO()
+        blurred.save(out, "JPEG", quality=90)
+        metrics = photo_metrics(analysis_copy(out.getvalue()))
+        rows.append((sigma, metrics, invalid_reason(metrics)))
+    return rows
+
+
+def prefilter(photos):
+    """
+    Validate a submission's photos (encoded bytes, in slot order). Returns
+    the model's isValidSubmission / invalidReason / perImageValidations
+    fields plus "metrics"; a set with any invalid photo should be sent back
+    to the user instead of to the model.
+    """
+    results = [validate_photo(data, index) for index, data in enumerate(photos)]
+    validations = [entry for entry, _ in results]
+    invalid = [entry for entry in validations if not entry["isValid"]]
+    reason = None
+    if invalid:
+        reason = "; ".join(f"Photo {e['photoIndex']} ({e['photoType']}): {e['invalidReason']}"
+                           for e in invalid)
+    return {
+        "isValidSubmission": not invalid,
+        "invalidReason": reason,
+        "perImageValidations": validations,
+        "metrics": [metrics for _, metrics in results],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("photos", nargs="+", help="Photo files, in slot order")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="Treat the photos as sharp and report the checks on blurred copies")
+    args = parser.parse_args()
+
+    photos = []
+    for path in args.photos:
+        with open(path, "rb") as f:
+            photos.append(f.read())
+    if args.calibrate:
+        for path, data in zip(args.photos, photos):
+            print(path)
+            for sigma, metrics, reason in calibrate(data):
+                score = 0 if reason else quality_score(metrics)
+                print(f"  blur {sigma:4.1f} px at {MODEL_EDGE}  laplacian var {metrics['sharpness']:8.1f}  "
+                      f"score {score:3}  {reason or 'ok'}")
+        return 0
+    result = prefilter(photos)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for entry, metrics in zip(result["perImageValidations"], result["metrics"]):
+            status = "ok" if entry["isValid"] else entry["invalidReason"]
+            print(f"  {entry['photoIndex']}. {entry['photoType']:13} score {entry['qualityScore']:3}  "
+                  f"mean {metrics['mean']:5.1f}  std {metrics['std']:5.1f}  "
+                  f"clipped {metrics['dark'] + metrics['bright']:5.1%}  "
+                  f"laplacian var {metrics['sharpness']:8.1f}  {metrics['ms']:5.1f} ms  {status}")
+        print("Submission OK" if result["isValidSubmission"]
+              else f"Rejected: {result['invalidReason']}")
+    return 0 if result["isValidSubmission"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
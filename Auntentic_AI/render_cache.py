@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for rendered icon PNGs.
+Keys hash the drawing parameters, the source image bytes (fix_icon_*
+inputs) and the renderer source code, so any change to what an output
+depends on produces a new key. A manifest remembers which key produced
+each output file, letting unchanged outputs be skipped without rendering.
+No imaging imports here - checking freshness must stay cheap.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(SCRIPT_DIR, ".icon-cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Source files whose code determines each renderer's output
+RENDERER_SOURCES = {
+    "checkkicks": ["generate_icon.py", "icon_gradients.py", "icon_params.py", "icon_scene.py",
+                   "icon_stroke.py"],
+    "fullbleed": ["create_icon.py", "icon_glow.py", "icon_gradients.py", "icon_params.py",
+                  "icon_shield.py", "icon_stroke.py"],
+    "fix_borders": ["fix_icon_borders.py"],
+    "fix_v2": ["fix_icon_v2.py"],
+    "fix_v3": ["fix_icon_v3.py", "icon_mask.py"],
+    "fix_final": ["fix_icon_final.py"],
+    "fix_auto": ["fix_icon_auto.py", "icon_mask.py"],
+    "source": [],
+    "svg": ["icon_glow.py", "icon_svg.py"],
+    "svg-source": ["AppIcon-source.svg", "icon_glow.py", "icon_svg.py"],
+    "svg-fullbleed": ["app-icon-fullbleed.svg", "icon_glow.py", "icon_svg.py"],
+    "svg-new": ["app-icon-new.svg", "icon_glow.py", "icon_svg.py"],
+}
+
+# Resampling, supersampling and encoding code shared by every exported size
+EXPORT_SOURCES = ["export_appiconset.py", "icon_encode.py", "icon_supersample.py"]
+
+_digest_memo = {}
+
+
+def file_digest(path):
+    """sha256 of a file's bytes, memoized per (path, size, mtime) for this process."""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _digest_memo:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        _digest_memo[memo_key] = digest.hexdigest()
+    return _digest_memo[memo_key]
+
+
+def code_version(renderer):
+    """Hash of the renderer's source files plus the shared export code."""
+    digest = hashlib.sha256()
+    for name in RENDERER_SOURCES[renderer] + EXPORT_SOURCES:
+        digest.update(name.encode())
+        digest.update(file_digest(os.path.join(SCRIPT_DIR, name)).encode())
+    return digest.hexdigest()
+
+
+def render_key(renderer, params=None, source_path=None, **extra):
+    """
+    Cache key for one renderer configuration. extra carries anything else the
+    output depends on, e.g. size=180 or the encoder settings.
+    """
+    payload = {
+        "renderer": renderer,
+        "params": params,
+        "source": file_digest(source_path) if source_path else None,
+        "code": code_version(renderer),
+        "extra": extra,
+    }
+    # Tuples and lists hash alike, key order never matters
+    blob = json.dumps(payload, sort_keys=True, default=list)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def output_key(base_key, **extra):
+    """Derive a per-output key (e.g. per pixel size) from a renderer key."""
+    blob = json.dumps({"base": base_key, "extra": extra}, sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class RenderCache:
+    """
+    PNG store keyed by content hash, with size-capped LRU eviction.
+    Recency is tracked through each entry's mtime, refreshed on every hit.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        self._manifest = None
+        self._manifest_dirty = False
+
+    # --- object store ---
+
+    def path_for(self, key):
+        return os.path.join(self.objects_dir, key[:2], key + ".png")
+
+    def get(self, key):
+        """Return the cached file path for key, or None. Marks it recently used."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key, file_path):
+        """Copy file_path into the cache under key (atomic), then enforce the size cap."""
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(file_path, tmp_path)
+        os.replace(tmp_path, path)
+        self.evict()
+        return path
+
+    def restore(self, key, output_path):
+        """Copy a cached entry to output_path. Returns False on a cache miss."""
+        cached = self.get(key)
+        if cached is None:
+            return False
+        shutil.copyfile(cached, output_path)
+        return True
+
+    def entries(self):
+        """(mtime, size, path) for every cached object."""
+        found = []
+        if not os.path.isdir(self.objects_dir):
+            return found
+        for root, _, files in os.walk(self.objects_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # evicted by another process
+                found.append((stat.st_mtime, stat.st_size, path))
+        return found
+
+    def evict(self):
+        """Delete least-recently-used entries until the cache fits max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        return total
+
+    # --- output manifest ---
+
+    @property
+    def manifest(self):
+        if self._manifest is None:
+            try:
+                with open(self.manifest_path) as f:
+                    self._manifest = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    def is_fresh(self, output_path, key):
+        """True if output_path was written from key and has not been touched since."""
+        record = self.manifest.get(os.path.abspath(output_path))
+        if not record or record["key"] != key:
+            return False
+        try:
+            stat = os.stat(output_path)
+        except FileNotFoundError:
+            return False
+        return stat.st_size == record["size"] and stat.st_mtime_ns == record["mtime_ns"]
+
+    def record(self, output_path, key):
+        """Remember that output_path now holds the result for key."""
+        stat = os.stat(output_path)
+        self.manifest[os.path.abspath(output_path)] = {
+            "key": key,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+        self._manifest_dirty = True
+
+    def save_manifest(self):
+        if not self._manifest_dirty:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest_dirty = False
@@ -4,6 +4,11 @@
 import "jsr:@supabase/functions-js/edge-runtime.d.ts";
 
 const OPENROUTER_API_KEY = Deno.env.get("OPENROUTER_API_KEY");
+// Optional fetch-and-encode sidecar (Auntentic_AI/analysis_sidecar.py); unset = fetch here.
+// It fetches http:// and https:// (signed Storage) URLs of SUPABASE_URL only and must be reachable
+// from this function; beyond loopback it requires IMAGE_SIDECAR_SECRET, sent as a bearer token.
+const IMAGE_SIDECAR_URL = Deno.env.get("IMAGE_SIDECAR_URL");
+const IMAGE_SIDECAR_SECRET = Deno.env.get("IMAGE_SIDECAR_SECRET");
 
 const SYSTEM_PROMPT = `You are an expert AI footwear analysis assistant. Your role is to analyze images of ANY type of shoe and provide a CONFIDENCE ASSESSMENT for authenticity - NOT a definitive authentication verdict.
 
@@ -375,6 +380,24 @@ async function imageUrlToBase64(url: string): Promise<{data: string, mediaType:
   return { data: base64Data, mediaType: contentType.split(';')[0] };
 }
 
+// Helper function to fetch and encode all images through the sidecar, which
+// returns the image_url parts of the content array in order
+async function imageUrlsViaSidecar(imageUrls: string[]): Promise<Array<{type: string; image_url: {url: string}}>> {
+  const response = await fetch(IMAGE_SIDECAR_URL!, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+      ...(IMAGE_SIDECAR_SECRET ? { "Authorization": `Bearer ${IMAGE_SIDECAR_SECRET}` } : {})
+    },
+    body: JSON.stringify({ imageUrls })
+  });
+  if (!response.ok) {
+    const error = await response.json().catch(() => ({}));
+    throw new Error(error.hint || error.error || `Image sidecar error: ${response.status}`);
+  }
+  return await response.json();
+}
+
 Deno.serve(async (req: Request) => {
   try {
     const { imageUrls } = await req.json();
@@ -402,16 +425,20 @@ Deno.serve(async (req: Request) => {
     const contentArray: Array<{type: string; image_url?: {url: string}; text?: string}> = [];
 
     // Fetch images and convert to base64 (API cannot fetch Supabase Storage URLs directly)
-    const imagePromises = imageUrls.map((url: string) => imageUrlToBase64(url));
-    const base64Images = await Promise.all(imagePromises);
-
-    for (let i = 0; i < base64Images.length; i++) {
-      contentArray.push({
-        type: "image_url",
-        image_url: {
-          url: `data:${base64Images[i].mediaType};base64,${base64Images[i].data}`
-        }
-      });
+    if (IMAGE_SIDECAR_URL) {
+      contentArray.push(...await imageUrlsViaSidecar(imageUrls));
+    } else {
+      const imagePromises = imageUrls.map((url: string) => imageUrlToBase64(url));
+      const base64Images = await Promise.all(imagePromises);
+
+      for (let i = 0; i < base64Images.length; i++) {
+        contentArray.push({
+          type: "image_url",
+          image_url: {
+            url: `data:${base64Images[i].mediaType};base64,${base64Images[i].data}`
+          }
+        });
+      }
     }
 
     // Add the text prompt - IMPORTANT: Emphasize JSON-only output